@@ -26,24 +26,88 @@ def create_app(config_name='default'):
     Swagger(app)
 
     # Initialize Scheduler
-    from .tasks import terminate_expired_contracts, process_daily_sms_tasks
+    from .tasks import terminate_expired_contracts, process_daily_sms_tasks, rebuild_dashboard_snapshot, rebuild_billing_ledger, dispatch_sms_outbox
+    from .services.sms_outbox_service import DISPATCH_INTERVAL_SECONDS
+    from .services.scheduler_lease_service import leader_only, register_scheduler_lease, scheduler_command
     scheduler.init_app(app)
+
+    # Every process runs the scheduler, but jobs only execute on the DB-lease leader
+    register_scheduler_lease(app)
+    app.cli.add_command(scheduler_command)
     
     # Task 1: Auto-terminate expired contracts at 00:00
     @scheduler.task('cron', id='terminate_expired', hour=0, minute=0)
+    @leader_only(app, wait=True)
     def scheduled_termination():
         terminate_expired_contracts(app)
 
     # Task 2: Daily SMS Notifications at 09:00 KST
     @scheduler.task('cron', id='daily_sms_tasks', hour=9, minute=0)
+    @leader_only(app, wait=True)
     def scheduled_sms():
         process_daily_sms_tasks(app)
-        
-    scheduler.start()
+
+    # Task 3: Rebuild admin dashboard snapshot at 00:10 (after auto-termination)
+    @scheduler.task('cron', id='rebuild_dashboard', hour=0, minute=10)
+    @leader_only(app, wait=True)
+    def scheduled_dashboard_rebuild():
+        rebuild_dashboard_snapshot(app)
+
+    # Task 4: Roll the billing ledger horizon forward at 00:20 (after auto-termination)
+    @scheduler.task('cron', id='rebuild_billing_ledger', hour=0, minute=20)
+    @leader_only(app, wait=True)
+    def scheduled_billing_ledger_rebuild():
+        rebuild_billing_ledger(app)
+
+    # Task 5: Drain the SMS outbox (API requests only enqueue; sending/retries happen here)
+    @scheduler.task('interval', id='dispatch_sms_outbox', seconds=DISPATCH_INTERVAL_SECONDS, max_instances=1, coalesce=True)
+    @leader_only(app)
+    def scheduled_sms_outbox():
+        dispatch_sms_outbox(app)
+
+    # SCHEDULER_AUTOSTART=false: web workers only serve requests; run `flask scheduler` separately
+    if app.config.get('SCHEDULER_AUTOSTART', True):
+        scheduler.start()
 
     # Import models to ensure they are registered with SQLAlchemy
     from . import models
 
+    # Run deferred cache version bumps in their own short transaction after commit
+    from .utils.cache_version import register_cache_version_listeners
+    register_cache_version_listeners()
+
+    # Invalidate the public catalog cache whenever branch/room data changes
+    from .utils.catalog_cache import register_catalog_invalidation
+    register_catalog_invalidation()
+
+    # Keep the admin dashboard snapshot in sync with contract/room changes
+    from .services.dashboard_service import register_dashboard_listeners
+    register_dashboard_listeners()
+
+    # Invalidate cached admin calendar events when contracts/rooms change
+    from .services.payment_schedule_service import register_calendar_invalidation
+    register_calendar_invalidation()
+
+    # Keep the monthly billing ledger in sync with contract/price/discount changes
+    from .services.billing_ledger_service import register_billing_ledger_listeners, billing_ledger_cli
+    register_billing_ledger_listeners()
+    app.cli.add_command(billing_ledger_cli)
+
+    # Keep the contract search index in sync with tenant/room/branch changes
+    from .services.search_index_service import register_search_index_listeners, search_index_cli
+    register_search_index_listeners()
+    app.cli.add_command(search_index_cli)
+
+    # Load branch slug/alias map into memory
+    from .services.branch_alias_service import BranchAliasService
+    with app.app_context():
+        try:
+            BranchAliasService.load()
+        except Exception as e:
+            # e.g. before `flask db upgrade` has created branch_aliases
+            print(f"Branch alias map not loaded: {e}")
+            db.session.rollback()
+
     # Register Blueprints
     from .routes.auth import auth_bp
     from .routes.public import public_bp
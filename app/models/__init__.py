@@ -1,9 +1,15 @@
 from app.extensions import db
 from .user import User
-from .branch import Branch, Room, RoomImage, BranchFloor, BranchImage
+from .branch import Branch, Room, RoomImage, BranchFloor, BranchImage, BranchAlias
 from .contract import Contract
 from .coupon import Coupon
 from .request import Request
 from .tenant_link import TenantRoomLinkRequest
 from .sms import SmsTemplate, SmsLog
 from .custom_discount import CustomDiscount
+from .cache_version import CacheVersion
+from .dashboard_snapshot import DashboardSnapshot
+from .search_token import ContractSearchToken
+from .billing_ledger import BillingLedger
+from .sms_outbox import SmsOutbox
+from .scheduler_lease import SchedulerLease
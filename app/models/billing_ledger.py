@@ -0,0 +1,29 @@
+from app.extensions import db
+from datetime import datetime
+
+class BillingLedger(db.Model):
+    """
+    계약별 월 청구 원장 (BillingLedgerService가 관리)
+
+    month: 청구 월 (YYYY-MM), due_date: 해당 월 결제일 (말일 보정 포함)
+    final_amount = max(0, base_amount - discount_amount)
+    계약 삭제 시에도 원장 갱신이 막히지 않도록 contracts FK는 두지 않습니다.
+    """
+    __tablename__ = 'billing_ledger'
+    __table_args__ = (
+        db.UniqueConstraint('contract_id', 'month', name='uix_billing_ledger_contract_month'),
+        db.Index('ix_billing_ledger_month_due_date', 'month', 'due_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    contract_id = db.Column(db.Integer, nullable=False)
+    month = db.Column(db.String(7), nullable=False)
+    due_date = db.Column(db.Date, nullable=False)
+    base_amount = db.Column(db.Integer, nullable=False, default=0)      # 계약 월세 (없으면 방 기본가)
+    discount_amount = db.Column(db.Integer, nullable=False, default=0)  # 해당 월 특별 할인 (CustomDiscount)
+    discount_reason = db.Column(db.String(255), nullable=True)
+    final_amount = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<BillingLedger {self.month} : {self.final_amount} for Contract {self.contract_id}>'
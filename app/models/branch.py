@@ -33,6 +33,24 @@ class Branch(db.Model):
     def __repr__(self):
         return f'<Branch {self.name}>'
 
+class BranchAlias(db.Model):
+    __tablename__ = 'branch_aliases'
+
+    id = db.Column(db.Integer, primary_key=True)
+    branch_id = db.Column(db.Integer, db.ForeignKey('branches.id'), nullable=False)
+    alias = db.Column(db.String(100), nullable=False, unique=True, index=True) # 소문자 정규화된 slug/별칭 (e.g. "samsung", "삼성점")
+    is_primary = db.Column(db.Boolean, default=False) # 대표 slug 여부
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    branch = db.relationship('Branch', backref=db.backref('aliases', lazy='dynamic', cascade='all, delete-orphan'))
+
+    @staticmethod
+    def normalize(alias):
+        return (alias or '').strip().lower()
+
+    def __repr__(self):
+        return f'<BranchAlias {self.alias} -> Branch {self.branch_id}>'
+
 class BranchFloor(db.Model):
     __tablename__ = 'branch_floors'
 
@@ -77,36 +95,10 @@ class Room(db.Model):
         """
         Calculates the next available date for this room.
         Returns a date object or None if not bookable.
+        For many rooms at once, use AvailabilityService.resolve_next_available_dates.
         """
-        if self.room_type == 'manager':
-            return None
-            
-        if self.status == 'available':
-            from datetime import date
-            return date.today()
-            
-        if self.status == 'occupied':
-            # Check for active contract
-            from app.models.contract import Contract
-            from datetime import date, timedelta
-            active_contract = self.contracts.filter(
-                Contract.status.in_(['active', 'waiting_signature', 'approved', 'requested'])
-            ).order_by(Contract.end_date.desc()).first()
-            
-            if active_contract:
-                # 1. termination_effective_date has absolute priority (explicit signal)
-                if active_contract.termination_effective_date:
-                    return active_contract.termination_effective_date + timedelta(days=1)
-                
-                # 2. automatic expiration for fixed-term contracts (is_indefinite=False)
-                # Matches admin UI "Expiring Soon" logic (within 30 days)
-                if not active_contract.is_indefinite and active_contract.end_date:
-                    today = date.today()
-                    diff = active_contract.end_date - today
-                    if 0 <= diff.days <= 30:
-                        return active_contract.end_date + timedelta(days=1)
-        
-        return None
+        from app.services.availability_service import AvailabilityService
+        return AvailabilityService.resolve_next_available_dates([self]).get(self.id)
 
     def __repr__(self):
         return f'<Room {self.name}>'
@@ -0,0 +1,14 @@
+from app.extensions import db
+from datetime import datetime
+
+class CacheVersion(db.Model):
+    __tablename__ = 'cache_versions'
+
+    # 캐시 네임스페이스 (예: 'catalog')
+    name = db.Column(db.String(100), primary_key=True)
+    # 데이터 변경 시마다 1씩 증가하는 버전 카운터 (워커 간 캐시 무효화용)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CacheVersion {self.name}={self.version}>'
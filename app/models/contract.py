@@ -26,8 +26,8 @@ class Contract(db.Model):
     temp_user_phone = db.Column(db.String(20), nullable=True)  # 매핑 키로 사용
     temp_user_email = db.Column(db.String(120), nullable=True)
     
-    start_date = db.Column(db.Date, nullable=False)
-    end_date = db.Column(db.Date, nullable=False)
+    start_date = db.Column(db.Date, nullable=False, index=True)
+    end_date = db.Column(db.Date, nullable=False, index=True)
     start_time = db.Column(db.String(10), nullable=True) # For time_based rooms
     end_time = db.Column(db.String(10), nullable=True)   # For time_based rooms
     months = db.Column(db.Integer)
@@ -45,7 +45,7 @@ class Contract(db.Model):
     
     is_indefinite = db.Column(db.Boolean, default=False) # True: "한달 전 통보" (No fixed end date)
     
-    status = db.Column(db.String(20), default='requested')
+    status = db.Column(db.String(20), default='requested', index=True)
     # requested, waiting_signature, signature_rejected, approved, active, extend_requested, terminate_requested, terminated, cancelled
     
     auto_extend_status = db.Column(db.String(20), default='none')
@@ -0,0 +1,15 @@
+from app.extensions import db
+from datetime import datetime
+
+class DashboardSnapshot(db.Model):
+    __tablename__ = 'dashboard_snapshot'
+
+    # 단일 행 (id=1)
+    id = db.Column(db.Integer, primary_key=True)
+    # /admin/api/stats 응답 전체 (stats, branchData, expiringContracts)
+    payload = db.Column(db.JSON, nullable=False)
+    built_at = db.Column(db.DateTime, default=datetime.utcnow) # 마지막 전체 재생성 시각
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) # 마지막 (증분) 갱신 시각
+
+    def __repr__(self):
+        return f'<DashboardSnapshot built {self.built_at}>'
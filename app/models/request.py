@@ -3,10 +3,21 @@ from datetime import datetime
 
 class Request(db.Model):
     __tablename__ = 'requests'
+    # 관리자 요청 큐: (필터 컬럼, created_at) 순으로 조회/키셋 페이지네이션
+    __table_args__ = (
+        db.Index('ix_requests_status_created_at', 'status', 'created_at'),
+        db.Index('ix_requests_type_status_created_at', 'type', 'status', 'created_at'),
+        db.Index('ix_requests_branch_status_created_at', 'branch_id', 'status', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     contract_id = db.Column(db.Integer, db.ForeignKey('contracts.id'), nullable=True) # Optional for some requests?
+
+    # 생성 시점에 계약(또는 문의 details)에서 확정한 방/지점 (목록 필터링용 비정규화)
+    # 방/지점이 삭제되면 요청은 남기고 비움 (ON DELETE SET NULL)
+    room_id = db.Column(db.Integer, db.ForeignKey('rooms.id', ondelete='SET NULL'), nullable=True)
+    branch_id = db.Column(db.Integer, db.ForeignKey('branches.id', ondelete='SET NULL'), nullable=True)
     
     type = db.Column(db.String(20), nullable=False) 
     # repair, supplies, extension, termination
@@ -19,5 +30,18 @@ class Request(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    def resolve_location(self, contract=None, details=None):
+        """계약 또는 details(room_id/branch_id)로 room_id, branch_id 채우기"""
+        from app.models.branch import Room
+
+        details = details if isinstance(details, dict) else {}
+        room_id = contract.room_id if contract else details.get('room_id')
+        room = Room.query.get(room_id) if str(room_id or '').isdigit() else None
+        self.room_id = room.id if room else None
+        if room:
+            self.branch_id = room.branch_id
+        elif str(details.get('branch_id') or '').isdigit():
+            self.branch_id = int(details['branch_id'])
+
     def __repr__(self):
         return f'<Request {self.type} - {self.status}>'
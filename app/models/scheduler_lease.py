@@ -0,0 +1,18 @@
+from app.extensions import db
+
+class SchedulerLease(db.Model):
+    """
+    스케줄러 리더 임대 (SchedulerLeaseService가 관리)
+
+    holder 가 expires_at 전까지 주기적으로 갱신하는 동안에만 예약 작업을 실행합니다.
+    갱신이 끊겨 만료되면 다른 프로세스가 가져갑니다. (시각은 UTC)
+    """
+    __tablename__ = 'scheduler_leases'
+
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(120), nullable=False)   # 호스트:PID:무작위
+    expires_at = db.Column(db.DateTime, nullable=False)
+    renewed_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<SchedulerLease {self.name} : {self.holder} until {self.expires_at}>'
@@ -0,0 +1,22 @@
+from app.extensions import db
+
+class ContractSearchToken(db.Model):
+    """
+    계약 검색 n-gram 색인 (SearchIndexService가 관리)
+
+    field: name(이름 2-gram), chosung(초성 2-gram), phone(숫자 2~4-gram),
+           room(방 이름 2-gram), branch(지점 이름 2-gram)
+    계약 삭제 시에도 색인 갱신이 막히지 않도록 contracts FK는 두지 않습니다.
+    """
+    __tablename__ = 'contract_search_tokens'
+    __table_args__ = (
+        db.Index('ix_contract_search_tokens_token', 'token', 'field', 'contract_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    contract_id = db.Column(db.Integer, nullable=False, index=True)
+    field = db.Column(db.String(10), nullable=False)
+    token = db.Column(db.String(16), nullable=False)
+
+    def __repr__(self):
+        return f'<ContractSearchToken {self.field}:{self.token} -> {self.contract_id}>'
@@ -22,6 +22,12 @@ class SmsTemplate(db.Model):
 
 class SmsLog(db.Model):
     __tablename__ = 'sms_logs'
+    __table_args__ = (
+        db.Index('ix_sms_logs_sent_at_id', 'sent_at', 'id'),
+        db.Index('ix_sms_logs_type_sent_at', 'type', 'sent_at'),
+        db.Index('ix_sms_logs_status_sent_at', 'status', 'sent_at'),
+        db.Index('ix_sms_logs_contract_sent_at', 'contract_id', 'sent_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     contract_id = db.Column(db.Integer, db.ForeignKey('contracts.id', ondelete='SET NULL'), nullable=True)
@@ -35,5 +41,6 @@ class SmsLog(db.Model):
     provider_message_id = db.Column(db.String(100))
     error_message = db.Column(db.Text)
     sent_at = db.Column(db.DateTime, default=get_kst_now)
+    reservation_token = db.Column(db.String(32), index=True) # PENDING 로그를 예약한 발송 실행 (SmsLogWriter.token)
 
     contract = db.relationship('Contract', backref=db.backref('sms_logs', lazy=True))
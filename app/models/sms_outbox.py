@@ -0,0 +1,35 @@
+from app.extensions import db
+from datetime import datetime
+
+class SmsOutbox(db.Model):
+    """
+    SMS 발송 대기열 (업무 변경과 같은 트랜잭션에 기록, SmsOutboxService 디스패처가 발송)
+
+    status: PENDING -> SENDING -> SENT | SKIPPED | FAILED
+    실패하면 attempts 를 올리고 next_attempt_at 을 지수 백오프로 미룹니다.
+    dedup_key 는 sms_logs 와 같은 형식이지만, 업무 트랜잭션이 중복 때문에 실패하지 않도록 유니크로 두지 않습니다.
+    (실제 중복 발송은 디스패처가 sms_logs.dedup_key 로 막습니다.)
+    """
+    __tablename__ = 'sms_outbox'
+    __table_args__ = (
+        db.Index('ix_sms_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    contract_id = db.Column(db.Integer, nullable=True)
+    msg_type = db.Column(db.String(50), nullable=False)
+    dedup_key = db.Column(db.String(100), nullable=False, index=True)
+    related_date = db.Column(db.Date)
+    to_number = db.Column(db.String(20), nullable=False)
+    content = db.Column(db.Text, nullable=False)            # 적재 시점에 렌더링한 본문
+    context_snapshot = db.Column(db.JSON)
+    status = db.Column(db.String(20), nullable=False, default='PENDING')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = db.Column(db.DateTime, nullable=True)      # SENDING 으로 가져간 시각 (오래되면 다시 가져감)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<SmsOutbox {self.dedup_key} : {self.status}>'
@@ -1,8 +1,8 @@
-from flask import Blueprint, request, jsonify, current_app, render_template
+from flask import Blueprint, request, jsonify, current_app, render_template, Response, stream_with_context, send_file
 from app.extensions import db
 from app.models.contract import Contract, TermsDocument
 from app.models.user import User
-from app.models.branch import Branch, Room, BranchFloor, RoomImage, BranchImage
+from app.models.branch import Branch, Room, BranchFloor, RoomImage, BranchImage, BranchAlias
 from app.models.sms import SmsTemplate, SmsLog
 from app.utils.evidence import log_contract_status_change, ensure_private_dir
 from app.utils.sms_service import sms_service, SMS_VARIABLE_SCHEMA
@@ -13,21 +13,48 @@ from app.models.request import Request
 from app.routes.auth import admin_required
 from app.utils.db_utils import db_retry
 from app.services.contract_mapping_service import ContractMappingService
+from app.services.branch_alias_service import BranchAliasService
+from app.services.dashboard_service import DashboardService
+from app.services.contract_query_service import ContractQueryService, CONTRACT_SORT_COLUMNS
+from app.services.contract_export_service import ContractExportService
+from app.services.contract_import_service import ContractImportService, ImportFormatError
+from app.services.request_query_service import RequestQueryService
+from app.services.user_query_service import UserQueryService
+from app.services.search_index_service import SearchIndexService
+from app.services.payment_schedule_service import PaymentScheduleService
+from app.services.floor_layout_service import FloorLayoutService, LayoutConflictError
+from app.services.sms_log_query_service import SmsLogQueryService
+from app.services.sms_template_registry import SmsTemplateRegistry
+from app.utils.ical import stream_ics
+from app.utils.pagination import parse_sort, limit_arg, decode_cursor, iter_keyset, stream_json_page
+from app.serializers import (
+    BranchSerializer, ContractSerializer, RequestSerializer, UserSerializer, SmsLogSerializer
+)
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
 import json
 import os
 import uuid
 import math
+import hmac
 from app.utils.sms_context import build_sms_context
 from functools import wraps
 from werkzeug.utils import secure_filename
+from urllib.parse import quote
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
-from sqlalchemy import func, case
+import logging
+
+logger = logging.getLogger(__name__)
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+CONTRACT_PAGE_MAX = 500  # 계약 목록 한 페이지 최대 건수
+REQUEST_PAGE_MAX = 200   # 요청 큐 한 페이지 최대 건수
+USER_PAGE_MAX = 500      # 회원 목록 한 페이지 최대 건수
+SMS_LOG_PAGE_MAX = 200   # SMS 발송 이력 한 페이지 최대 건수
+SMS_LOG_LEGACY_LIMIT = 100  # limit 없이 배열로 응답할 때의 최근 건수
+CALENDAR_FEED_MONTHS = 3  # iCal 피드에 포함할 앞으로의 개월 수
+
 @admin_bp.route('/dashboard')
 @admin_required
 def dashboard(current_user):
@@ -38,271 +65,85 @@ def dashboard(current_user):
 @admin_required
 @db_retry(max_retries=3, delay=1)
 def get_stats(current_user):
-    """Get dashboard stats (Optimized)"""
-    
-    # 1. Basic Counts
-    total_users = User.query.count()
-    active_contracts_count = Contract.query.filter_by(status='active').count()
-    pending_contracts = Contract.query.filter_by(status='requested').count()
-    # User requested to only count contracts for "승인대기"
-    pending_requests = pending_contracts
-    
-    # 2. Revenue & Deposit (Active Contracts)
-    # Use SQL aggregation for performance
-    # Price: if c.price is not null use it, else if c.room.price use it, else 0
-    # SQLite/MySQL compatible 'coalesce' logic
-    
-    revenue_query = db.session.query(
-        func.sum(
-            case(
-                (Contract.price != None, Contract.price),
-                else_=Room.price
-            )
-        ).label('total_revenue'),
-        func.sum(
-            case(
-                (Contract.deposit != None, Contract.deposit),
-                else_=Room.deposit
-            )
-        ).label('total_deposit')
-    ).select_from(Contract).join(Room).filter(Contract.status == 'active')
-    
-    revenue_result = revenue_query.first()
-    total_monthly_revenue = revenue_result.total_revenue or 0
-    total_deposit = revenue_result.total_deposit or 0
-
-    # 3. Expiring Contracts (Active, Not Indefinite, End Date <= 30 days)
-    one_month_from_now = (datetime.utcnow() + timedelta(days=30)).date()
-    expiring_query = Contract.query.filter(
-        Contract.status == 'active',
-        Contract.is_indefinite == False,
-        Contract.end_date != None,
-        Contract.end_date <= one_month_from_now
-    ).options(
-        joinedload(Contract.room).joinedload(Room.branch),
-        joinedload(Contract.user)
-    ).order_by(Contract.end_date.asc())
-    
-    expiring_count = expiring_query.count()
-    expiring_contracts_list = []
-    for c in expiring_query.limit(100).all():
-        user_info = c.get_user_info()
-        expiring_contracts_list.append({
-            'id': c.id,
-            'user_name': user_info['name'] or '알 수 없음',
-            'room_name': c.room.name if c.room else '알 수 없음',
-            'branch_name': c.room.branch.name if c.room and c.room.branch else '알 수 없음',
-            'end_date': c.end_date.strftime('%Y-%m-%d')
-        })
-
-
-    # 4. Room Stats (Occupied/Available) by Branch
-    # We need to list branches with their stats.
-    
-    # Get all branches with active contracts in one query
-    # We want: Branch ID, Name, Revenue, Deposit, Contract Count, Expiring Count
-    
-    # Subquery for branch stats from contracts
-    contract_stats = db.session.query(
-        Room.branch_id,
-        func.sum(
-            case((Contract.price != None, Contract.price), else_=Room.price)
-        ).label('revenue'),
-        func.sum(
-            case((Contract.deposit != None, Contract.deposit), else_=Room.deposit)
-        ).label('deposit'),
-        func.sum(
-            case((
-                (Contract.is_indefinite == False) & 
-                (Contract.end_date != None) & 
-                (Contract.end_date <= one_month_from_now), 1
-            ), else_=0)
-        ).label('expiring')
-    ).select_from(Contract).join(Room).filter(Contract.status == 'active').group_by(Room.branch_id).all()
-    
-    branch_stats_map = {r.branch_id: r for r in contract_stats}
-    
-    # NEW: Get pending contracts per branch
-    pending_branch_stats = db.session.query(
-        Room.branch_id,
-        func.count(Contract.id).label('pending')
-    ).select_from(Contract).join(Room).filter(Contract.status == 'requested').group_by(Room.branch_id).all()
-    pending_branch_map = {r.branch_id: r.pending for r in pending_branch_stats}
-    
-    # Get all rooms to calculate occupancy per branch
-    # Group by branch_id and room_type (active/monthly/etc) isn't direct on Room
-    # easier to fetch all rooms (lighter than contracts) or aggregate rooms
-    
-    # Count total rooms per branch
-    total_rooms_per_branch = db.session.query(
-        Room.branch_id, 
-        func.count(Room.id).label('total')
-    ).group_by(Room.branch_id).all()
-    
-    # 3. Room Occupancy Statistics (Focused on Monthly for vacancy)
-    # Using Room.status for consistency (it's sync'd during contract lifecycle)
-    monthly_stats = db.session.query(
-        Room.branch_id,
-        func.count(case((Room.room_type == 'monthly', 1))).label('total_monthly'),
-        func.count(case(((Room.room_type == 'monthly') & (Room.status == 'occupied'), 1))).label('occupied_monthly'),
-        func.count(case(((Room.room_type == 'monthly') & (Room.status == 'reserved'), 1))).label('reserved_monthly'),
-        func.count(case(((Room.room_type == 'monthly') & (Room.status == 'available'), 1))).label('available_monthly'),
-        func.count(case(((Room.room_type == 'monthly') & (Room.status == 'maintenance'), 1))).label('maintenance_monthly')
-    ).group_by(Room.branch_id).all()
-
-    # Total Overall Room Stats
-    total_rooms_per_branch = db.session.query(
-        Room.branch_id, 
-        func.count(Room.id).label('total'),
-        func.count(case((Room.room_type == 'time_based', 1))).label('time_based'),
-        func.count(case((Room.room_type == 'manager', 1))).label('manager')
-    ).group_by(Room.branch_id).all()
-
-    # Maps for easy lookup
-    monthly_stats_map = {r.branch_id: r for r in monthly_stats}
-    total_rooms_map = {r.branch_id: r for r in total_rooms_per_branch}
-
-    branches = Branch.query.all()
-    branch_data = []
-    
-    # Global accumulators for Monthly logic
-    total_monthly_all = 0
-    occupied_monthly_all = 0
-    reserved_monthly_all = 0
-    available_monthly_all = 0
-    maintenance_monthly_all = 0
-    
-    # Overall Room counter (all types)
-    total_rooms_all = 0
-
-    for branch in branches:
-        bid = branch.id
-        stats = branch_stats_map.get(bid)
-        m_stats = monthly_stats_map.get(bid)
-        t_stats = total_rooms_map.get(bid)
-        
-        b_revenue = stats.revenue if stats and stats.revenue else 0
-        b_deposit = stats.deposit if stats and stats.deposit else 0
-        b_expiring = stats.expiring if stats and stats.expiring else 0
-        
-        # Monthly Room Stats for this branch
-        b_monthly_total = m_stats.total_monthly if m_stats else 0
-        b_monthly_occupied = m_stats.occupied_monthly if m_stats else 0
-        b_monthly_reserved = m_stats.reserved_monthly if m_stats else 0
-        b_monthly_available = m_stats.available_monthly if m_stats else 0
-        b_monthly_maintenance = m_stats.maintenance_monthly if m_stats else 0
-        
-        # overall rooms
-        b_total_rooms = t_stats.total if t_stats else 0
-        b_time_rooms = t_stats.time_based if t_stats else 0
-        b_manager_rooms = t_stats.manager if t_stats else 0
-
-        # Available rooms list (only truly available monthly)
-        available_rooms_list = [
-            {'id': r.id, 'name': r.name, 'price': r.price, 'deposit': r.deposit} 
-            for r in branch.rooms.filter_by(room_type='monthly', status='available').all()
-        ]
-        
-        branch_data.append({
-            'id': branch.id,
-            'name': branch.name,
-            'monthly_revenue': b_revenue,
-            'deposit': b_deposit,
-            'total_rooms': b_total_rooms,
-            'occupied_rooms': b_monthly_occupied + b_monthly_reserved, # Reserved counts as non-vacant
-            'available_rooms': b_monthly_available,
-            'available_rooms_list': available_rooms_list,
-            'expiring_contracts': b_expiring,
-            'pending_contracts': pending_branch_map.get(bid, 0),
-            'monthly_rooms': b_monthly_total,
-            'time_based_rooms': b_time_rooms,
-            'manager_rooms': b_manager_rooms,
-            'total_monthly_rooms': b_monthly_total
-        })
-        
-        total_monthly_all += b_monthly_total
-        occupied_monthly_all += b_monthly_occupied
-        reserved_monthly_all += b_monthly_reserved
-        available_monthly_all += b_monthly_available
-        maintenance_monthly_all += b_monthly_maintenance
-        total_rooms_all += b_total_rooms
-    
-    # Final global stats
-    # Fetch room types counts globally
-    global_monthly = Room.query.filter_by(room_type='monthly').count()
-    global_time = Room.query.filter_by(room_type='time_based').count()
-    global_manager = Room.query.filter_by(room_type='manager').count()
-    
-    waiting_signature_count = Contract.query.filter_by(status='waiting_signature').count()
-    
-    return jsonify({
-        'stats': {
-            'totalUsers': total_users,
-            'activeContracts': active_contracts_count,
-            'pendingRequests': pending_requests,
-            'waitingSignature': waiting_signature_count,
-            'expiringContracts': expiring_count,
-            'monthlyRevenue': total_monthly_revenue,
-            'totalDeposit': total_deposit,
-            'totalRooms': total_rooms_all, # All types (Monthly + Time + Mgr)
-            'occupiedRooms': occupied_monthly_all + reserved_monthly_all + maintenance_monthly_all, # All non-vacant monthly
-            'availableRooms': available_monthly_all, # Truly available monthly
-            'monthlyRooms': total_monthly_all,
-            'maintenanceRooms': maintenance_monthly_all
-        },
-        'branchData': branch_data,
-        'expiringContracts': expiring_contracts_list
-    })
+    """Get dashboard stats (materialized snapshot, see DashboardService)"""
+    return jsonify(DashboardService.get_payload())
 
 
 @admin_bp.route('/api/contracts', methods=['GET'])
 @admin_required
 @db_retry(max_retries=3, delay=1)
 def get_contracts(current_user):
-    """Get all contracts with details (including unmapped contracts)"""
-    contracts = Contract.query.options(
-        joinedload(Contract.user),
-        joinedload(Contract.room).joinedload(Room.branch),
-        joinedload(Contract.coupon)
-    ).all()
-    result = []
-    
-    for c in contracts:
-        user_info = c.get_user_info()
-        contract_data = {
-            'id': c.id,
-            'user_name': user_info['name'] or '알 수 없음',
-            'user_email': user_info['email'] or '',
-            'user_id': user_info['id'],
-            'user_phone': user_info['phone'] or '',
-            'is_mapped': user_info['is_mapped'],
-            'room_id': c.room_id,
-            'room_name': c.room.name if c.room else '알 수 없음',
-            'room_type': c.room.room_type if c.room else 'monthly',
-            'branch_id': c.room.branch_id if c.room else None,
-            'branch_name': c.room.branch.name if c.room and c.room.branch else '알 수 없음',
-            'deposit': c.deposit if c.deposit is not None else (c.room.deposit if c.room else 0),
-            'price': c.price if c.price is not None else (c.room.price if c.room else 0),
-            'start_date': c.start_date.strftime('%Y-%m-%d'),
-            'end_date': c.end_date.strftime('%Y-%m-%d'),
-            'start_time': c.start_time,
-            'end_time': c.end_time,
-            'payment_day': c.payment_day,
-            'payment_method': c.payment_method,
-            'status': c.status,
-            'discount_details': json.loads(c.discount_details) if c.discount_details else None,
-            'coupon_name': c.coupon.name if c.coupon else None,
-            'is_indefinite': c.is_indefinite,
-            'auto_extend_status': c.auto_extend_status,
-            'termination_effective_date': c.termination_effective_date.strftime('%Y-%m-%d') if c.termination_effective_date else None,
-            'created_at': c.created_at.strftime('%Y-%m-%d %H:%M') if c.created_at else '',
-            'signed_at': c.signed_at.strftime('%Y-%m-%d %H:%M') if c.signed_at else None,
-            'has_signature': bool(c.signature_data)
-        }
-        result.append(contract_data)
-    
-    return jsonify(result)
+    """
+    Get contracts with details (including unmapped contracts)
+
+    필터: ContractQueryService.filtered_query 참고 (branch_id, status, room_type, date_from, date_to, mapped ...)
+    페이지: limit(최대 CONTRACT_PAGE_MAX), cursor, sort(id|start_date|end_date, '-' 접두사는 내림차순, 기본 -id)
+    fields: 쉼표로 구분한 출력 필드 (id 는 항상 포함), total=1 이면 전체 건수 포함
 
+    limit 이 있으면 {"items": [...], "next_cursor": ..., "total": ...} 형태로,
+    없으면 기존처럼 전체 배열로 응답합니다. 두 경우 모두 묶음 단위로 조회/직렬화하며 스트리밍합니다.
+    """
+    args = request.args
+    try:
+        query = ContractQueryService.filtered_query(args)
+        # 배열 응답(limit 없음)은 기존 순서(id 오름차순) 유지
+        default_sort = '-id' if args.get('limit') is not None else 'id'
+        sort_key, descending = parse_sort(args.get('sort'), CONTRACT_SORT_COLUMNS, default_sort)
+        columns = [CONTRACT_SORT_COLUMNS[sort_key]]
+        if sort_key != 'id':
+            columns.append(Contract.id)
+
+        only = None
+        if args.get('fields'):
+            keys = {k.strip() for k in args['fields'].split(',') if k.strip()} | {'id'}
+            only = ContractSerializer.view_subset('admin', keys)
+
+        limit = limit_arg(args, CONTRACT_PAGE_MAX)
+        cursor = decode_cursor(args['cursor'], columns) if args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    serializer = ContractSerializer('admin', only=only)
+    meta = {'total': query.order_by(None).count()} if args.get('total') in ('1', 'true') else None
+    chunks = iter_keyset(query, columns, limit=limit, cursor_values=cursor, descending=descending)
+    body = stream_json_page(chunks, serializer.many, meta=meta, legacy_array=limit is None)
+    return Response(stream_with_context(body), mimetype='application/json')
+
+@admin_bp.route('/api/contracts/export', methods=['GET'])
+@admin_required
+def export_contracts(current_user):
+    """
+    계약 현황 내보내기 (format=csv|xlsx, 기본 xlsx)
+
+    필터는 계약 목록 API와 같습니다 (branch_id, status, room_type, date_from, date_to, mapped ...).
+    """
+    export_format = request.args.get('format', 'xlsx').lower()
+    if export_format not in ('csv', 'xlsx'):
+        return jsonify({'error': 'format must be csv or xlsx'}), 400
+    try:
+        query = ContractExportService.build_query(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    filename = f"전체지점_계약현황({datetime.now().strftime('%y%m%d')}).{export_format}"
+    rows = ContractExportService.iter_rows(query)
+
+    if export_format == 'csv':
+        response = Response(
+            stream_with_context(ContractExportService.stream_csv(rows)),
+            mimetype='text/csv; charset=utf-8'
+        )
+        response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        return response
+
+    try:
+        output = ContractExportService.write_xlsx(rows)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 500
+    return send_file(
+        output, as_attachment=True, download_name=filename,
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
 
 @admin_bp.route('/api/contracts/<int:id>', methods=['GET'])
 @admin_required
@@ -310,56 +151,7 @@ def get_contracts(current_user):
 def get_contract_detail(current_user, id):
     """Get single contract details"""
     c = Contract.query.get_or_404(id)
-    user_info = c.get_user_info()
-    
-    # 이력 조회
-    from app.models.contract import ContractStatusHistory
-    histories = ContractStatusHistory.query.filter_by(contract_id=id).order_by(ContractStatusHistory.created_at.desc()).all()
-    history_list = []
-    for h in histories:
-        history_list.append({
-            'old_status': h.old_status,
-            'new_status': h.new_status,
-            'actor_type': h.actor_type,
-            'reason': h.reason,
-            'created_at': h.created_at.strftime('%Y-%m-%d %H:%M')
-        })
-        
-    contract_data = {
-        'id': c.id,
-        'user_name': user_info['name'] or '알 수 없음',
-        'user_email': user_info['email'] or '',
-        'user_id': user_info['id'],
-        'user_phone': user_info['phone'] or '',
-        'is_mapped': user_info['is_mapped'],
-        'room_id': c.room_id,
-        'room_name': c.room.name if c.room else '알 수 없음',
-        'room_type': c.room.room_type if c.room else 'monthly',
-        'branch_id': c.room.branch_id if c.room else None,
-        'branch_name': c.room.branch.name if c.room and c.room.branch else '알 수 없음',
-        'deposit': c.deposit if c.deposit is not None else (c.room.deposit if c.room else 0),
-        'price': c.price if c.price is not None else (c.room.price if c.room else 0),
-        'start_date': c.start_date.strftime('%Y-%m-%d'),
-        'end_date': c.end_date.strftime('%Y-%m-%d'),
-        'start_time': c.start_time,
-        'end_time': c.end_time,
-        'payment_day': c.payment_day,
-        'payment_method': c.payment_method,
-        'status': c.status,
-        'registration_number': c.user_registration_number_snapshot or (c.user.registration_number if c.user else ''),
-        'discount_details': json.loads(c.discount_details) if c.discount_details else None,
-        'coupon_name': c.coupon.name if c.coupon else None,
-        'is_indefinite': c.is_indefinite,
-        'auto_extend_status': c.auto_extend_status,
-        'termination_effective_date': c.termination_effective_date.strftime('%Y-%m-%d') if c.termination_effective_date else None,
-        'created_at': c.created_at.strftime('%Y-%m-%d %H:%M') if c.created_at else '',
-        'signed_at': c.signed_at.strftime('%Y-%m-%d %H:%M') if c.signed_at else None,
-        'has_signature': bool(c.signature_data),
-        'tax_invoice_requested': c.tax_invoice_requested,
-        'history': history_list
-    }
-    
-    return jsonify(contract_data)
+    return jsonify(ContractSerializer('admin_detail').one(c))
 
 @admin_bp.route('/api/contracts', methods=['POST'])
 @admin_required
@@ -542,28 +334,17 @@ def update_contract(current_user, id):
 @admin_bp.route('/api/monthly-payments', methods=['GET'])
 @admin_required
 def get_monthly_payments(current_user):
-    """Get active contracts grouped by payment day"""
+    """Get active contracts grouped by payment day (이번 달 청구액은 청구 원장 기준)"""
     active_contracts = Contract.query.filter_by(status='active').all()
     
     day1 = []
     day15 = []
     others = []
     
-    for c in active_contracts:
-        user_info = c.get_user_info()
-        item = {
-            'id': c.id,
-            'user_name': user_info['name'] or c.temp_user_name or '알 수 없음',
-            'room_name': c.room.name if c.room else '알 수 없음',
-            'branch_name': c.room.branch.name if c.room and c.room.branch else '알 수 없음',
-            'price': c.price if c.price is not None else (c.room.price if c.room else 0),
-            'payment_day': c.payment_day,
-            'user_phone': user_info.get('phone') or ''
-        }
-        
-        if c.payment_day == 1:
+    for item in ContractSerializer('payment').many(active_contracts):
+        if item['payment_day'] == 1:
             day1.append(item)
-        elif c.payment_day == 15:
+        elif item['payment_day'] == 15:
             day15.append(item)
         else:
             others.append(item)
@@ -581,34 +362,26 @@ def get_monthly_payments(current_user):
 @admin_required
 @db_retry(max_retries=3, delay=1)
 def get_requests(current_user):
-    """Get all requests and inquiries"""
-    requests = Request.query.order_by(Request.created_at.desc()).all()
-    results = []
-    for r in requests:
-        details_data = {}
-        if r.details:
-            try:
-                details_data = json.loads(r.details)
-            except:
-                details_data = {'raw': r.details}
-        
-        branch_id = None
-        if r.contract and r.contract.room:
-            branch_id = r.contract.room.branch_id
-        elif details_data.get('branch_id'):
-            branch_id = details_data.get('branch_id')
+    """
+    Get requests and inquiries (최신순)
 
-        results.append({
-            'id': r.id,
-            'user_name': r.user.name if r.user else '알 수 없음',
-            'type': r.type,
-            'status': r.status,
-            'details': details_data,
-            'created_at': r.created_at.strftime('%Y-%m-%d %H:%M'),
-            'room_name': r.contract.room.name if r.contract and r.contract.room else (details_data.get('room_name') or 'N/A'),
-            'branch_id': branch_id
-        })
-    return jsonify(results)
+    필터: RequestQueryService.filtered_query 참고 (type, exclude_type, status, branch_id, date_from, date_to)
+    limit(최대 REQUEST_PAGE_MAX) 이 있으면 {"items": [...], "next_cursor": ..., "total": ...} 형태의 키셋 페이지,
+    없으면 기존처럼 전체 배열로 응답합니다.
+    """
+    args = request.args
+    columns = [Request.created_at, Request.id]
+    try:
+        query = RequestQueryService.filtered_query(args)
+        limit = limit_arg(args, REQUEST_PAGE_MAX)
+        cursor = decode_cursor(args['cursor'], columns) if args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    meta = {'total': query.order_by(None).count()} if args.get('total') in ('1', 'true') else None
+    chunks = iter_keyset(query, columns, limit=limit, cursor_values=cursor, descending=True)
+    body = stream_json_page(chunks, RequestSerializer('admin').many, meta=meta, legacy_array=limit is None)
+    return Response(stream_with_context(body), mimetype='application/json')
 
 @admin_bp.route('/api/contracts/<int:id>/confirm-moveout', methods=['POST'])
 @admin_required
@@ -699,34 +472,14 @@ def update_contract_status(current_user, id):
             contract.notice_email_to = contract.contract_email_snapshot or contract.get_user_info()['email']
             
             # --- SMS Trigger (New: Waiting Signature) ---
+            from app.services.sms_outbox_service import SmsOutboxService
             if effective_status == 'waiting_signature':
-                try:
-                    from app.utils.sms_service import sms_service
-                    from app.utils.sms_context import build_sms_context
-                    context = build_sms_context(contract, 'SIGNATURE_REQUESTED') 
-                    # Use DB template
-                    sms_service.send_sms(contract.id, 'SIGNATURE_REQUESTED', context)
-                except Exception as e:
-                    print(f"SMS trigger error (SIGNATURE_REQUESTED): {e}")
-
-            # Debug Logging to File
-            with open('sms_debug.txt', 'a', encoding='utf-8') as f:
-                f.write(f"\n[{datetime.now()}] Triggering for Contract {contract.id}\n")
-                f.write(f"Old Status: {old_status}, New Status: {effective_status}\n")
-                f.write(f"User Phone: {contract.get_user_info().get('phone')}\n")
-                f.write(f"Start Date: {contract.start_date}\n")
-                f.write(f"Payment Day: {contract.payment_day}\n")
+                # Use DB template (queued in the outbox, committed with the status change)
+                SmsOutboxService.enqueue(contract, 'SIGNATURE_REQUESTED')
 
-            try:
-                context = build_sms_context(contract, 'CONTRACT_APPROVED')
-                success, msg = sms_service.send_sms(contract.id, 'CONTRACT_APPROVED', context)
-                
-                with open('sms_debug.txt', 'a', encoding='utf-8') as f:
-                    f.write(f"send_sms result: success={success}, msg={msg}\n")
-            except Exception as e:
-                with open('sms_debug.txt', 'a', encoding='utf-8') as f:
-                    f.write(f"SMS trigger error (APPROVED): {str(e)}\n")
-                print(f"SMS trigger error (APPROVED): {e}")
+            success, msg = SmsOutboxService.enqueue(contract, 'CONTRACT_APPROVED')
+            logger.info(f"CONTRACT_APPROVED SMS for contract {contract.id} ({old_status} -> {effective_status}): "
+                        f"success={success}, msg={msg}")
 
         # --- SMS Trigger (New: Termination Approval) ---
         if new_status == 'terminated' or (effective_status == 'terminate_requested' and old_status != effective_status):
@@ -735,23 +488,13 @@ def update_contract_status(current_user, id):
              # (though force_send=True is used, it's safer to check context)
              termination_req = next((r for r in contract.requests if r.type == 'termination' and r.status != 'done'), None)
              if termination_req or (new_status == 'terminated' and old_status != 'terminated'):
-                try:
-                    from app.utils.sms_service import sms_service
-                    from app.utils.sms_context import build_sms_context
-                    context = build_sms_context(contract, 'MOVEOUT_APPROVED')
-                    sms_service.send_sms(contract.id, 'MOVEOUT_APPROVED', context)
-                except Exception as e:
-                    print(f"SMS trigger error (MOVEOUT_APPROVED): {e}")
+                from app.services.sms_outbox_service import SmsOutboxService
+                SmsOutboxService.enqueue(contract, 'MOVEOUT_APPROVED')
 
         # --- SMS Trigger (New: Rejection/Cancellation) ---
         if effective_status == 'cancelled' and old_status != 'cancelled':
-            try:
-                from app.utils.sms_service import sms_service
-                from app.utils.sms_context import build_sms_context
-                context = build_sms_context(contract, 'CONTRACT_REJECTED', reject_reason=data.get('reason', '사유 미입력'))
-                sms_service.send_sms(contract.id, 'CONTRACT_REJECTED', context)
-            except Exception as e:
-                print(f"SMS trigger error (CONTRACT_REJECTED): {e}")
+            from app.services.sms_outbox_service import SmsOutboxService
+            SmsOutboxService.enqueue(contract, 'CONTRACT_REJECTED', reject_reason=data.get('reason', '사유 미입력'))
 
         # 3. Sync room status with contract status
         if contract.room:
@@ -782,14 +525,9 @@ def update_contract_status(current_user, id):
             for r in termination_reqs:
                 r.status = 'done'
             
-            # --- SMS Trigger (New) ---
-            try:
-                from app.utils.sms_service import sms_service
-                from app.utils.sms_context import build_sms_context
-                context = build_sms_context(contract, 'MOVEOUT_APPROVED')
-                sms_service.send_sms(contract.id, 'MOVEOUT_APPROVED', context)
-            except Exception as e:
-                print(f"SMS trigger error (MOVEOUT_APPROVED): {e}")
+            # --- SMS Trigger (New, outbox - deduplicated with the one above) ---
+            from app.services.sms_outbox_service import SmsOutboxService
+            SmsOutboxService.enqueue(contract, 'MOVEOUT_APPROVED')
         
         elif new_status == 'active' and old_status == 'terminate_requested':
             # Mark any pending termination request as 'cancelled' (Rejected case)
@@ -832,9 +570,8 @@ def update_request_status(current_user, id):
             details_dict['responded_at'] = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
             req.details = json.dumps(details_dict)
             
-        # --- SMS Context Prep ---
-        from app.utils.sms_service import sms_service
-        from app.utils.sms_context import build_sms_context
+        # --- SMS (queued in the outbox, committed with the request status) ---
+        from app.services.sms_outbox_service import SmsOutboxService
 
         # Handle automatic actions for specific request types (Approval/Rejection)
         if data.get('status') == 'done':
@@ -848,11 +585,7 @@ def update_request_status(current_user, id):
                     req.details = json.dumps(details_dict)
                     
                     # --- SMS Trigger: EXTEND_APPROVED ---
-                    try:
-                        context = build_sms_context(req.contract, 'EXTEND_APPROVED')
-                        sms_service.send_sms(req.contract.id, 'EXTEND_APPROVED', context)
-                    except Exception as e:
-                        print(f"SMS trigger error (EXTEND_APPROVED): {e}")
+                    SmsOutboxService.enqueue(req.contract, 'EXTEND_APPROVED')
             
             elif req.type == 'termination' and req.contract:
                 # Update end_date to requested termination date if available
@@ -860,11 +593,7 @@ def update_request_status(current_user, id):
                     req.contract.end_date = req.contract.termination_effective_date
                 
                 # --- SMS Trigger (New) ---
-                try:
-                    context = build_sms_context(req.contract, 'MOVEOUT_APPROVED')
-                    sms_service.send_sms(req.contract.id, 'MOVEOUT_APPROVED', context)
-                except Exception as e:
-                    print(f"SMS trigger error (MOVEOUT_APPROVED): {e}")
+                SmsOutboxService.enqueue(req.contract, 'MOVEOUT_APPROVED')
 
                 today = datetime.utcnow().date()
                 if req.contract.end_date <= today:
@@ -894,19 +623,11 @@ def update_request_status(current_user, id):
         elif data.get('status') == 'cancelled':
             # Handle rejection notifications
             if req.type == 'extension' and req.contract:
-                try:
-                    context = build_sms_context(req.contract, 'EXTEND_REJECTED', reject_reason=data.get('admin_response', '사유 미입력'))
-                    sms_service.send_sms(req.contract.id, 'EXTEND_REJECTED', context)
-                except Exception as e:
-                    print(f"SMS trigger error (EXTEND_REJECTED): {e}")
+                SmsOutboxService.enqueue(req.contract, 'EXTEND_REJECTED', reject_reason=data.get('admin_response', '사유 미입력'))
             
             elif req.type == 'termination' and req.contract:
-                try:
-                    # Use CONTRACT_REJECTED for termination rejection (moveout 반려)
-                    context = build_sms_context(req.contract, 'CONTRACT_REJECTED', reject_reason=data.get('admin_response', '사유 미입력'))
-                    sms_service.send_sms(req.contract.id, 'CONTRACT_REJECTED', context)
-                except Exception as e:
-                    print(f"SMS trigger error (CONTRACT_REJECTED via termination failure): {e}")
+                # Use CONTRACT_REJECTED for termination rejection (moveout 반려)
+                SmsOutboxService.enqueue(req.contract, 'CONTRACT_REJECTED', reject_reason=data.get('admin_response', '사유 미입력'))
             
         db.session.commit()
         return jsonify({'message': 'Request status updated'})
@@ -918,36 +639,7 @@ def update_request_status(current_user, id):
 def get_branches(current_user):
     """Get all branches"""
     branches = Branch.query.all()
-    return jsonify([{
-        'id': b.id,
-        'name': b.name,
-        'address': b.address,
-        'facilities': b.facilities,
-        'description': b.description,
-        'image_url': b.image_url,
-        'operating_hours': b.operating_hours,
-        'contact': b.contact,
-        'traffic_info': b.traffic_info,
-        'parking_info': b.parking_info,
-        'map_info': b.map_info,
-        'is_corporate': b.is_corporate,
-        'registration_number': b.registration_number,
-        'owner_name': b.owner_name,
-        'owner_address': b.owner_address,
-        'owner_birth_date': b.owner_birth_date,
-        'owner_contact': b.owner_contact,
-        'owner_seal_image': b.owner_seal_image,
-        'images': [{'id': img.id, 'url': img.image_url} for img in b.images],
-        'rooms': [{
-            'id': r.id,
-            'name': r.name,
-            'price': r.price,
-            'deposit': r.deposit,
-            'status': r.status,
-            'floor': r.floor,
-            'room_type': r.room_type
-        } for r in b.rooms]
-    } for b in branches])
+    return jsonify(BranchSerializer('admin_list').many(branches))
 
 @admin_bp.route('/api/branches', methods=['POST'])
 @admin_required
@@ -1011,6 +703,9 @@ def create_branch(current_user):
             branch.owner_seal_image = f"/static/uploads/seals/{unique_filename}"
     
     db.session.add(branch)
+    # 공개 API(rooms-status)에서 바로 찾을 수 있도록 지점명(과 기존 영문 slug)을 기본 별칭으로 등록
+    if BranchAliasService.add_default_alias(branch):
+        BranchAliasService.invalidate()
     db.session.commit()
     return jsonify({'message': 'Branch created', 'id': branch.id}), 201
 
@@ -1020,72 +715,7 @@ def create_branch(current_user):
 def get_branch(current_user, id):
     """Get branch details with rooms"""
     branch = Branch.query.get_or_404(id)
-    
-    # Group rooms by floor
-    rooms_by_floor = {}
-    for room in branch.rooms:
-        floor = room.floor or '1F'
-        if floor not in rooms_by_floor:
-            rooms_by_floor[floor] = []
-        
-        rooms_by_floor[floor].append({
-            'id': room.id,
-            'name': room.name,
-            'room_type': room.room_type,
-            'price': room.price,
-            'status': room.status,
-            'description': room.description,
-            'floor': floor,
-            'position_x': room.position_x,
-            'position_y': room.position_y,
-            'width': room.width,
-            'height': room.height,
-            'images': [{'id': img.id, 'url': img.image_url} for img in room.images]
-        })
-    
-    # Get floor plans
-    floor_plans = {}
-    for fp in branch.floors:
-        floor_plans[fp.floor] = fp.floor_plan_image
-
-    return jsonify({
-        'id': branch.id,
-        'name': branch.name,
-        'address': branch.address,
-        'facilities': branch.facilities,
-        'description': branch.description,
-        'operating_hours': branch.operating_hours,
-        'contact': branch.contact,
-        'traffic_info': branch.traffic_info,
-        'parking_info': branch.parking_info,
-        'map_info': branch.map_info,
-        'is_corporate': branch.is_corporate,
-        'registration_number': branch.registration_number,
-        'owner_name': branch.owner_name,
-        'owner_address': branch.owner_address,
-        'owner_birth_date': branch.owner_birth_date,
-        'owner_contact': branch.owner_contact,
-        'owner_seal_image': branch.owner_seal_image,
-        'rooms': [{
-            'id': r.id,
-            'name': r.name,
-            'room_type': r.room_type,
-            'price': r.price,
-            'deposit': r.deposit,
-            'area': r.area,
-            'description': r.description,
-            'status': r.status,
-            'floor': r.floor,
-            'images': [{'id': img.id, 'url': img.image_url} for img in r.images]
-        } for r in branch.rooms],
-        'rooms_by_floor': rooms_by_floor,
-        'floor_plans': floor_plans,
-        'floors': [f.floor for f in branch.floors],
-        'image_url': branch.image_url,
-        'images': [{'id': img.id, 'url': img.image_url} for img in branch.images]
-    })
-
-
+    return jsonify(BranchSerializer('admin_detail').one(branch))
 
 @admin_bp.route('/api/branches/<int:id>', methods=['PUT'])
 @admin_required
@@ -1213,6 +843,60 @@ def delete_branch_image(current_user, branch_id, image_id):
     db.session.commit()
     return jsonify({'message': 'Image deleted successfully'})
 
+@admin_bp.route('/api/branches/<int:id>/aliases', methods=['GET'])
+@admin_required
+def get_branch_aliases(current_user, id):
+    """지점 slug/별칭 목록 조회"""
+    branch = Branch.query.get_or_404(id)
+    aliases = branch.aliases.order_by(BranchAlias.is_primary.desc(), BranchAlias.alias).all()
+    return jsonify([{
+        'id': a.id,
+        'alias': a.alias,
+        'is_primary': a.is_primary
+    } for a in aliases])
+
+@admin_bp.route('/api/branches/<int:id>/aliases', methods=['POST'])
+@admin_required
+def add_branch_alias(current_user, id):
+    """지점 slug/별칭 추가 (is_primary=true 이면 대표 slug로 지정)"""
+    branch = Branch.query.get_or_404(id)
+    data = request.get_json()
+
+    alias = BranchAlias.normalize(data.get('alias'))
+    if not alias:
+        return jsonify({'error': 'Alias is required'}), 400
+
+    existing = BranchAlias.query.filter_by(alias=alias).first()
+    if existing:
+        return jsonify({'error': 'Alias already exists', 'branch_id': existing.branch_id}), 400
+
+    is_primary = bool(data.get('is_primary', False))
+    if is_primary:
+        branch.aliases.filter_by(is_primary=True).update({'is_primary': False})
+
+    branch_alias = BranchAlias(branch_id=branch.id, alias=alias, is_primary=is_primary)
+    db.session.add(branch_alias)
+    BranchAliasService.invalidate()
+
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Alias already exists'}), 400
+
+    return jsonify({'message': 'Alias added', 'id': branch_alias.id, 'alias': alias}), 201
+
+@admin_bp.route('/api/branches/<int:id>/aliases/<int:alias_id>', methods=['DELETE'])
+@admin_required
+def delete_branch_alias(current_user, id, alias_id):
+    """지점 slug/별칭 삭제"""
+    branch_alias = BranchAlias.query.filter_by(id=alias_id, branch_id=id).first_or_404()
+
+    db.session.delete(branch_alias)
+    BranchAliasService.invalidate()
+    db.session.commit()
+    return jsonify({'message': 'Alias deleted'})
+
 @admin_bp.route('/api/branches/<int:id>', methods=['DELETE'])
 @admin_required
 def delete_branch(current_user, id):
@@ -1346,20 +1030,28 @@ def upload_floor_plan(current_user, id, floor):
 @admin_bp.route('/api/branches/<int:id>/floors/<floor>/positions', methods=['PUT'])
 @admin_required
 def update_room_positions(current_user, id, floor):
-    """Update room positions for a floor"""
-    data = request.get_json()
-    positions = data.get('positions', [])
-    
-    for pos in positions:
-        room = Room.query.get(pos['id'])
-        if room and room.branch_id == id:
-            room.position_x = pos.get('x')
-            room.position_y = pos.get('y')
-            room.width = pos.get('w')
-            room.height = pos.get('h')
-            
+    """
+    Update room positions for a floor
+
+    모든 방 ID를 지점/층 기준으로 한 번에 검증한 뒤 UPDATE 한 번으로 저장하고 새 배치도 버전을 반환합니다.
+    version 을 보내면 현재 배치도 버전과 다를 때 409로 거부합니다.
+    """
+    data = request.get_json() or {}
+    expected_version = data.get('version')
+    if expected_version is not None and (isinstance(expected_version, bool) or not isinstance(expected_version, int)):
+        return jsonify({'error': 'Invalid version'}), 400
+
+    try:
+        version = FloorLayoutService.update_positions(id, floor, data.get('positions', []), expected_version)
+    except LayoutConflictError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e), 'version': e.current_version}), 409
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
     db.session.commit()
-    return jsonify({'message': 'Positions updated'})
+    return jsonify({'message': 'Positions updated', 'version': version})
 
 @admin_bp.route('/api/branches/<int:id>/floors', methods=['POST'])
 @admin_required
@@ -1459,21 +1151,58 @@ def delete_room_image(current_user, room_id, image_id):
 def get_unmapped_contracts(current_user):
     """모든 미매핑 계약 조회"""
     unmapped = ContractMappingService.get_all_unmapped_contracts()
-    
-    return jsonify([{
-        'id': c.id,
-        'temp_user_name': c.temp_user_name,
-        'temp_user_phone': c.temp_user_phone,
-        'temp_user_email': c.temp_user_email,
-        'room_name': c.room.name if c.room else '알 수 없음',
-        'branch_name': c.room.branch.name if c.room and c.room.branch else '알 수 없음',
-        'deposit': c.room.deposit if c.room else 0,
-        'price': c.room.price if c.room else 0,
-        'start_date': c.start_date.strftime('%Y-%m-%d'),
-        'end_date': c.end_date.strftime('%Y-%m-%d'),
-        'status': c.status,
-        'created_at': c.created_at.strftime('%Y-%m-%d %H:%M') if c.created_at else ''
-    } for c in unmapped])
+    return jsonify(ContractSerializer('unmapped').many(unmapped))
+
+@admin_bp.route('/api/contracts/import', methods=['POST'])
+@admin_required
+def import_contracts(current_user):
+    """
+    계약 일괄 등록 (multipart: file=.xlsx/.csv)
+
+    form 파라미터:
+        dry_run: 기본 1. 1이면 저장하지 않고 행별 처리 계획만 반환
+        skip_errors: 1이면 오류 행을 건너뛰고 나머지를 저장 (기본은 오류가 있으면 저장하지 않음)
+    """
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({'error': 'file is required'}), 400
+    dry_run = request.form.get('dry_run', '1') not in ('0', 'false')
+    skip_errors = request.form.get('skip_errors') in ('1', 'true')
+
+    try:
+        rows = ContractImportService.read_rows(upload)
+    except ImportFormatError as e:
+        return jsonify({'error': str(e)}), 400
+
+    plans = ContractImportService.plan(rows)
+    summary = ContractImportService.summarize(plans)
+    result = {
+        'dry_run': dry_run,
+        'summary': summary,
+        'rows': [{
+            'row': p['row'],
+            'action': p['action'],
+            'errors': p['errors'],
+            'message': p['message'],
+            'contract': {
+                k: v.isoformat() if isinstance(v, date) else v for k, v in p['values'].items()
+            } if p['values'] else None
+        } for p in plans]
+    }
+
+    if dry_run:
+        db.session.rollback()
+        return jsonify(result)
+    if summary['error'] and not skip_errors:
+        db.session.rollback()
+        result['error'] = '오류가 있는 행이 있어 저장하지 않았습니다. (skip_errors=1 로 오류 행 제외 후 저장 가능)'
+        return jsonify(result), 400
+
+    created = ContractImportService.apply(plans, actor_id=current_user.id)
+    db.session.commit()
+    for row in result['rows']:
+        row['contract_id'] = created.get(row['row'])
+    return jsonify(result), 201
 
 @admin_bp.route('/api/contracts/unmapped', methods=['POST'])
 @admin_required
@@ -1548,14 +1277,7 @@ def search_user_for_contract(current_user, contract_id):
     
     # 중복 제거
     unique_users = {user.id: user for user in matching_users}.values()
-    
-    return jsonify([{
-        'id': u.id,
-        'name': u.name,
-        'email': u.email,
-        'phone': u.phone,
-        'created_at': u.created_at.strftime('%Y-%m-%d %H:%M') if u.created_at else ''
-    } for u in unique_users])
+    return jsonify(UserSerializer('match').many(unique_users))
 
 
 # ============================================================
@@ -1566,26 +1288,27 @@ def search_user_for_contract(current_user, contract_id):
 @admin_required
 @db_retry(max_retries=3, delay=1)
 def get_users(current_user):
-    """모든 회원 조회"""
-    users = User.query.all()
-    result = []
-    
-    for u in users:
-        active_branch_ids = [c.room.branch_id for c in u.contracts if c.status == 'active' and c.room]
-        result.append({
-            'id': u.id,
-            'name': u.name,
-            'email': u.email,
-            'phone': u.phone,
-            'kakao_id': u.kakao_id,
-            'role': u.role,
-            'onboarding_status': u.onboarding_status,
-            'created_at': u.created_at.strftime('%Y-%m-%d %H:%M') if u.created_at else '',
-            'contract_count': len(active_branch_ids),
-            'branch_ids': list(set(active_branch_ids))
-        })
-    
-    return jsonify(result)
+    """
+    회원 조회
+
+    필터: UserQueryService.filtered_query 참고 (q, role, branch_id)
+    limit(최대 USER_PAGE_MAX) 이 있으면 {"items": [...], "next_cursor": ..., "total": ...} 형태의 키셋 페이지
+    (sort=id|-id, 기본 -id), 없으면 기존처럼 전체 배열(id 오름차순)로 응답합니다.
+    """
+    args = request.args
+    columns = [User.id]
+    try:
+        query = UserQueryService.filtered_query(args)
+        limit = limit_arg(args, USER_PAGE_MAX)
+        _, descending = parse_sort(args.get('sort'), {'id'}, '-id' if limit else 'id')
+        cursor = decode_cursor(args['cursor'], columns) if args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    meta = {'total': query.order_by(None).count()} if args.get('total') in ('1', 'true') else None
+    chunks = iter_keyset(query, columns, limit=limit, cursor_values=cursor, descending=descending)
+    body = stream_json_page(chunks, UserSerializer('admin').many, meta=meta, legacy_array=limit is None)
+    return Response(stream_with_context(body), mimetype='application/json')
 
 @admin_bp.route('/api/users', methods=['POST'])
 @admin_required
@@ -1772,105 +1495,37 @@ def get_calendar_events(current_user):
     except ValueError:
         return jsonify({'error': 'Invalid date format'}), 400
 
-    events = []
+    if event_type not in ('all', 'time', 'monthly'):
+        return jsonify({'error': 'type must be all, time or monthly'}), 400
 
-    # 1. Time-based Contracts (Reservations)
-    if event_type in ['all', 'time']:
-        time_contracts = Contract.query.join(Contract.room).filter(
-            Room.room_type == 'time_based',
-            Contract.start_date >= start_date,
-            Contract.end_date <= end_date
-        ).all()
+    return jsonify(PaymentScheduleService.events(start_date, end_date, event_type))
 
-        for c in time_contracts:
-            user_info = c.get_user_info()
-            user_name = user_info['name'] or 'Unknown'
-            
-            # Combine date and time for FullCalendar
-            start_dt = f"{c.start_date}T{c.start_time}"
-            end_dt = f"{c.end_date}T{c.end_time}"
-            
-            branch_name = c.room.branch.name if c.room and c.room.branch else 'Unknown'
-            events.append({
-                'title': f'[{branch_name}] {user_name} ({c.start_time}~{c.end_time})',
-                'start': start_dt,
-                'end': end_dt,
-                'color': '#3b82f6', # Blue for time-based
-                'extendedProps': {
-                    'contract_id': c.id,
-                    'amount': c.price,
-                    'type': 'time',
-                    'room_name': c.room.name,
-                    'branch_name': branch_name
-                }
-            })
-
-    # 2. Monthly Contracts (Payment Days)
-    if event_type in ['all', 'monthly']:
-        monthly_contracts = Contract.query.join(Contract.room).filter(
-            Room.room_type != 'time_based',
-            Contract.status == 'active',
-            # Overlap check: Contract must be active during the requested window
-            Contract.start_date <= end_date,
-            Contract.end_date >= start_date
-        ).all()
-
-        for c in monthly_contracts:
-            if not c.payment_day:
-                continue
-                
-            # Iterate through months in the requested range to generate payment events
-            # Start iteration from the later of (range start, contract start)
-            current_iter_date = max(start_date, c.start_date)
-            # End iteration at the earlier of (range end, contract end)
-            end_iter_date = min(end_date, c.end_date)
-            
-            # Normalize to the first of the month to start iteration loop cleanly
-            iter_month = current_iter_date.replace(day=1)
-            
-            while iter_month <= end_iter_date:
-                # Calculate payment date for this month
-                # Handle short months (e.g., payment day 31 in Feb) -> standard approach is skip or last day.
-                # Here we will try to use the exact day. If invalid (e.g. Feb 30), we skip for simplicity or clamp.
-                # Creates a robust "last day" logic:
-                
-                try:
-                    payment_date = iter_month.replace(day=c.payment_day)
-                except ValueError:
-                    # If day is out of range for this month, set to last day of month
-                    # (e.g. payment day 31 in Feb -> Feb 28/29)
-                    next_month = iter_month + relativedelta(months=1)
-                    last_day_of_month = next_month - timedelta(days=1)
-                    payment_date = last_day_of_month
-                
-                # Check if this specific payment date is within the contract period AND requested range
-                if (payment_date >= c.start_date and 
-                    payment_date <= c.end_date and 
-                    payment_date >= start_date and 
-                    payment_date <= end_date):
-                    
-                    user_info = c.get_user_info()
-                    user_name = user_info['name'] or 'Unknown'
-                    
-                    branch_name = c.room.branch.name if c.room and c.room.branch else 'Unknown'
-                    events.append({
-                        'title': f'[{branch_name}] 결제: {user_name} ({c.room.name})',
-                        'start': payment_date.isoformat(),
-                        'allDay': True,
-                        'color': '#10b981', # Green for monthly payment
-                        'extendedProps': {
-                            'contract_id': c.id,
-                            'amount': c.price,
-                            'type': 'monthly',
-                            'room_name': c.room.name,
-                            'branch_name': branch_name
-                        }
-                    })
-                
-                # Move to next month
-                iter_month += relativedelta(months=1)
-            
-    return jsonify(events)
+@admin_bp.route('/api/calendar/feed.ics', methods=['GET'])
+def get_calendar_feed():
+    """
+    캘린더 구독용 iCal 피드 (?token=CALENDAR_FEED_TOKEN&type=all|time|monthly)
+
+    캘린더 앱은 Authorization 헤더를 보낼 수 없으므로 설정된 구독 토큰으로 인증합니다.
+    지난달 1일부터 CALENDAR_FEED_MONTHS 개월 뒤 말일까지의 일정을 스트리밍합니다.
+    """
+    feed_token = current_app.config.get('CALENDAR_FEED_TOKEN')
+    token = request.args.get('token', '')
+    if not feed_token or not hmac.compare_digest(token.encode('utf-8'), feed_token.encode('utf-8')):
+        return jsonify({'error': 'Not found'}), 404
+
+    event_type = request.args.get('type', 'all')
+    if event_type not in ('all', 'time', 'monthly'):
+        return jsonify({'error': 'type must be all, time or monthly'}), 400
+
+    today = date.today()
+    start_date = (today - relativedelta(months=1)).replace(day=1)
+    end_date = (today + relativedelta(months=CALENDAR_FEED_MONTHS + 1)).replace(day=1) - timedelta(days=1)
+    events = PaymentScheduleService.events(start_date, end_date, event_type)
+
+    body = stream_ics(events, '이룸 스튜디오 관리자 캘린더', request.host)
+    response = Response(stream_with_context(body), mimetype='text/calendar')
+    response.headers['Content-Disposition'] = 'inline; filename="calendar.ics"'
+    return response
 
 
 
@@ -1892,24 +1547,10 @@ def get_sms_templates(current_user):
     """GET all SMS templates"""
     templates = SmsTemplate.query.all()
     
-    # Pre-calculate byte length using dummy data
-    dummy_context = get_dummy_context()
-    
     results = []
     for t in templates:
-        # Render with dummy data
-        rendered, _ = sms_service.render_template(t.content, dummy_context)
-        
-        # Calculate bytes (EUC-KR estimation: Korean=2, ASCII=1)
-        # Python len(encode('euc-kr')) is accurate for this.
-        try:
-            # Aligo uses EUC-KR. 
-            predicted_bytes = len(rendered.encode('euc-kr'))
-        except UnicodeEncodeError:
-            # Fallback for chars not in EUC-KR (e.g. some emojis) -> use utf-8 length or estimate
-            predicted_bytes = len(rendered.encode('utf-8'))
-            
-        predicted_type = 'LMS' if predicted_bytes > 90 else 'SMS'
+        # 더미 데이터로 렌더링한 EUC-KR 바이트 수/유형 (템플릿 수정 전까지 캐시)
+        predicted_bytes, predicted_type = sms_service.template_preview(t)
 
         results.append({
             'id': t.id,
@@ -1919,6 +1560,7 @@ def get_sms_templates(current_user):
             'is_active': t.is_active,
             'schedule_offset': t.schedule_offset,
             'allowed_variables': SMS_VARIABLE_SCHEMA.get(t.type, []),
+            'unknown_variables': sms_service.unknown_variables(t.type, sms_service.compile(t)),
             'updated_at': t.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
             'predicted_bytes': predicted_bytes,
             'predicted_type': predicted_type
@@ -1944,32 +1586,39 @@ def update_sms_template(current_user, id):
         
     template.updated_by_admin_id = current_user.id
     template.updated_reason = data.get('reason')
+    # 모든 워커의 템플릿 레지스트리 갱신 (수정과 같은 트랜잭션에서 버전 증가)
+    SmsTemplateRegistry.invalidate()
     
     db.session.commit()
-    return jsonify({'message': 'Template updated'})
+    # 스키마에 없는 변수는 저장은 하되 경고로 알림 (발송 시 값이 없으면 FAILED 처리됨)
+    unknown = sms_service.unknown_variables(template.type, sms_service.compile(template))
+    return jsonify({'message': 'Template updated', 'unknown_variables': unknown})
 
 @admin_bp.route('/api/sms/logs', methods=['GET'])
 @admin_required
 def get_sms_logs(current_user):
-    """GET SMS logs with filtering"""
-    status_filter = request.args.get('status')
-    query = SmsLog.query
-    
-    if status_filter:
-        query = query.filter_by(status=status_filter)
-        
-    logs = query.order_by(SmsLog.sent_at.desc()).limit(100).all()
-    
-    return jsonify([{
-        'id': l.id,
-        'contract_id': l.contract_id,
-        'user_name': l.contract.get_user_info()['name'] if l.contract else 'N/A',
-        'type': l.type,
-        'content': l.content_snapshot,
-        'status': l.status,
-        'sent_at': l.sent_at.strftime('%m-%d %H:%M'),
-        'error_message': l.error_message
-    } for l in logs])
+    """
+    GET SMS logs with filtering (최신순)
+
+    필터: SmsLogQueryService.filtered_query 참고 (type, status, contract_id, branch_id, date_from, date_to, dedup_prefix, q)
+    limit(최대 SMS_LOG_PAGE_MAX) 이 있으면 {"items": [...], "next_cursor": ..., "total": ...} 형태의 키셋 페이지,
+    없으면 기존처럼 최근 SMS_LOG_LEGACY_LIMIT 건 배열로 응답합니다.
+    """
+    args = request.args
+    columns = [SmsLog.sent_at, SmsLog.id]
+    try:
+        query = SmsLogQueryService.filtered_query(args)
+        limit = limit_arg(args, SMS_LOG_PAGE_MAX)
+        cursor = decode_cursor(args['cursor'], columns) if args.get('cursor') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    meta = {'total': query.order_by(None).count()} if args.get('total') in ('1', 'true') else None
+    chunks = iter_keyset(
+        query, columns, limit=limit or SMS_LOG_LEGACY_LIMIT, cursor_values=cursor, descending=True
+    )
+    body = stream_json_page(chunks, SmsLogSerializer('admin').many, meta=meta, legacy_array=limit is None)
+    return Response(stream_with_context(body), mimetype='application/json')
 
 @admin_bp.route('/api/sms/preview', methods=['POST'])
 @admin_required
@@ -2032,46 +1681,19 @@ def send_manual_sms(current_user):
 @admin_bp.route('/api/contracts/search', methods=['GET'])
 @admin_required
 def search_contracts(current_user):
-    """Search contracts by user name or phone"""
+    """
+    Search contracts by tenant name (초성 포함), phone, room or branch name
+
+    공백으로 나눈 검색어를 모두 만족하는 계약을 점수순으로 최대 20건 반환합니다.
+    (SearchIndexService 참고)
+    """
     q = request.args.get('q', '').strip()
-    if len(q) < 2:
+    contract_ids = SearchIndexService.search(q, limit=20)
+    if not contract_ids:
         return jsonify([])
 
-    # Mapped contracts (Active Only for now, or all?)
-    # User might want to send SMS to 'terminated' users too (e.g. deposit refund).
-    # So let's include terminated.
-    mapped = Contract.query.join(User).filter(
-        (User.name.ilike(f'%{q}%')) | (User.phone.ilike(f'%{q}%'))
-    ).limit(20).all()
-
-    # Unmapped contracts
-    unmapped = Contract.query.filter(
-        Contract.user_id == None,
-        (Contract.temp_user_name.ilike(f'%{q}%')) | (Contract.temp_user_phone.ilike(f'%{q}%'))
-    ).limit(20).all()
-
-    results = []
-    # Deduplicate by ID just in case, though unlikely
-    seen_ids = set()
-    
-    for c in mapped + unmapped:
-        if c.id in seen_ids:
-            continue
-        seen_ids.add(c.id)
-        
-        user_info = c.get_user_info()
-        results.append({
-            'id': c.id,
-            'user_name': user_info['name'],
-            'user_phone': user_info['phone'],
-            'room_name': c.room.name if c.room else 'N/A',
-            'branch_name': c.room.branch.name if c.room and c.room.branch else 'N/A',
-            'status': c.status,
-            'start_date': c.start_date.strftime('%Y-%m-%d'),
-            'end_date': c.end_date.strftime('%Y-%m-%d')
-        })
-    
-    return jsonify(results[:20])
+    contracts = {c.id: c for c in Contract.query.filter(Contract.id.in_(contract_ids)).all()}
+    return jsonify(ContractSerializer('search').many(contracts[cid] for cid in contract_ids if cid in contracts))
 
 # ============================================================
 # 특정 월 추가 할인 (Custom Discount) API
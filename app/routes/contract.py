@@ -3,6 +3,7 @@ from app.models.contract import Contract, TermsDocument
 from app.models.branch import Room
 from app.models.coupon import Coupon
 from app.extensions import db
+from app.serializers import ContractSerializer
 from app.routes.auth import token_required
 from app.utils.evidence import log_contract_status_change, get_server_side_terms, generate_content_hash
 import datetime
@@ -351,24 +352,17 @@ def create_contract(current_user):
         source='public_api'
     )
     
+    # --- SMS Trigger (outbox: committed with the contract, sent by the dispatcher) ---
+    from app.services.sms_outbox_service import SmsOutboxService
+    # User Notification
+    SmsOutboxService.enqueue(contract, 'CONTRACT_APPLIED', amount=format(final_price, ','))
+
+    # Admin Notification (New)
+    admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
+    if admin_phone:
+        SmsOutboxService.enqueue(contract, 'ADMIN_CONTRACT_APPLIED', to_number=admin_phone)
+
     db.session.commit()
-    
-    # --- SMS Trigger (New) ---
-    try:
-        from app.utils.sms_service import sms_service
-        from app.utils.sms_context import build_sms_context
-        # User Notification
-        context = build_sms_context(contract, 'CONTRACT_APPLIED', amount=format(final_price, ','))
-        sms_service.send_sms(contract.id, 'CONTRACT_APPLIED', context)
-        
-        # Admin Notification (New)
-        admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
-        if admin_phone:
-            admin_context = build_sms_context(contract, 'ADMIN_CONTRACT_APPLIED')
-            sms_service.send_sms(contract.id, 'ADMIN_CONTRACT_APPLIED', admin_context, to_number=admin_phone)
-    except Exception as e:
-        # Don't block contract creation if SMS fails, but log it
-        print(f"SMS trigger error: {e}")
 
     return jsonify({
         'id': contract.id,
@@ -382,43 +376,7 @@ def create_contract(current_user):
 @token_required
 def get_my_contracts(current_user):
     contracts = current_user.contracts.all()
-    result = []
-    for c in contracts:
-        custom_discounts_data = []
-        for cd in c.custom_discounts:
-            custom_discounts_data.append({
-                'id': cd.id,
-                'target_month': cd.target_month,
-                'amount': cd.amount,
-                'reason': cd.reason
-            })
-
-        result.append({
-            'id': c.id,
-            'room': {
-                'id': c.room.id,
-                'name': c.room.name,
-                'room_type': c.room.room_type,
-                'price': c.room.price,
-                'deposit': c.room.deposit,
-                'branch': {
-                    'name': c.room.branch.name if c.room.branch else '알 수 없음'
-                }
-            },
-            'start_date': c.start_date.isoformat(),
-            'end_date': c.end_date.isoformat(),
-            'is_indefinite': c.is_indefinite,
-            'price': c.price,
-            'deposit': c.deposit,
-            'status': c.status,
-            'payment_day': c.payment_day,
-            'payment_method': c.payment_method,
-            'discount_details': json.loads(c.discount_details) if c.discount_details else None,
-            'coupon_name': c.coupon.name if c.coupon else None,
-            'termination_effective_date': c.termination_effective_date.strftime('%Y-%m-%d') if c.termination_effective_date else None,
-            'custom_discounts': custom_discounts_data
-        })
-    return jsonify(result)
+    return jsonify(ContractSerializer('my').many(contracts))
 
 @contract_bp.route('/<int:id>/sign', methods=['POST'])
 @token_required
@@ -471,20 +429,15 @@ def sign_contract(current_user, id):
         reason='User completed electronic signature'
     )
     
+    # SMS Trigger to Admin (outbox)
+    # We need an admin phone number to alert. 
+    # For now, we use branch contact or a config value if available.
+    admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
+    if admin_phone:
+        from app.services.sms_outbox_service import SmsOutboxService
+        SmsOutboxService.enqueue(contract, 'SIGNATURE_COMPLETED', to_number=admin_phone)
+
     db.session.commit()
-    
-    # SMS Trigger to Admin (New)
-    try:
-        from app.utils.sms_service import sms_service
-        from app.utils.sms_context import build_sms_context
-        # We need an admin phone number to alert. 
-        # For now, we use branch contact or a config value if available.
-        admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
-        if admin_phone:
-            context = build_sms_context(contract, 'SIGNATURE_COMPLETED')
-            sms_service.send_sms(contract.id, 'SIGNATURE_COMPLETED', context, to_number=admin_phone)
-    except Exception as e:
-        print(f"Admin SMS error: {e}")
         
     return jsonify({'message': '서명이 완료되었습니다.', 'status': contract.status})
 
@@ -514,19 +467,14 @@ def reject_contract(current_user, id):
         reason=f"User rejected signature: {reason}"
     )
     
+    # SMS Trigger to Admin (Notify Rejection, outbox)
+    # Use branch owner's contact as the 'admin'
+    admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
+    if admin_phone:
+        from app.services.sms_outbox_service import SmsOutboxService
+        SmsOutboxService.enqueue(contract, 'SIGNATURE_REJECTED', to_number=admin_phone)
+
     db.session.commit()
-    
-    # SMS Trigger to Admin (Notify Rejection)
-    try:
-        from app.utils.sms_service import sms_service
-        from app.utils.sms_context import build_sms_context
-        # Use branch owner's contact as the 'admin'
-        admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
-        if admin_phone:
-            context = build_sms_context(contract, 'SIGNATURE_REJECTED')
-            sms_service.send_sms(contract.id, 'SIGNATURE_REJECTED', context, to_number=admin_phone)
-    except Exception as e:
-        print(f"Admin Rejection SMS error: {e}")
         
     return jsonify({'message': '거절 처리가 완료되었습니다.', 'status': contract.status})
 
@@ -1,106 +1,49 @@
 from flask import Blueprint, jsonify, request
 from app.models.branch import Branch, Room
 from app.models.contract import Contract
+from app.services.availability_service import AvailabilityService, RESERVATION_BLOCKING_STATUSES
+from app.services.branch_alias_service import BranchAliasService
+from app.serializers import BranchSerializer, RoomSerializer
 from app.utils.db_utils import db_retry
-from datetime import datetime
+from app.utils.catalog_cache import catalog_response
+from datetime import datetime, timedelta
 
 public_bp = Blueprint('public', __name__, url_prefix='/api/public')
 
 @public_bp.route('/branches', methods=['GET'])
 @db_retry(max_retries=3, delay=1)
 def get_branches():
-    branches = Branch.query.all()
-    result = []
-    for branch in branches:
-        result.append({
-            'id': branch.id,
-            'name': branch.name,
-            'description': branch.description,
-            'address': branch.address,
-            'facilities': branch.facilities,
-            'image_url': branch.image_url
-        })
-    return jsonify(result)
+    return catalog_response('branches', _build_branches)
+
+def _build_branches():
+    return BranchSerializer('public_list').many(Branch.query.all())
 
 @public_bp.route('/branches/<int:branch_id>', methods=['GET'])
 @db_retry(max_retries=3, delay=1)
 def get_branch(branch_id):
+    return catalog_response(f'branch:{branch_id}', lambda: _build_branch(branch_id))
+
+def _build_branch(branch_id):
     branch = Branch.query.get_or_404(branch_id)
-    
-    # Group rooms by floor
-    rooms_by_floor = {}
-    for room in branch.rooms:
-        floor = room.floor or '1F'
-        if floor not in rooms_by_floor:
-            rooms_by_floor[floor] = []
-        
-        rooms_by_floor[floor].append({
-            'id': room.id,
-            'name': room.name,
-            'room_type': room.room_type,
-            'price': room.price,
-            'deposit': room.deposit,
-            'status': room.status,
-            'next_available_date': room.get_next_available_date().isoformat() if room.get_next_available_date() else None,
-            'description': room.description,
-            'area': room.area,
-            'floor': floor,
-            'position_x': room.position_x,
-            'position_y': room.position_y,
-            'width': room.width,
-            'height': room.height,
-            'images': [{'id': img.id, 'url': img.image_url} for img in room.images]
-        })
-    
-    # Get floor plans
-    floor_plans = {}
-    for fp in branch.floors:
-        floor_plans[fp.floor] = fp.floor_plan_image
-    
-    return jsonify({
-        'id': branch.id,
-        'name': branch.name,
-        'description': branch.description,
-        'address': branch.address,
-        'facilities': branch.facilities,
-        'map_info': branch.map_info,
-        'rooms_by_floor': rooms_by_floor,
-        'floor_plans': floor_plans
-    })
+    return BranchSerializer('public_detail').one(branch)
 
 @public_bp.route('/branches/<int:branch_id>/rooms', methods=['GET'])
 @db_retry(max_retries=3, delay=1)
 def get_branch_rooms(branch_id):
+    return catalog_response(f'branch_rooms:{branch_id}', lambda: _build_branch_rooms(branch_id))
+
+def _build_branch_rooms(branch_id):
     branch = Branch.query.get_or_404(branch_id)
-    rooms = branch.rooms.all()
-    result = []
-    for room in rooms:
-        result.append({
-            'id': room.id,
-            'name': room.name,
-            'price': room.price,
-            'status': room.status,
-            'description': room.description,
-            'images': [{'id': img.id, 'url': img.image_url} for img in room.images]
-        })
-    return jsonify(result)
+    return RoomSerializer('public_list').many(branch.rooms.all())
 
 @public_bp.route('/rooms/<int:room_id>', methods=['GET'])
 @db_retry(max_retries=3, delay=1)
 def get_room(room_id):
+    return catalog_response(f'room:{room_id}', lambda: _build_room(room_id))
+
+def _build_room(room_id):
     room = Room.query.get_or_404(room_id)
-    return jsonify({
-        'id': room.id,
-        'branch_id': room.branch_id,
-        'name': room.name,
-        'room_type': room.room_type,
-        'price': room.price,
-        'deposit': room.deposit,
-        'status': room.status,
-        'description': room.description,
-        'next_available_date': room.get_next_available_date().isoformat() if room.get_next_available_date() else None,
-        'images': [{'id': img.id, 'url': img.image_url} for img in room.images]
-    })
+    return RoomSerializer('public_detail').one(room)
 
 @public_bp.route('/rooms/<int:room_id>/reservations', methods=['GET'])
 @db_retry(max_retries=3, delay=1)
@@ -115,12 +58,10 @@ def get_room_reservations(room_id):
         return jsonify({'error': 'Invalid date format'}), 400
         
     # Get all non-cancelled reservations for this room on this date
-    blocking_statuses = ['requested', 'approved', 'active', 'extend_requested']
-    
     reservations = Contract.query.filter(
         Contract.room_id == room_id,
         Contract.start_date == target_date,
-        Contract.status.in_(blocking_statuses)
+        Contract.status.in_(RESERVATION_BLOCKING_STATUSES)
     ).all()
     
     result = []
@@ -133,36 +74,81 @@ def get_room_reservations(room_id):
         
     return jsonify(result)
 
-@public_bp.route('/branches/<string:branch_name>/rooms-status', methods=['GET'])
+GRID_SLOT_MINUTES = (15, 30, 60)
+GRID_MAX_DAYS = 62
+GRID_MAX_ROOMS = 50
+
+@public_bp.route('/rooms/availability-grid', methods=['GET'])
 @db_retry(max_retries=3, delay=1)
-def get_branch_rooms_status(branch_name):
-    # 지점 영문명 -> DB 지점명 매핑
-    mapping = {
-        "samsung": ["삼성점", "삼성", "samsung"],
-        "hongdae": ["홍대점", "홍대", "hongdae"],
-        "incheon": ["인천점", "인천", "incheon"],
-        "mokdong": ["목동점", "목동", "mokdong"],
-        "bongcheon": ["봉천점", "봉천", "bongcheon"],
-        "bucheon": ["부천점", "부천", "bucheon"]
+def get_rooms_availability_grid():
+    """
+    시간제 방들의 기간별 예약 슬롯 비트맵
+
+    Query: room_ids=1,2&start=YYYY-MM-DD&end=YYYY-MM-DD&slot=30
+    각 날짜 값은 슬롯마다 한 글자인 문자열이며 '1'은 예약된 슬롯입니다.
+    """
+    try:
+        room_ids = [int(x) for x in request.args.get('room_ids', '').split(',') if x.strip()]
+    except ValueError:
+        return jsonify({'error': 'Invalid room_ids'}), 400
+    if not room_ids:
+        return jsonify({'error': 'room_ids is required'}), 400
+    if len(room_ids) > GRID_MAX_ROOMS:
+        return jsonify({'error': f'Too many rooms (max {GRID_MAX_ROOMS})'}), 400
+
+    try:
+        start_date = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+        end_str = request.args.get('end')
+        end_date = datetime.strptime(end_str, '%Y-%m-%d').date() if end_str else start_date + timedelta(days=6)
+    except KeyError:
+        return jsonify({'error': 'start is required'}), 400
+    except ValueError:
+        return jsonify({'error': 'Invalid date format'}), 400
+    if end_date < start_date:
+        return jsonify({'error': 'end must not be before start'}), 400
+    if (end_date - start_date).days + 1 > GRID_MAX_DAYS:
+        return jsonify({'error': f'Date range too long (max {GRID_MAX_DAYS} days)'}), 400
+
+    slot_minutes = request.args.get('slot', 30, type=int)
+    if slot_minutes not in GRID_SLOT_MINUTES:
+        return jsonify({'error': f'slot must be one of {list(GRID_SLOT_MINUTES)}'}), 400
+
+    # 시간제 방만 대상 (존재하지 않거나 월 단위 방은 not_found로 반환)
+    found_ids = {
+        room_id for (room_id,) in Room.query.with_entities(Room.id).filter(
+            Room.id.in_(room_ids), Room.room_type == 'time_based'
+        ).all()
     }
-    
-    branch = None
-    search_names = mapping.get(branch_name.lower())
-    if search_names:
-        for name in search_names:
-            branch = Branch.query.filter(Branch.name.like(f"%{name}%")).first()
-            if branch:
-                break
-                
-    if not branch:
-        branch = Branch.query.filter(Branch.name.like(f"%{branch_name}%")).first()
-        
-    if not branch:
-        return jsonify({'error': 'Branch not found'}), 404
-        
+    target_ids = [room_id for room_id in dict.fromkeys(room_ids) if room_id in found_ids]
+
+    grid = AvailabilityService.build_slot_grid(target_ids, start_date, end_date, slot_minutes)
+
+    return jsonify({
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'slot_minutes': slot_minutes,
+        'slots_per_day': 24 * 60 // slot_minutes,
+        'rooms': {str(room_id): days for room_id, days in grid.items()},
+        'not_found': [room_id for room_id in room_ids if room_id not in found_ids]
+    })
+
+def _resolve_branch_names(branch_names):
+    """
+    요청된 지점 slug/별칭을 지점 객체로 변환 (별칭 맵 + 지점 IN 조회 1회)
+
+    Returns:
+        {요청 이름: Branch 또는 None} 딕셔너리
+    """
+    branch_ids = BranchAliasService.resolve_branch_ids(branch_names)
+    ids = {bid for bid in branch_ids.values() if bid}
+    branches = {b.id: b for b in Branch.query.filter(Branch.id.in_(ids)).all()} if ids else {}
+    return {name: branches.get(bid) for name, bid in branch_ids.items()}
+
+def _summarize_rooms_status(branch, rooms, next_dates):
+    """지점의 공실 목록과 만실 여부, 가장 빠른 입실 가능 예정일 요약"""
     # 공실 상태인 방 필터링
     available_rooms = []
-    valid_rooms = [r for r in branch.rooms.all() if r.room_type not in ['time_based', 'manager']]
+    valid_rooms = [r for r in rooms if r.room_type not in ['time_based', 'manager']]
     
     for room in valid_rooms:
         if room.status == 'available':
@@ -181,11 +167,7 @@ def get_branch_rooms_status(branch_name):
     
     if is_fully_occupied:
         # 모든 유효한 방 중 가장 빠른 입실 가능 예정일 계산
-        dates = []
-        for room in valid_rooms:
-            d = room.get_next_available_date()
-            if d:
-                dates.append(d)
+        dates = [next_dates[r.id] for r in valid_rooms if next_dates.get(r.id)]
         if dates:
             next_available_date_str = min(dates).strftime('%Y-%m-%d')
         else:
@@ -193,10 +175,71 @@ def get_branch_rooms_status(branch_name):
             from datetime import date, timedelta
             next_available_date_str = (date.today() + timedelta(days=14)).strftime('%Y-%m-%d')
             
-    return jsonify({
+    return {
         'branch_name': branch.name,
         'available_rooms': available_rooms,
         'is_fully_occupied': is_fully_occupied,
         'next_available_date': next_available_date_str
-    })
+    }
+
+def _build_rooms_status(branches_by_key):
+    """여러 지점의 공실 현황을 방 조회 1회 + 입실 가능일 집계 1회로 생성"""
+    branch_ids = {b.id for b in branches_by_key.values() if b}
+    rooms_by_branch = {}
+    if branch_ids:
+        for room in Room.query.filter(Room.branch_id.in_(branch_ids)).all():
+            rooms_by_branch.setdefault(room.branch_id, []).append(room)
 
+    # 공실이 없는 지점의 방만 입실 가능일 계산 대상
+    occupied_rooms = []
+    for rooms in rooms_by_branch.values():
+        valid_rooms = [r for r in rooms if r.room_type not in ['time_based', 'manager']]
+        if not any(r.status == 'available' for r in valid_rooms):
+            occupied_rooms.extend(valid_rooms)
+    next_dates = AvailabilityService.resolve_next_available_dates(occupied_rooms)
+
+    return {
+        key: _summarize_rooms_status(branch, rooms_by_branch.get(branch.id, []), next_dates)
+        for key, branch in branches_by_key.items() if branch
+    }
+
+@public_bp.route('/branches/<string:branch_name>/rooms-status', methods=['GET'])
+@db_retry(max_retries=3, delay=1)
+def get_branch_rooms_status(branch_name):
+    # 요청 이름이 아닌 지점 ID로 캐시 (없는 지점의 404는 캐시하지 않음)
+    branch = BranchAliasService.resolve(branch_name)
+    if not branch:
+        return jsonify({'error': 'Branch not found'}), 404
+
+    return catalog_response(f'rooms_status:{branch.id}', lambda: _build_rooms_status({branch.id: branch})[branch.id])
+
+@public_bp.route('/rooms-status', methods=['GET'])
+@db_retry(max_retries=3, delay=1)
+def get_all_rooms_status():
+    """
+    전체 지점(또는 ?branches=samsung,hongdae 로 지정한 지점)의 공실 현황 일괄 조회
+    지정한 경우 요청 이름을, 아니면 대표 slug(없으면 지점명)를 키로 사용합니다.
+    """
+    branches_param = request.args.get('branches', '')
+    branch_names = sorted({b.strip().lower() for b in branches_param.split(',') if b.strip()})
+    if not branch_names:
+        return catalog_response('rooms_status_all', lambda: _build_all_rooms_status(_all_branches_by_slug()))
+
+    branches_by_key = _resolve_branch_names(branch_names)
+    if not all(branches_by_key.values()):
+        # 없는 이름이 섞인 요청은 캐시하지 않음 (임의의 이름으로 캐시 항목이 늘어나지 않도록)
+        return jsonify(_build_all_rooms_status(branches_by_key))
+    cache_key = f"rooms_status_all:{','.join(branch_names)}"
+    return catalog_response(cache_key, lambda: _build_all_rooms_status(branches_by_key))
+
+def _all_branches_by_slug():
+    return {
+        BranchAliasService.get_primary_slug(b.id) or b.name: b
+        for b in Branch.query.all()
+    }
+
+def _build_all_rooms_status(branches_by_key):
+    return {
+        'branches': _build_rooms_status(branches_by_key),
+        'not_found': [key for key, branch in branches_by_key.items() if not branch]
+    }
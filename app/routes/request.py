@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from app.models.request import Request
 from app.models.contract import Contract
 from app.extensions import db
+from app.serializers import RequestSerializer
 from app.routes.auth import token_required
 from app.utils.evidence import log_contract_status_change, get_termination_text_template
 from datetime import datetime
@@ -79,31 +80,26 @@ def create_request(current_user):
         details=json.dumps(details),
         status='submitted'
     )
+    new_request.resolve_location(contract if contract_id else None, details)
     
     db.session.add(new_request)
-    db.session.commit()
     
-    # --- SMS Trigger (New) ---
-    try:
-        from app.utils.sms_service import sms_service
-        from app.utils.sms_context import build_sms_context
+    # --- SMS Trigger (outbox: committed with the request, sent by the dispatcher) ---
+    from app.services.sms_outbox_service import SmsOutboxService
 
-        if req_type == 'termination' and contract:
-            # Use the requested termination date for the message if available
-            m_date = details.get('termination_date')
-            context = build_sms_context(contract, 'MOVEOUT_APPLIED', moveout_date=m_date)
-            sms_service.send_sms(contract.id, 'MOVEOUT_APPLIED', context)
-            
-        elif req_type == 'extension' and contract:
-            # Notify ADMIN about extension request
-            admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
-            if admin_phone:
-                extend_months = details.get('extension_months', '?')
-                context = build_sms_context(contract, 'EXTEND_APPLIED', extend_months=extend_months)
-                sms_service.send_sms(contract.id, 'EXTEND_APPLIED', context, to_number=admin_phone)
+    if req_type == 'termination' and contract:
+        # Use the requested termination date for the message if available
+        m_date = details.get('termination_date')
+        SmsOutboxService.enqueue(contract, 'MOVEOUT_APPLIED', moveout_date=m_date)
+        
+    elif req_type == 'extension' and contract:
+        # Notify ADMIN about extension request
+        admin_phone = contract.room.branch.owner_contact if contract.room and contract.room.branch else None
+        if admin_phone:
+            extend_months = details.get('extension_months', '?')
+            SmsOutboxService.enqueue(contract, 'EXTEND_APPLIED', to_number=admin_phone, extend_months=extend_months)
 
-    except Exception as e:
-        print(f"SMS trigger error in request creation: {e}")
+    db.session.commit()
 
     return jsonify({'id': new_request.id, 'status': new_request.status}), 201
 
@@ -111,13 +107,4 @@ def create_request(current_user):
 @token_required
 def get_my_requests(current_user):
     requests = current_user.requests.order_by(Request.created_at.desc()).all()
-    result = []
-    for r in requests:
-        result.append({
-            'id': r.id,
-            'type': r.type,
-            'status': r.status,
-            'created_at': r.created_at.isoformat(),
-            'details': json.loads(r.details) if r.details else {}
-        })
-    return jsonify(result)
+    return jsonify(RequestSerializer('my').many(requests))
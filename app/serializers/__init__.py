@@ -0,0 +1,6 @@
+from .base import Serializer, Field, Nested, BelongsTo, HasMany
+from .branch import BranchSerializer, RoomSerializer
+from .contract import ContractSerializer
+from .request import RequestSerializer
+from .user import UserSerializer
+from .sms import SmsLogSerializer
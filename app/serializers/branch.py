@@ -0,0 +1,140 @@
+from app.models.branch import BranchAlias, BranchFloor, BranchImage, Room, RoomImage
+from app.services.availability_service import AvailabilityService
+from app.services.floor_layout_service import FloorLayoutService
+from app.serializers.base import Serializer, Field, Nested, HasMany
+
+BRANCH_OWNER_FIELDS = (
+    'is_corporate', 'registration_number', 'owner_name', 'owner_address',
+    'owner_birth_date', 'owner_contact', 'owner_seal_image'
+)
+
+def _images(relation):
+    return Field(lambda obj, ctx: [{'id': img.id, 'url': img.image_url} for img in ctx.all(relation, obj.id)],
+                 requires=(relation,))
+
+def _next_available_date(room, ctx):
+    next_date = ctx.get('next_available_date', room.id)
+    return next_date.isoformat() if next_date else None
+
+def _display_floor(room):
+    return room.floor or '1F'
+
+class RoomSerializer(Serializer):
+    relations = {
+        'images': HasMany(RoomImage, 'room_id'),
+    }
+
+    fields = {
+        'id': 'id',
+        'branch_id': 'branch_id',
+        'name': 'name',
+        'room_type': 'room_type',
+        'price': 'price',
+        'deposit': 'deposit',
+        'area': 'area',
+        'status': 'status',
+        'description': 'description',
+        'floor': 'floor',
+        'display_floor': Field(lambda room, ctx: _display_floor(room)),
+        'position_x': 'position_x',
+        'position_y': 'position_y',
+        'width': 'width',
+        'height': 'height',
+        'next_available_date': Field(_next_available_date, requires=('next_available_date',)),
+        'images': _images('images'),
+    }
+
+    views = {
+        # 공개 지점 상세의 층별 방 목록
+        'public_floor': (
+            'id', 'name', 'room_type', 'price', 'deposit', 'status', 'next_available_date',
+            'description', 'area', ('floor', 'display_floor'),
+            'position_x', 'position_y', 'width', 'height', 'images'
+        ),
+        'public_list': ('id', 'name', 'price', 'status', 'description', 'images'),
+        'public_detail': (
+            'id', 'branch_id', 'name', 'room_type', 'price', 'deposit', 'status',
+            'description', 'next_available_date', 'images'
+        ),
+        # 관리자 지점 목록의 방 요약
+        'admin_summary': ('id', 'name', 'price', 'deposit', 'status', 'floor', 'room_type', 'next_available_date'),
+        # 관리자 지점 상세의 층별 배치도
+        'admin_floor': (
+            'id', 'name', 'room_type', 'price', 'status', 'next_available_date', 'description',
+            ('floor', 'display_floor'), 'position_x', 'position_y', 'width', 'height', 'images'
+        ),
+        'admin_detail': (
+            'id', 'name', 'room_type', 'price', 'deposit', 'area', 'description', 'status',
+            'next_available_date', 'floor', 'images'
+        ),
+        'price_summary': ('id', 'name', 'price', 'deposit'),
+    }
+
+    def prepare(self, rooms, ctx):
+        if 'next_available_date' in ctx.requires:
+            ctx.maps['next_available_date'] = AvailabilityService.resolve_next_available_dates(rooms)
+
+class BranchSerializer(Serializer):
+    relations = {
+        'rooms': HasMany(Room, 'branch_id'),
+        'images': HasMany(BranchImage, 'branch_id'),
+        'floors': HasMany(BranchFloor, 'branch_id'),
+        'aliases': HasMany(BranchAlias, 'branch_id'),
+    }
+
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'description': 'description',
+        'address': 'address',
+        'facilities': 'facilities',
+        'image_url': 'image_url',
+        'map_info': 'map_info',
+        'operating_hours': 'operating_hours',
+        'contact': 'contact',
+        'traffic_info': 'traffic_info',
+        'parking_info': 'parking_info',
+        **{name: name for name in BRANCH_OWNER_FIELDS},
+        'images': _images('images'),
+        'rooms_summary': Nested('rooms', RoomSerializer, 'admin_summary'),
+        'rooms_detail': Nested('rooms', RoomSerializer, 'admin_detail'),
+        'public_rooms_by_floor': Nested('rooms', RoomSerializer, 'public_floor', group_by=_display_floor),
+        'admin_rooms_by_floor': Nested('rooms', RoomSerializer, 'admin_floor', group_by=_display_floor),
+        'floor_plans': Field(
+            lambda b, ctx: {fp.floor: fp.floor_plan_image for fp in ctx.all('floors', b.id)},
+            requires=('floors',)
+        ),
+        'floors': Field(lambda b, ctx: [fp.floor for fp in ctx.all('floors', b.id)], requires=('floors',)),
+        'layout_versions': Field(lambda b, ctx: ctx.get('layout_versions', b.id, {}), requires=('floors', 'layout_versions')),
+        'aliases': Field(
+            lambda b, ctx: [{'id': a.id, 'alias': a.alias, 'is_primary': a.is_primary} for a in ctx.all('aliases', b.id)],
+            requires=('aliases',)
+        ),
+    }
+
+    views = {
+        'public_list': ('id', 'name', 'description', 'address', 'facilities', 'image_url'),
+        'public_detail': (
+            'id', 'name', 'description', 'address', 'facilities', 'map_info',
+            ('rooms_by_floor', 'public_rooms_by_floor'), 'floor_plans'
+        ),
+        'admin_list': (
+            'id', 'name', 'address', 'facilities', 'description', 'image_url', 'operating_hours',
+            'contact', 'traffic_info', 'parking_info', 'map_info', *BRANCH_OWNER_FIELDS,
+            'images', ('rooms', 'rooms_summary')
+        ),
+        'admin_detail': (
+            'id', 'name', 'address', 'facilities', 'description', 'operating_hours',
+            'contact', 'traffic_info', 'parking_info', 'map_info', *BRANCH_OWNER_FIELDS,
+            ('rooms', 'rooms_detail'), ('rooms_by_floor', 'admin_rooms_by_floor'),
+            'floor_plans', 'floors', 'layout_versions', 'aliases', 'image_url', 'images'
+        ),
+    }
+
+    def prepare(self, branches, ctx):
+        if 'layout_versions' in ctx.requires:
+            # {지점 ID: {층: 배치도 버전}} (배치도 저장 시 충돌 검사용)
+            ctx.maps['layout_versions'] = {
+                b.id: FloorLayoutService.versions(b.id, [fp.floor for fp in ctx.all('floors', b.id)])
+                for b in branches
+            }
@@ -0,0 +1,241 @@
+import json
+from app.models.branch import Branch, Room
+from app.models.contract import ContractStatusHistory
+from app.models.coupon import Coupon
+from app.models.custom_discount import CustomDiscount
+from app.models.sms import get_kst_now
+from app.models.user import User
+from app.services.billing_ledger_service import BillingLedgerService, month_key
+from app.serializers.base import Serializer, Field, BelongsTo, HasMany, date_field
+
+def user_info(contract, user):
+    """Contract.get_user_info 와 같은 형태 (user는 미리 적재된 User 또는 None)"""
+    if contract.user_id:
+        return {
+            'id': contract.user_id,
+            'name': user.name if user else None,
+            'email': user.email if user else None,
+            'phone': user.phone if user else None,
+            'is_mapped': True
+        }
+    return {
+        'id': None,
+        'name': contract.temp_user_name,
+        'email': contract.temp_user_email,
+        'phone': contract.temp_user_phone,
+        'is_mapped': False
+    }
+
+def _user(c, ctx):
+    return ctx.get('user', c.user_id)
+
+def _room(c, ctx):
+    return ctx.get('room', c.room_id)
+
+def _branch(c, ctx):
+    room = _room(c, ctx)
+    return ctx.get('branch', room.branch_id) if room else None
+
+def _info(key, default=None):
+    def getter(c, ctx):
+        value = user_info(c, _user(c, ctx))[key]
+        return None if value == '' else value  # 빈 문자열도 기본값으로 출력
+    return Field(getter, requires=('user',), default=default)
+
+def _room_attr(attr, default=None):
+    """방 속성 (방이 없으면 default, 방 이름처럼 NOT NULL 속성은 with_default 로 view마다 기본값 지정)"""
+    def getter(c, ctx):
+        room = _room(c, ctx)
+        return getattr(room, attr) if room else default
+    return Field(getter, requires=('room',))
+
+def _branch_name(default=None):
+    def getter(c, ctx):
+        branch = _branch(c, ctx)
+        return branch.name if branch else None
+    return Field(getter, requires=('branch',), default=default)
+
+def _or_room(attr):
+    """계약 금액이 없으면 방 기본 금액 사용"""
+    def getter(c, ctx):
+        value = getattr(c, attr)
+        if value is not None:
+            return value
+        room = _room(c, ctx)
+        return getattr(room, attr) if room else 0
+    return Field(getter, requires=('room',))
+
+def _my_room(c, ctx):
+    room = _room(c, ctx)
+    if not room:
+        return None
+    branch = _branch(c, ctx)
+    return {
+        'id': room.id,
+        'name': room.name,
+        'room_type': room.room_type,
+        'price': room.price,
+        'deposit': room.deposit,
+        'branch': {
+            'name': branch.name if branch else '알 수 없음'
+        }
+    }
+
+def _history(c, ctx):
+    return [{
+        'old_status': h.old_status,
+        'new_status': h.new_status,
+        'actor_type': h.actor_type,
+        'reason': h.reason,
+        'created_at': h.changed_at.strftime('%Y-%m-%d %H:%M') if h.changed_at else ''
+    } for h in ctx.all('history', c.id)]
+
+def _custom_discounts(c, ctx):
+    return [{
+        'id': cd.id,
+        'target_month': cd.target_month,
+        'amount': cd.amount,
+        'reason': cd.reason
+    } for cd in ctx.all('custom_discounts', c.id)]
+
+def _bill(name):
+    """청구 원장 항목 (prepare에서 적재, 행이 없으면 None)"""
+    def getter(c, ctx):
+        entry = ctx.get(name, c.id)
+        if entry is None:
+            return None
+        return dict(entry, due_date=entry['due_date'].strftime('%Y-%m-%d'))
+    return Field(getter, requires=(name,))
+
+def _amount_due(c, ctx):
+    # 이번 달 원장 행이 없으면 월세(방 기본가 대체) 그대로
+    entry = ctx.get('current_bill', c.id)
+    if entry is not None:
+        return entry['final_amount']
+    if c.price is not None:
+        return c.price
+    room = _room(c, ctx)
+    return room.price if room else 0
+
+class ContractSerializer(Serializer):
+    relations = {
+        'user': BelongsTo(User, 'user_id'),
+        'room': BelongsTo(Room, 'room_id'),
+        'branch': BelongsTo(Branch, 'branch_id', through='room'),
+        'coupon': BelongsTo(Coupon, 'coupon_id'),
+        'history': HasMany(ContractStatusHistory, 'contract_id', order_by=(ContractStatusHistory.changed_at.desc(),)),
+        'custom_discounts': HasMany(CustomDiscount, 'contract_id'),
+    }
+
+    fields = {
+        'id': 'id',
+        'user_ref_id': _info('id'),
+        'user_name': _info('name', '알 수 없음'),
+        'user_name_or_temp': Field(
+            lambda c, ctx: user_info(c, _user(c, ctx))['name'] or c.temp_user_name or '알 수 없음',
+            requires=('user',)
+        ),
+        'user_email': _info('email', ''),
+        'user_phone': _info('phone', ''),
+        'is_mapped': _info('is_mapped'),
+        'temp_user_name': 'temp_user_name',
+        'temp_user_phone': 'temp_user_phone',
+        'temp_user_email': 'temp_user_email',
+        'room_id': 'room_id',
+        'room': Field(_my_room, requires=('branch',)),
+        'room_name': _room_attr('name').with_default('알 수 없음'),
+        'room_type': _room_attr('room_type', 'monthly'),
+        'room_deposit': _room_attr('deposit', 0),
+        'room_price': _room_attr('price', 0),
+        'branch_id': _room_attr('branch_id'),
+        'branch_name': _branch_name('알 수 없음'),
+        'price': 'price',
+        'deposit': 'deposit',
+        'price_or_room': _or_room('price'),
+        'deposit_or_room': _or_room('deposit'),
+        'start_date': date_field('start_date'),
+        'end_date': date_field('end_date'),
+        'start_date_iso': Field(lambda c, ctx: c.start_date.isoformat()),
+        'end_date_iso': Field(lambda c, ctx: c.end_date.isoformat()),
+        'start_time': 'start_time',
+        'end_time': 'end_time',
+        'payment_day': 'payment_day',
+        'payment_method': 'payment_method',
+        'status': 'status',
+        'discount_details': Field(lambda c, ctx: json.loads(c.discount_details) if c.discount_details else None),
+        'coupon_name': Field(
+            lambda c, ctx: ctx.get('coupon', c.coupon_id).code if ctx.get('coupon', c.coupon_id) else None,
+            requires=('coupon',)
+        ),
+        'is_indefinite': 'is_indefinite',
+        'auto_extend_status': 'auto_extend_status',
+        'termination_effective_date': date_field('termination_effective_date'),
+        'created_at': date_field('created_at', '%Y-%m-%d %H:%M', default=''),
+        'signed_at': date_field('signed_at', '%Y-%m-%d %H:%M'),
+        'has_signature': Field(lambda c, ctx: bool(c.signature_data)),
+        'registration_number': Field(
+            lambda c, ctx: c.user_registration_number_snapshot or (_user(c, ctx).registration_number if _user(c, ctx) else ''),
+            requires=('user',)
+        ),
+        'tax_invoice_requested': 'tax_invoice_requested',
+        'history': Field(_history, requires=('history',)),
+        'custom_discounts': Field(_custom_discounts, requires=('custom_discounts',)),
+        'next_payment': _bill('next_bill'),
+        'amount_due': Field(_amount_due, requires=('current_bill', 'room')),
+        'discount_amount': Field(
+            lambda c, ctx: (ctx.get('current_bill', c.id) or {}).get('discount_amount', 0),
+            requires=('current_bill',)
+        ),
+        'due_date': Field(
+            lambda c, ctx: ctx.get('current_bill', c.id)['due_date'].strftime('%Y-%m-%d') if ctx.get('current_bill', c.id) else None,
+            requires=('current_bill',)
+        ),
+    }
+
+    ADMIN_FIELDS = (
+        'id', 'user_name', 'user_email', ('user_id', 'user_ref_id'), 'user_phone', 'is_mapped',
+        'room_id', 'room_name', 'room_type', 'branch_id', 'branch_name',
+        ('deposit', 'deposit_or_room'), ('price', 'price_or_room'),
+        'start_date', 'end_date', 'start_time', 'end_time', 'payment_day', 'payment_method',
+        'status', 'discount_details', 'coupon_name', 'is_indefinite', 'auto_extend_status',
+        'termination_effective_date', 'created_at', 'signed_at', 'has_signature'
+    )
+
+    views = {
+        'admin': ADMIN_FIELDS,
+        'admin_detail': ADMIN_FIELDS + ('registration_number', 'tax_invoice_requested', 'history'),
+        # 이번 달 청구액 (price: 특별 할인 반영 금액, base_price: 월세)
+        'payment': (
+            'id', ('user_name', 'user_name_or_temp'), 'room_name', 'branch_name',
+            ('price', 'amount_due'), ('base_price', 'price_or_room'), 'discount_amount', 'due_date',
+            'payment_day', 'user_phone'
+        ),
+        'unmapped': (
+            'id', 'temp_user_name', 'temp_user_phone', 'temp_user_email', 'room_name', 'branch_name',
+            ('deposit', 'room_deposit'), ('price', 'room_price'), 'start_date', 'end_date', 'status', 'created_at'
+        ),
+        'search': (
+            'id', ('user_name', 'user_name', None), ('user_phone', 'user_phone', None),
+            ('room_name', 'room_name', 'N/A'), ('branch_name', 'branch_name', 'N/A'), 'status', 'start_date', 'end_date'
+        ),
+        'expiring': ('id', 'user_name', 'room_name', 'branch_name', 'end_date'),
+        'calendar': (
+            'id', ('user_name', 'user_name', None), ('room_name', 'room_name', None),
+            ('branch_name', 'branch_name', None), 'price', 'payment_day'
+        ),
+        # 사용자 본인 계약 목록
+        'my': (
+            'id', 'room', ('start_date', 'start_date_iso'), ('end_date', 'end_date_iso'), 'is_indefinite',
+            'price', 'deposit', 'status', 'payment_day', 'payment_method', 'discount_details',
+            'coupon_name', 'termination_effective_date', 'custom_discounts', 'next_payment'
+        ),
+    }
+
+    def prepare(self, contracts, ctx):
+        # 청구 원장 (계약 목록 전체에 대해 IN 조회 한 번)
+        ids = [c.id for c in contracts]
+        today = get_kst_now().date()
+        if 'current_bill' in ctx.requires:
+            ctx.maps['current_bill'] = BillingLedgerService.month_entries(ids, month_key(today))
+        if 'next_bill' in ctx.requires:
+            ctx.maps['next_bill'] = BillingLedgerService.next_entries(ids, today)
@@ -0,0 +1,44 @@
+import json
+from app.models.branch import Room
+from app.models.user import User
+from app.serializers.base import Serializer, Field, BelongsTo, date_field
+
+def parse_details(r):
+    """details JSON 파싱 (형식 오류 시 원문을 'raw'로 보존)"""
+    if not r.details:
+        return {}
+    try:
+        return json.loads(r.details)
+    except ValueError:
+        return {'raw': r.details}
+
+def _room_name(r, ctx):
+    room = ctx.get('room', r.room_id)
+    return room.name if room else (parse_details(r).get('room_name') or 'N/A')
+
+class RequestSerializer(Serializer):
+    relations = {
+        'user': BelongsTo(User, 'user_id'),
+        'room': BelongsTo(Room, 'room_id'),
+    }
+
+    fields = {
+        'id': 'id',
+        'type': 'type',
+        'status': 'status',
+        'details': Field(lambda r, ctx: parse_details(r)),
+        'user_name': Field(
+            lambda r, ctx: ctx.get('user', r.user_id).name if ctx.get('user', r.user_id) else '알 수 없음',
+            requires=('user',)
+        ),
+        'room_name': Field(_room_name, requires=('room',)),
+        'room_id': 'room_id',
+        'branch_id': 'branch_id',
+        'created_at': date_field('created_at', '%Y-%m-%d %H:%M'),
+        'created_at_iso': Field(lambda r, ctx: r.created_at.isoformat()),
+    }
+
+    views = {
+        'admin': ('id', 'user_name', 'type', 'status', 'details', 'created_at', 'room_name', 'branch_id'),
+        'my': ('id', 'type', 'status', ('created_at', 'created_at_iso'), 'details'),
+    }
@@ -0,0 +1,45 @@
+from app.extensions import db
+from app.models.contract import Contract
+from app.models.user import User
+from app.serializers.base import Serializer, Field, date_field
+
+def _user_name(log, ctx):
+    if log.contract_id is None:
+        return 'N/A'
+    return ctx.get('user_names', log.contract_id, 'N/A')
+
+class SmsLogSerializer(Serializer):
+    fields = {
+        'id': 'id',
+        'contract_id': 'contract_id',
+        'user_name': Field(_user_name, requires=('user_names',)),
+        'type': 'type',
+        'content': 'content_snapshot',
+        'status': 'status',
+        'dedup_key': 'dedup_key',
+        'related_date': date_field('related_date'),
+        'sent_at': date_field('sent_at', '%m-%d %H:%M'),
+        'error_message': 'error_message',
+    }
+
+    views = {
+        'admin': (
+            'id', 'contract_id', 'user_name', 'type', 'content', 'status',
+            'dedup_key', 'related_date', 'sent_at', 'error_message'
+        ),
+    }
+
+    def prepare(self, logs, ctx):
+        if 'user_names' in ctx.requires:
+            # {계약 ID: 회원 이름 또는 임시 이름} (계약 x 회원 조인 한 번, Contract.get_user_info 와 같은 규칙)
+            contract_ids = {log.contract_id for log in logs} - {None}
+            names = {}
+            if contract_ids:
+                rows = db.session.query(
+                    Contract.id, Contract.user_id, Contract.temp_user_name, User.name
+                ).outerjoin(
+                    User, Contract.user_id == User.id
+                ).filter(Contract.id.in_(contract_ids)).all()
+                for contract_id, user_id, temp_user_name, user_name in rows:
+                    names[contract_id] = user_name if user_id else temp_user_name
+            ctx.maps['user_names'] = names
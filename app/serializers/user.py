@@ -0,0 +1,51 @@
+from sqlalchemy import func
+from app.extensions import db
+from app.models.branch import Room
+from app.models.contract import Contract
+from app.serializers.base import Serializer, Field, date_field
+
+class UserSerializer(Serializer):
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'email': 'email',
+        'phone': 'phone',
+        'kakao_id': 'kakao_id',
+        'role': 'role',
+        'onboarding_status': 'onboarding_status',
+        'created_at': date_field('created_at', '%Y-%m-%d %H:%M', default=''),
+        'contract_count': Field(
+            lambda u, ctx: sum(ctx.get('active_branch_counts', u.id, {}).values()), requires=('active_branch_counts',)
+        ),
+        'branch_ids': Field(
+            lambda u, ctx: list(ctx.get('active_branch_counts', u.id, {})), requires=('active_branch_counts',)
+        ),
+    }
+
+    views = {
+        'admin': (
+            'id', 'name', 'email', 'phone', 'kakao_id', 'role', 'onboarding_status',
+            'created_at', 'contract_count', 'branch_ids'
+        ),
+        'match': ('id', 'name', 'email', 'phone', 'created_at'),
+    }
+
+    def prepare(self, users, ctx):
+        if 'active_branch_counts' in ctx.requires:
+            # 사용자별 {지점 ID: 활성 계약 수} (사용자 x 지점 GROUP BY 한 번)
+            counts = {}
+            user_ids = [u.id for u in users]
+            if user_ids:
+                rows = db.session.query(
+                    Contract.user_id, Room.branch_id, func.count(Contract.id)
+                ).join(
+                    Room, Contract.room_id == Room.id
+                ).filter(
+                    Contract.user_id.in_(user_ids),
+                    Contract.status == 'active'
+                ).group_by(
+                    Contract.user_id, Room.branch_id
+                ).order_by(Room.branch_id).all()
+                for user_id, branch_id, count in rows:
+                    counts.setdefault(user_id, {})[branch_id] = count
+            ctx.maps['active_branch_counts'] = counts
@@ -0,0 +1,157 @@
+"""
+입실 가능일 서비스: 여러 방의 다음 입실 가능일과 시간제 방의 예약 슬롯을 일괄 계산
+"""
+from datetime import date, timedelta
+from sqlalchemy import func
+from app.extensions import db
+from app.models.contract import Contract
+
+# 방을 점유 중인 것으로 보는 계약 상태 (Room.get_next_available_date 기준)
+OCCUPYING_STATUSES = ['active', 'waiting_signature', 'approved', 'requested']
+
+# 시간제 방의 해당 시간대를 막는 예약 상태
+RESERVATION_BLOCKING_STATUSES = ['requested', 'approved', 'active', 'extend_requested']
+
+MINUTES_PER_DAY = 24 * 60
+
+def _parse_minutes(time_str):
+    """'HH:MM' 문자열을 자정 기준 분으로 변환 (형식 오류 시 None)"""
+    try:
+        hour, minute = time_str.split(':')[:2]
+        return min(MINUTES_PER_DAY, max(0, int(hour) * 60 + int(minute)))
+    except (AttributeError, ValueError):
+        return None
+
+class AvailabilityService:
+    @staticmethod
+    def get_latest_occupying_contracts(room_ids):
+        """
+        방별로 종료일이 가장 늦은 점유 계약을 한 번의 쿼리로 조회
+
+        Args:
+            room_ids: 방 ID 목록
+
+        Returns:
+            {room_id: Contract} 딕셔너리
+        """
+        room_ids = list(set(room_ids))
+        if not room_ids:
+            return {}
+
+        latest = db.session.query(
+            Contract.room_id.label('room_id'),
+            func.max(Contract.end_date).label('max_end_date')
+        ).filter(
+            Contract.room_id.in_(room_ids),
+            Contract.status.in_(OCCUPYING_STATUSES)
+        ).group_by(Contract.room_id).subquery()
+
+        contracts = Contract.query.join(
+            latest,
+            (Contract.room_id == latest.c.room_id) & (Contract.end_date == latest.c.max_end_date)
+        ).filter(
+            Contract.status.in_(OCCUPYING_STATUSES)
+        ).order_by(Contract.id.desc()).all()
+
+        result = {}
+        for c in contracts:
+            # 종료일이 같은 계약이 여러 건이면 가장 최근 계약 사용
+            result.setdefault(c.room_id, c)
+        return result
+
+    @staticmethod
+    def next_available_from_contract(contract, today=None):
+        """점유 계약 기준 다음 입실 가능일 계산 (없으면 None)"""
+        if not contract:
+            return None
+
+        # 1. termination_effective_date has absolute priority (explicit signal)
+        if contract.termination_effective_date:
+            return contract.termination_effective_date + timedelta(days=1)
+
+        # 2. automatic expiration for fixed-term contracts (is_indefinite=False)
+        # Matches admin UI "Expiring Soon" logic (within 30 days)
+        if not contract.is_indefinite and contract.end_date:
+            today = today or date.today()
+            diff = contract.end_date - today
+            if 0 <= diff.days <= 30:
+                return contract.end_date + timedelta(days=1)
+
+        return None
+
+    @staticmethod
+    def resolve_next_available_dates(rooms, today=None):
+        """
+        여러 방의 다음 입실 가능일을 일괄 계산
+
+        Args:
+            rooms: Room 객체 목록
+            today: 기준일 (기본값: 오늘)
+
+        Returns:
+            {room_id: date 또는 None} 딕셔너리
+        """
+        today = today or date.today()
+        result = {}
+        occupied_ids = []
+
+        for room in rooms:
+            if room.room_type == 'manager':
+                result[room.id] = None
+            elif room.status == 'available':
+                result[room.id] = today
+            elif room.status == 'occupied':
+                occupied_ids.append(room.id)
+            else:
+                result[room.id] = None
+
+        if occupied_ids:
+            contracts = AvailabilityService.get_latest_occupying_contracts(occupied_ids)
+            for room_id in occupied_ids:
+                result[room_id] = AvailabilityService.next_available_from_contract(contracts.get(room_id), today)
+
+        return result
+
+    @staticmethod
+    def build_slot_grid(room_ids, start_date, end_date, slot_minutes=30):
+        """
+        시간제 방들의 기간 내 일자별 예약 슬롯 비트맵 생성 (계약 조회 1회)
+
+        Args:
+            room_ids: 방 ID 목록
+            start_date, end_date: 조회 기간 (양 끝 포함)
+            slot_minutes: 슬롯 크기 (분, 하루를 나누어 떨어지게 해야 함)
+
+        Returns:
+            {room_id: {'YYYY-MM-DD': '0011...'}} 딕셔너리
+            (슬롯마다 한 글자, '1'은 예약됨)
+        """
+        slots_per_day = MINUTES_PER_DAY // slot_minutes
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        grid = {room_id: {d: [0] * slots_per_day for d in days} for room_id in room_ids}
+
+        if room_ids and days:
+            reservations = db.session.query(
+                Contract.room_id, Contract.start_date, Contract.start_time, Contract.end_time
+            ).filter(
+                Contract.room_id.in_(list(room_ids)),
+                Contract.start_date >= start_date,
+                Contract.start_date <= end_date,
+                Contract.status.in_(RESERVATION_BLOCKING_STATUSES)
+            ).all()
+
+            for room_id, day, start_time, end_time in reservations:
+                start_min = _parse_minutes(start_time)
+                end_min = _parse_minutes(end_time)
+                if start_min is None or end_min is None or end_min <= start_min:
+                    continue
+                bits = grid[room_id][day]
+                first = start_min // slot_minutes
+                last = (end_min - 1) // slot_minutes
+                for i in range(first, min(last, slots_per_day - 1) + 1):
+                    bits[i] = 1
+
+        return {
+            room_id: {d.isoformat(): ''.join(map(str, bits)) for d, bits in days_bits.items()}
+            for room_id, days_bits in grid.items()
+        }
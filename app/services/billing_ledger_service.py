@@ -0,0 +1,279 @@
+"""
+월 청구 원장 서비스
+
+계약마다 청구 기간(지난 PAST_MONTHS 개월 ~ 앞으로 FUTURE_MONTHS 개월)의 월별 청구액
+(월세, 특별 할인, 최종 금액, 결제일)을 billing_ledger 에 미리 계산해 둡니다.
+SMS 결제 안내, 관리자 월별 결제자 목록, 세입자 계약 화면은 이 행을 그대로 읽습니다.
+
+계약/방 금액/특별 할인 변경은 flush 직전에 대상 계약을 모아 두었다가 커밋 직전 훅
+(app.utils.commit_hooks)에서 해당 계약의 기간 내 행만 다시 만듭니다. 기간 밖의 지난 달 행은 청구 이력으로 남습니다.
+매일 밤 전체 재생성으로 기간을 한 달씩 밀어 줍니다. 전체 재생성: `flask billing-ledger rebuild`
+"""
+import calendar
+import logging
+from datetime import date, datetime
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, inspect
+from app.extensions import db
+from app.models.billing_ledger import BillingLedger
+from app.models.branch import Room
+from app.models.contract import Contract
+from app.models.custom_discount import CustomDiscount
+from app.models.sms import get_kst_now
+from app.services.payment_schedule_service import month_table, expand_payment_dates
+from app.utils.commit_hooks import register_before_commit_hook
+
+logger = logging.getLogger(__name__)
+
+PAST_MONTHS = 2
+FUTURE_MONTHS = 12
+REFRESH_CHUNK_SIZE = 500
+
+# 청구 대상 계약 상태 (시간제 방 제외)
+LEDGER_STATUSES = ('waiting_signature', 'approved', 'active', 'extend_requested', 'terminate_requested')
+
+# 청구액에 영향을 주는 필드
+CONTRACT_FIELDS = ('status', 'room_id', 'price', 'payment_day', 'start_date', 'end_date')
+ROOM_FIELDS = ('price', 'room_type')
+DISCOUNT_FIELDS = ('contract_id', 'target_month', 'amount', 'reason')
+
+
+def month_key(d):
+    return d.strftime('%Y-%m')
+
+def due_date_for(payment_day, year, month):
+    """해당 월 결제일 (결제일이 말일보다 크면 말일)"""
+    return date(year, month, min(payment_day, calendar.monthrange(year, month)[1]))
+
+def compute_entry(base_amount, discount_amount, discount_reason, due_date):
+    """원장 행 값 계산 (행이 없을 때 조회 결과와 같은 형태로 사용)"""
+    base_amount = int(base_amount or 0)
+    discount_amount = int(discount_amount or 0)
+    return {
+        'month': month_key(due_date),
+        'due_date': due_date,
+        'base_amount': base_amount,
+        'discount_amount': discount_amount,
+        'discount_reason': discount_reason,
+        'final_amount': max(0, base_amount - discount_amount),
+    }
+
+def _entry(row):
+    return {
+        'month': row.month,
+        'due_date': row.due_date,
+        'base_amount': row.base_amount,
+        'discount_amount': row.discount_amount,
+        'discount_reason': row.discount_reason,
+        'final_amount': row.final_amount,
+    }
+
+def _horizon(today):
+    """청구 기간 (월 번호 시작, 끝)"""
+    index = today.year * 12 + today.month - 1
+    return index - PAST_MONTHS, index + FUTURE_MONTHS
+
+def _base_amount(price, room_price):
+    # 계약 금액이 없으면 방 기본가 (관리자 목록/대시보드 매출과 같은 규칙)
+    return price if price is not None else (room_price or 0)
+
+
+class BillingLedgerService:
+    @staticmethod
+    def refresh_contracts(contract_ids, today=None):
+        """계약들의 기간 내 원장 행을 지우고 다시 생성 (커밋은 호출자가 수행)"""
+        table = BillingLedger.__table__
+        table_rows = month_table(*_horizon(today or get_kst_now().date()))
+        first_key = f'{table_rows[0][1]:04d}-{table_rows[0][2]:02d}'
+        first = date(table_rows[0][1], table_rows[0][2], 1)
+        last = date(table_rows[-1][1], table_rows[-1][2], table_rows[-1][3])
+        now = datetime.utcnow()
+
+        contract_ids = sorted(set(contract_ids) - {None})
+        for offset in range(0, len(contract_ids), REFRESH_CHUNK_SIZE):
+            chunk = contract_ids[offset:offset + REFRESH_CHUNK_SIZE]
+            db.session.execute(table.delete().where(table.c.contract_id.in_(chunk), table.c.month >= first_key))
+
+            contracts = db.session.query(
+                Contract.id, Contract.price, Contract.payment_day, Contract.start_date, Contract.end_date,
+                Room.price.label('room_price')
+            ).join(
+                Room, Contract.room_id == Room.id
+            ).filter(
+                Contract.id.in_(chunk),
+                Contract.status.in_(LEDGER_STATUSES),
+                Room.room_type != 'time_based',
+                Contract.payment_day.isnot(None),
+                Contract.start_date <= last,
+                Contract.end_date >= first
+            ).all()
+            if not contracts:
+                continue
+
+            discounts = {
+                (d.contract_id, d.target_month): d
+                for d in db.session.query(
+                    CustomDiscount.contract_id, CustomDiscount.target_month, CustomDiscount.amount, CustomDiscount.reason
+                ).filter(
+                    CustomDiscount.contract_id.in_([c.id for c in contracts]),
+                    CustomDiscount.target_month >= first_key
+                ).all()
+            }
+            by_id = {c.id: c for c in contracts}
+            schedules = [(c.id, c.payment_day, c.start_date, c.end_date) for c in contracts if c.payment_day]
+
+            rows = []
+            for contract_id, due_date in expand_payment_dates(schedules, table_rows):
+                contract = by_id[contract_id]
+                discount = discounts.get((contract_id, month_key(due_date)))
+                entry = compute_entry(
+                    _base_amount(contract.price, contract.room_price),
+                    discount.amount if discount else 0,
+                    discount.reason if discount else None,
+                    due_date
+                )
+                rows.append(dict(entry, contract_id=contract_id, updated_at=now))
+            if rows:
+                db.session.execute(table.insert(), rows)
+
+    @staticmethod
+    def rebuild_all(today=None):
+        """기간 내 원장 전체 재생성 (커밋 포함, 기간 이전 행은 이력으로 유지)"""
+        contract_ids = [cid for (cid,) in db.session.query(Contract.id).order_by(Contract.id).all()]
+        BillingLedgerService.refresh_contracts(contract_ids, today=today)
+        db.session.commit()
+        logger.info(f"Rebuilt billing ledger for {len(contract_ids)} contracts")
+        return len(contract_ids)
+
+    @staticmethod
+    def entry(contract, due_date, prefetched=None):
+        """
+        계약의 due_date 가 속한 월 청구액
+
+        원장 행이 없으면 (기간 밖, 청구 대상이 아닌 상태 등) 같은 규칙으로 직접 계산합니다.
+        Args:
+            prefetched: 같은 월의 month_entries() 결과 (일괄 발송 시 계약마다 조회하지 않도록)
+        """
+        month = month_key(due_date)
+        if prefetched is not None:
+            found = prefetched.get(contract.id)
+            if found and found['month'] == month:
+                return found
+        else:
+            row = BillingLedger.query.filter_by(contract_id=contract.id, month=month).first()
+            if row:
+                return _entry(row)
+
+        discount = CustomDiscount.query.filter_by(contract_id=contract.id, target_month=month).first()
+        room_price = contract.room.price if contract.room else 0
+        return compute_entry(
+            _base_amount(contract.price, room_price),
+            discount.amount if discount else 0,
+            discount.reason if discount else None,
+            due_date
+        )
+
+    @staticmethod
+    def month_entries(contract_ids, month):
+        """{contract_id: 해당 월 청구액} (원장 행이 있는 계약만)"""
+        if not contract_ids:
+            return {}
+        rows = BillingLedger.query.filter(
+            BillingLedger.contract_id.in_(contract_ids),
+            BillingLedger.month == month
+        ).all()
+        return {row.contract_id: _entry(row) for row in rows}
+
+    @staticmethod
+    def next_entries(contract_ids, today=None):
+        """{contract_id: today 이후 가장 가까운 청구액} (원장 행이 있는 계약만)"""
+        if not contract_ids:
+            return {}
+        today = today or get_kst_now().date()
+        index = today.year * 12 + today.month - 1
+        # 다음 결제일은 이번 달 아니면 다음 달에 있음
+        months = [f'{i // 12:04d}-{i % 12 + 1:02d}' for i in (index, index + 1)]
+        rows = BillingLedger.query.filter(
+            BillingLedger.contract_id.in_(contract_ids),
+            BillingLedger.month.in_(months),
+            BillingLedger.due_date >= today
+        ).order_by(BillingLedger.due_date.desc()).all()
+        # 내림차순이므로 계약별로 가장 가까운 결제일 행이 마지막에 남음
+        return {row.contract_id: _entry(row) for row in rows}
+
+
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+def _old_and_new(obj, field):
+    history = inspect(obj).attrs[field].history
+    return (set(history.deleted or ()) | set(history.added or ()) | set(history.unchanged or ())) - {None}
+
+def _before_flush(session, flush_context, instances):
+    changes = session.info.setdefault('billing_ledger_changes', {
+        'contract_ids': set(), 'new': [], 'room_ids': set()
+    })
+
+    for obj in session.new:
+        if isinstance(obj, (Contract, CustomDiscount)):
+            # id/FK는 flush 후에 확정되므로 커밋 직전에 확인
+            changes['new'].append(obj)
+
+    for obj in session.deleted:
+        if isinstance(obj, Contract):
+            changes['contract_ids'].add(obj.id)
+        elif isinstance(obj, CustomDiscount):
+            changes['contract_ids'].add(obj.contract_id)
+
+    for obj in session.dirty:
+        if isinstance(obj, Contract) and _changed(obj, CONTRACT_FIELDS):
+            changes['contract_ids'].add(obj.id)
+        elif isinstance(obj, Room) and _changed(obj, ROOM_FIELDS):
+            changes['room_ids'].add(obj.id)
+        elif isinstance(obj, CustomDiscount) and _changed(obj, DISCOUNT_FIELDS):
+            changes['contract_ids'].update(_old_and_new(obj, 'contract_id'))
+
+def _prepare_refresh(session):
+    """커밋 직전 훅: 모아 둔 변경으로 원장을 다시 만들 함수 (변경이 없으면 None)"""
+    changes = session.info.pop('billing_ledger_changes', None)
+    if not changes:
+        return None
+
+    contract_ids = set(changes['contract_ids'])
+    for obj in changes['new']:
+        contract_ids.add(obj.id if isinstance(obj, Contract) else obj.contract_id)
+    contract_ids.discard(None)
+    room_ids = changes['room_ids']
+    if not (contract_ids or room_ids):
+        return None
+
+    def refresh():
+        if room_ids:
+            contract_ids.update(
+                cid for (cid,) in
+                session.query(Contract.id).filter(Contract.room_id.in_(room_ids)).all()
+            )
+        if contract_ids:
+            BillingLedgerService.refresh_contracts(contract_ids)
+    return refresh
+
+def _reset_changes(session, *args):
+    session.info.pop('billing_ledger_changes', None)
+
+def register_billing_ledger_listeners():
+    """계약/방 금액/특별 할인 변경 시 청구 원장을 갱신하는 세션 이벤트 등록"""
+    if not event.contains(db.session, 'before_flush', _before_flush):
+        event.listen(db.session, 'before_flush', _before_flush)
+        event.listen(db.session, 'after_rollback', _reset_changes)
+    register_before_commit_hook('Billing ledger', _prepare_refresh)
+
+
+billing_ledger_cli = AppGroup('billing-ledger', help='Monthly billing ledger commands.')
+
+@billing_ledger_cli.command('rebuild')
+def rebuild_command():
+    """Rebuild the billing ledger for the current horizon."""
+    count = BillingLedgerService.rebuild_all()
+    click.echo(f'Refreshed billing ledger for {count} contracts.')
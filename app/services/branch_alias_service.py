@@ -0,0 +1,155 @@
+"""
+지점 별칭 서비스: slug/별칭 -> 지점 ID 변환
+
+별칭 맵은 워커 시작 시 메모리에 적재되고, 맵에 없는 별칭은 branch_aliases.alias
+유니크 인덱스에 대한 등호 조회 한 번으로 찾고, 그래도 없으면 기존 영문 slug 매핑(LEGACY_MAPPING)의
+검색어나 요청 이름이 지점명에 포함되는지로 찾습니다. (별칭이 아직 없는 지점용 - 새 지점은 생성 시
+지점명과 해당하는 영문 slug 가 별칭으로 자동 추가됨) 관리자가 별칭을 수정하면
+'branch_aliases' 캐시 버전이 올라가고, 다른 워커는 ALIAS_MAP_TTL 주기로 버전을 확인해
+맵을 다시 적재합니다.
+"""
+import logging
+import threading
+import time
+from app.extensions import db
+from app.models.branch import Branch, BranchAlias
+from app.utils.cache_version import get_cache_version, bump_cache_version
+
+logger = logging.getLogger(__name__)
+
+ALIAS_CACHE_KEY = 'branch_aliases'
+ALIAS_MAP_TTL = 30  # 버전 확인 주기 (초)
+
+# 기존 rooms-status 영문 slug -> 지점명 검색어 (크롤러가 사용, 별칭이 없는 지점의 보조 매칭)
+LEGACY_MAPPING = {
+    "samsung": ["삼성점", "삼성", "samsung"],
+    "hongdae": ["홍대점", "홍대", "hongdae"],
+    "incheon": ["인천점", "인천", "incheon"],
+    "mokdong": ["목동점", "목동", "mokdong"],
+    "bongcheon": ["봉천점", "봉천", "bongcheon"],
+    "bucheon": ["부천점", "부천", "bucheon"]
+}
+
+def _find_by_name(branches, key):
+    """지점명에 key 가 포함된 첫 지점 ID (LEGACY_MAPPING 의 slug 면 검색어 순서대로)"""
+    for term in LEGACY_MAPPING.get(key, []) + [key]:
+        branch_id = next((bid for bid, bname in branches if term.lower() in (bname or '').lower()), None)
+        if branch_id:
+            return branch_id
+    return None
+
+class BranchAliasService:
+    _lock = threading.Lock()
+    _alias_map = {}        # alias -> branch_id
+    _primary_slugs = {}    # branch_id -> 대표 slug
+    _version = None
+    _checked_at = 0.0
+
+    @classmethod
+    def load(cls):
+        """DB의 전체 별칭을 메모리 맵으로 적재"""
+        version = get_cache_version(ALIAS_CACHE_KEY)
+        rows = db.session.query(BranchAlias.alias, BranchAlias.branch_id, BranchAlias.is_primary).all()
+
+        alias_map = {}
+        primary_slugs = {}
+        for alias, branch_id, is_primary in rows:
+            alias_map[alias] = branch_id
+            if is_primary:
+                primary_slugs[branch_id] = alias
+
+        with cls._lock:
+            cls._alias_map = alias_map
+            cls._primary_slugs = primary_slugs
+            cls._version = version
+            cls._checked_at = time.monotonic()
+        logger.info(f"Loaded {len(alias_map)} branch aliases (version {version})")
+
+    @classmethod
+    def _ensure_fresh(cls):
+        if cls._version is not None and time.monotonic() - cls._checked_at < ALIAS_MAP_TTL:
+            return
+        if cls._version is None or get_cache_version(ALIAS_CACHE_KEY) != cls._version:
+            cls.load()
+        else:
+            cls._checked_at = time.monotonic()
+
+    @classmethod
+    def resolve_branch_ids(cls, names):
+        """
+        여러 별칭을 지점 ID로 변환 (맵에 없는 별칭은 IN 조회 한 번으로 보충하고,
+        별칭에도 없으면 영문 slug 검색어/요청 이름이 지점명에 포함되는 첫 지점으로 변환)
+
+        Returns:
+            {요청 이름: branch_id 또는 None} 딕셔너리
+        """
+        cls._ensure_fresh()
+
+        result = {}
+        misses = set()
+        for name in names:
+            branch_id = cls._alias_map.get(BranchAlias.normalize(name))
+            result[name] = branch_id
+            if branch_id is None:
+                misses.add(BranchAlias.normalize(name))
+
+        if misses:
+            found = dict(
+                db.session.query(BranchAlias.alias, BranchAlias.branch_id)
+                .filter(BranchAlias.alias.in_(misses)).all()
+            )
+            if found:
+                with cls._lock:
+                    cls._alias_map.update(found)
+                for name in names:
+                    if result[name] is None:
+                        result[name] = found.get(BranchAlias.normalize(name))
+
+        unresolved = [name for name in names if result[name] is None and BranchAlias.normalize(name)]
+        if unresolved:
+            branches = db.session.query(Branch.id, Branch.name).order_by(Branch.id).all()
+            for name in unresolved:
+                result[name] = _find_by_name(branches, BranchAlias.normalize(name))
+        return result
+
+    @classmethod
+    def resolve(cls, name):
+        """별칭으로 지점 조회 (없으면 None)"""
+        branch_id = cls.resolve_branch_ids([name])[name]
+        return Branch.query.get(branch_id) if branch_id else None
+
+    @classmethod
+    def get_primary_slug(cls, branch_id):
+        """지점의 대표 slug (없으면 None)"""
+        cls._ensure_fresh()
+        return cls._primary_slugs.get(branch_id)
+
+    @staticmethod
+    def add_default_alias(branch):
+        """
+        새 지점의 기본 별칭 추가 (이미 쓰이는 별칭은 건너뜀, 커밋은 호출자)
+
+        지점명이 LEGACY_MAPPING 검색어에 해당하면 그 영문 slug 를 대표 slug로, 지점명은 별칭으로 추가하고,
+        해당하지 않으면 지점명을 대표 slug로 추가합니다.
+        Returns:
+            추가한 BranchAlias 목록
+        """
+        name = BranchAlias.normalize(branch.name)
+        slug = next((slug for slug, terms in LEGACY_MAPPING.items()
+                     if any(term.lower() in name for term in terms)), None)
+        candidates = [(slug, True), (name, False)] if slug else [(name, True)]
+
+        added = []
+        for alias, is_primary in candidates:
+            if not alias or BranchAlias.query.filter_by(alias=alias).first():
+                continue
+            branch_alias = BranchAlias(branch=branch, alias=alias, is_primary=is_primary)
+            db.session.add(branch_alias)
+            added.append(branch_alias)
+        return added
+
+    @classmethod
+    def invalidate(cls):
+        """별칭 변경 후 호출: 다른 워커에 알리고 (커밋 후) 로컬 맵은 다음 조회 시 재적재"""
+        bump_cache_version(ALIAS_CACHE_KEY)
+        cls._version = None
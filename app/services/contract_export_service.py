@@ -0,0 +1,111 @@
+"""
+계약 현황 내보내기 서비스 (전체지점_계약현황 형식의 CSV/XLSX)
+
+ORM 객체 대신 필요한 컬럼만 Core 행으로 조회하고(yield_per 서버 사이드 커서),
+행을 하나씩 writer 에 넘기므로 건수와 관계없이 메모리 사용량이 일정합니다.
+"""
+import csv
+import io
+import tempfile
+from app.models.branch import Branch, Room
+from app.models.contract import Contract
+from app.models.user import User
+from app.services.contract_query_service import ContractQueryService
+
+EXPORT_FETCH_SIZE = 1000   # 서버 사이드 커서에서 한 번에 가져오는 행 수
+CSV_FLUSH_ROWS = 500       # CSV 응답 한 조각에 담는 행 수
+INDEFINITE_LABEL = '한달 전 통보'
+
+# (헤더, 행 -> 값)
+EXPORT_COLUMNS = [
+    ('계약ID', lambda r: r.id),
+    ('지점', lambda r: r.branch_name),
+    ('ROOM번호', lambda r: r.room_name),
+    ('이름', lambda r: r.user_name or r.temp_user_name),
+    ('결제일', lambda r: f'{r.payment_day}일' if r.payment_day else None),
+    ('월세', lambda r: r.price if r.price is not None else r.room_price),
+    ('보증금', lambda r: r.deposit if r.deposit is not None else r.room_deposit),
+    ('계약시작일', lambda r: r.start_date.isoformat() if r.start_date else None),
+    ('계약만료일', lambda r: INDEFINITE_LABEL if r.is_indefinite else (r.end_date.isoformat() if r.end_date else None)),
+    ('연락처', lambda r: r.user_phone or r.temp_user_phone),
+    ('이메일', lambda r: r.user_email or r.temp_user_email),
+    ('상태', lambda r: r.status),
+    ('회원매핑', lambda r: 'Y' if r.user_id else 'N'),
+]
+
+class ContractExportService:
+    @staticmethod
+    def build_query(args):
+        """
+        필터(ContractQueryService.filtered_query 파라미터)에 맞는 내보내기용 컬럼 쿼리
+
+        Raises:
+            ValueError: 잘못된 필터 값
+        """
+        return (
+            ContractQueryService.filtered_query(args, join_room=True)
+            .outerjoin(Branch, Room.branch_id == Branch.id)
+            .outerjoin(User, Contract.user_id == User.id)
+            .with_entities(
+                Contract.id, Contract.user_id, Contract.temp_user_name, Contract.temp_user_phone,
+                Contract.temp_user_email, Contract.payment_day, Contract.price, Contract.deposit,
+                Contract.start_date, Contract.end_date, Contract.is_indefinite, Contract.status,
+                Branch.name.label('branch_name'), Room.name.label('room_name'),
+                Room.price.label('room_price'), Room.deposit.label('room_deposit'),
+                User.name.label('user_name'), User.phone.label('user_phone'), User.email.label('user_email'),
+            )
+            .order_by(Branch.name, Room.name, Contract.id)
+            .execution_options(yield_per=EXPORT_FETCH_SIZE)
+        )
+
+    @staticmethod
+    def iter_rows(query):
+        """build_query 결과를 내보내기 행(list)으로 하나씩 생성"""
+        for row in query:
+            yield [getter(row) for _, getter in EXPORT_COLUMNS]
+
+    @staticmethod
+    def headers():
+        return [header for header, _ in EXPORT_COLUMNS]
+
+    @classmethod
+    def stream_csv(cls, rows):
+        """CSV 조각 생성기 (Excel 한글 인식을 위해 UTF-8 BOM 포함)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        buffer.write('\ufeff')
+        writer.writerow(cls.headers())
+
+        for i, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if i % CSV_FLUSH_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @classmethod
+    def write_xlsx(cls, rows, sheet_title='전체지점_계약현황'):
+        """
+        write-only 워크북에 행을 하나씩 기록한 임시 파일 반환 (처음 위치로 되감긴 상태)
+
+        xlsx 는 zip 형식이라 끝까지 기록해야 내보낼 수 있으므로, 메모리 대신 임시 파일에 씁니다.
+
+        Raises:
+            RuntimeError: openpyxl 미설치
+        """
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise RuntimeError('openpyxl is required for XLSX export')
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(sheet_title)
+        sheet.append(cls.headers())
+        for row in rows:
+            sheet.append(row)
+
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+        return output
@@ -0,0 +1,394 @@
+"""
+계약 일괄 등록 서비스 (전체지점_계약현황 / 임시계약_관리리스트 엑셀, 내보내기 CSV)
+
+1. 시트의 헤더 이름으로 열을 찾아 행을 읽고 (두 양식과 내보내기 CSV 모두 지원)
+2. 지점은 별칭 맵, 방은 메모리 인덱스로 찾고, 회원은 연락처 IN 조회 한 번으로 매핑
+3. 기존 계약과의 기간 중복은 배치 전체에 대해 조회 한 번으로 확인하고, 배치 내부 중복도 검사
+4. dry_run 이면 행별 처리 계획(create/skip/error)만 반환하고,
+   아니면 계약/상태 이력/방 상태를 청크 단위로 일괄 저장합니다.
+"""
+import csv
+import io
+from datetime import date, datetime
+from sqlalchemy import func, insert
+from app.extensions import db
+from app.models.branch import Room
+from app.models.contract import Contract, ContractStatusHistory
+from app.models.user import User
+from app.services.branch_alias_service import BranchAliasService
+
+IMPORT_CHUNK_SIZE = 500
+INDEFINITE_END_DATE = date(2099, 12, 31)
+INDEFINITE_LABELS = ('한달 전 통보', '무기한')
+EMPTY_VALUES = ('', '-', '제외')
+MANWON_THRESHOLD = 10000  # 이 값보다 작은 금액은 만원 단위로 보고 환산
+
+# 방을 점유하는(기간 중복을 막는) 계약 상태
+OCCUPYING_STATUSES = (
+    'requested', 'waiting_signature', 'approved', 'active', 'extend_requested', 'terminate_requested'
+)
+IMPORT_STATUSES = OCCUPYING_STATUSES + ('terminated', 'cancelled')
+
+# 표준 키 -> 시트 헤더 이름들
+HEADER_ALIASES = {
+    'contract_id': ('계약ID',),
+    'branch': ('지점', '지점명'),
+    'room': ('ROOM번호', '호실', '방'),
+    'name': ('이름', '성함(임시)', '성함'),
+    'payment_day': ('결제일',),
+    'price': ('월세', '월세(Price)'),
+    'deposit': ('보증금',),
+    'start_date': ('계약시작일', '시작일'),
+    'end_date': ('계약만료일', '종료일'),
+    'phone': ('연락처',),
+    'email': ('이메일',),
+    'status': ('상태',),
+}
+REQUIRED_HEADERS = ('branch', 'room', 'start_date')
+
+
+class ImportFormatError(ValueError):
+    """파일 자체를 읽을 수 없는 경우 (헤더 누락, 지원하지 않는 형식)"""
+
+
+def _text(value):
+    if value is None:
+        return None
+    text = str(value).strip()
+    return None if text in EMPTY_VALUES else text
+
+def _room_key(name):
+    """'3', '3호', ' 3 호' -> '3' (시트와 DB의 호실 표기 차이 흡수)"""
+    key = str(name).replace(' ', '')
+    if key.endswith('.0'):
+        key = key[:-2]
+    return key[:-1] if key.endswith('호') else key
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = _text(value)
+    if not text:
+        return None
+    text = text.replace('–', '-').replace('—', '-')  # 엑셀 자동 변환된 대시
+    for fmt in ('%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%Y%m%d'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f'날짜 형식 오류: {text}')
+
+def _parse_amount(value):
+    text = _text(value)
+    if text is None:
+        return None
+    amount = int(float(text.replace(',', '')))
+    return amount * 10000 if 0 < amount < MANWON_THRESHOLD else amount
+
+def _parse_payment_day(value):
+    text = _text(value)
+    if text is None:
+        return 1
+    day = int(float(text.rstrip('일')))
+    if not 1 <= day <= 31:
+        raise ValueError(text)
+    return day
+
+
+class ContractImportService:
+    @staticmethod
+    def read_rows(file_storage):
+        """
+        업로드 파일(.xlsx/.csv)에서 (엑셀 행 번호, {표준 키: 값}) 목록 읽기
+
+        Raises:
+            ImportFormatError: 형식 오류, 필수 헤더 누락
+        """
+        filename = (file_storage.filename or '').lower()
+        if filename.endswith('.csv'):
+            text = file_storage.read().decode('utf-8-sig')
+            sheet_rows = list(csv.reader(io.StringIO(text)))
+        elif filename.endswith('.xlsx'):
+            try:
+                from openpyxl import load_workbook
+            except ImportError:
+                raise ImportFormatError('openpyxl is required for XLSX import')
+            workbook = load_workbook(file_storage, read_only=True, data_only=True)
+            sheet_rows = list(workbook.worksheets[0].iter_rows(values_only=True))
+            workbook.close()
+        else:
+            raise ImportFormatError('xlsx 또는 csv 파일만 지원합니다.')
+
+        if not sheet_rows:
+            raise ImportFormatError('빈 파일입니다.')
+
+        header_index = {}
+        for i, header in enumerate(sheet_rows[0]):
+            header = str(header).strip() if header is not None else ''
+            for key, aliases in HEADER_ALIASES.items():
+                if header in aliases and key not in header_index:
+                    header_index[key] = i
+        missing = [HEADER_ALIASES[key][0] for key in REQUIRED_HEADERS if key not in header_index]
+        if missing:
+            raise ImportFormatError(f"필수 열이 없습니다: {', '.join(missing)}")
+
+        rows = []
+        for row_number, values in enumerate(sheet_rows[1:], start=2):
+            if not any(v not in (None, '') for v in values):
+                continue
+            rows.append((row_number, {
+                key: values[i] if i < len(values) else None for key, i in header_index.items()
+            }))
+        return rows
+
+    @staticmethod
+    def _parse_row(raw):
+        """시트 값 -> 계약 필드 dict (오류 목록 함께 반환)"""
+        errors = []
+        # 계약 정보 없이 방만 나열된 행 (빈 방, 총무실, 공용 연습실 등)
+        if not any(_text(raw.get(key)) for key in ('start_date', 'end_date', 'price', 'deposit')):
+            return {'vacant': True}, errors
+
+        parsed = {
+            'vacant': False,
+            'branch': _text(raw.get('branch')),
+            'room': _text(raw.get('room')),
+            'name': _text(raw.get('name')),
+            'phone': _text(raw.get('phone')),
+            'email': _text(raw.get('email')),
+            'contract_id': None,
+        }
+        if not parsed['branch']:
+            errors.append('지점이 비어 있습니다.')
+        if not parsed['room']:
+            errors.append('호실이 비어 있습니다.')
+
+        contract_id = _text(raw.get('contract_id'))
+        if contract_id and contract_id.isdigit():
+            parsed['contract_id'] = int(contract_id)
+
+        for key, parser in (('price', _parse_amount), ('deposit', _parse_amount), ('payment_day', _parse_payment_day)):
+            try:
+                parsed[key] = parser(raw.get(key))
+            except ValueError:
+                errors.append(f'{HEADER_ALIASES[key][0]} 값 오류: {raw.get(key)}')
+                parsed[key] = None
+
+        try:
+            parsed['start_date'] = _parse_date(raw.get('start_date'))
+            if not parsed['start_date']:
+                errors.append('시작일이 비어 있습니다.')
+        except ValueError as e:
+            errors.append(str(e))
+            parsed['start_date'] = None
+
+        end_text = _text(raw.get('end_date'))
+        parsed['is_indefinite'] = end_text in INDEFINITE_LABELS
+        parsed['end_date'] = None
+        if not parsed['is_indefinite']:
+            try:
+                parsed['end_date'] = _parse_date(raw.get('end_date'))
+            except ValueError as e:
+                errors.append(str(e))
+            if parsed['end_date'] and parsed['end_date'] >= INDEFINITE_END_DATE:
+                parsed['is_indefinite'] = True
+            elif parsed['end_date'] is None and end_text is None:
+                errors.append('종료일이 비어 있습니다.')
+        if parsed['is_indefinite']:
+            parsed['end_date'] = INDEFINITE_END_DATE
+        if parsed['start_date'] and parsed['end_date'] and parsed['end_date'] < parsed['start_date']:
+            errors.append('종료일이 시작일보다 빠릅니다.')
+
+        status = _text(raw.get('status')) or 'active'
+        if status not in IMPORT_STATUSES:
+            errors.append(f'알 수 없는 상태: {status}')
+        parsed['status'] = status
+        return parsed, errors
+
+    @staticmethod
+    def _room_index(branch_ids):
+        """{(branch_id, 호실 키): Room} (대상 지점의 방을 한 번에 적재)"""
+        rooms = Room.query.filter(Room.branch_id.in_(branch_ids)).all() if branch_ids else []
+        return {(room.branch_id, _room_key(room.name)): room for room in rooms}
+
+    @staticmethod
+    def _existing_contracts(room_ids, start, end):
+        """대상 방들에서 [start, end] 와 겹치는 점유 계약 {room_id: [(시작, 종료, 이름, 연락처, id), ...]}"""
+        if not room_ids:
+            return {}
+        effective_end = func.coalesce(Contract.termination_effective_date, Contract.end_date)
+        rows = (
+            db.session.query(
+                Contract.id, Contract.room_id, Contract.start_date, effective_end,
+                func.coalesce(User.name, Contract.temp_user_name), func.coalesce(User.phone, Contract.temp_user_phone)
+            )
+            .outerjoin(User, Contract.user_id == User.id)
+            .filter(
+                Contract.room_id.in_(room_ids),
+                Contract.status.in_(OCCUPYING_STATUSES),
+                Contract.start_date <= end,
+                effective_end >= start
+            ).all()
+        )
+        result = {}
+        for contract_id, room_id, start_date, end_date, name, phone in rows:
+            result.setdefault(room_id, []).append((start_date, end_date, name, phone, contract_id))
+        return result
+
+    @classmethod
+    def plan(cls, rows):
+        """
+        행별 처리 계획 생성 (DB 변경 없음)
+
+        Returns:
+            [{'row', 'action'(create|skip|error), 'errors', 'message', 'values'}, ...]
+        """
+        parsed_rows = []
+        for row_number, raw in rows:
+            parsed, errors = cls._parse_row(raw)
+            parsed_rows.append({'row': row_number, 'parsed': parsed, 'errors': errors})
+
+        parsed_list = [p['parsed'] for p in parsed_rows if not p['parsed']['vacant']]
+        branch_map = BranchAliasService.resolve_branch_ids({p['branch'] for p in parsed_list if p['branch']})
+        room_index = cls._room_index({bid for bid in branch_map.values() if bid})
+
+        phones = {p['phone'] for p in parsed_list if p['phone']}
+        users_by_phone = dict(db.session.query(User.phone, User.id).filter(User.phone.in_(phones)).all()) if phones else {}
+
+        contract_ids = {p['contract_id'] for p in parsed_list if p['contract_id']}
+        existing_ids = {cid for (cid,) in db.session.query(Contract.id).filter(Contract.id.in_(contract_ids)).all()} if contract_ids else set()
+
+        for item in parsed_rows:
+            parsed = item['parsed']
+            if parsed['vacant'] or not parsed['branch'] or not parsed['room']:
+                continue
+            branch_id = branch_map.get(parsed['branch'])
+            if not branch_id:
+                item['errors'].append(f"지점을 찾을 수 없습니다: {parsed['branch']}")
+                continue
+            room = room_index.get((branch_id, _room_key(parsed['room'])))
+            if not room:
+                item['errors'].append(f"방을 찾을 수 없습니다: {parsed['branch']} {parsed['room']}")
+                continue
+            if room.room_type == 'time_based':
+                item['errors'].append(f'시간제 방은 일괄 등록할 수 없습니다: {room.name}')
+                continue
+            item['room'] = room
+
+        dated = [p for p in parsed_rows if p.get('room') and not p['errors']]
+        existing = {}
+        if dated:
+            existing = cls._existing_contracts(
+                {p['room'].id for p in dated},
+                min(p['parsed']['start_date'] for p in dated),
+                max(p['parsed']['end_date'] for p in dated)
+            )
+
+        plans = []
+        batch_periods = {}  # room_id -> [(시작, 종료, 행 번호)] (이번 배치에서 생성할 계약)
+        for item in parsed_rows:
+            parsed = item['parsed']
+            plan = {'row': item['row'], 'action': 'error', 'errors': item['errors'], 'message': None, 'values': None}
+            plans.append(plan)
+            if parsed['vacant']:
+                plan.update(action='skip', message='계약 정보 없음')
+                continue
+            if item['errors']:
+                continue
+
+            room = item['room']
+            start, end = parsed['start_date'], parsed['end_date']
+            if parsed['contract_id'] in existing_ids:
+                plan.update(action='skip', message=f"이미 등록된 계약 #{parsed['contract_id']}")
+                continue
+
+            occupying = parsed['status'] in OCCUPYING_STATUSES
+            if occupying:
+                conflict = next((c for c in existing.get(room.id, []) if c[0] <= end and c[1] >= start), None)
+                if conflict:
+                    if conflict[0] == start and (conflict[2] == parsed['name'] or (parsed['phone'] and conflict[3] == parsed['phone'])):
+                        plan.update(action='skip', message=f'이미 등록된 계약 #{conflict[4]}')
+                    else:
+                        plan['errors'].append(f'기존 계약 #{conflict[4]} ({conflict[0]} ~ {conflict[1]})과 기간이 겹칩니다.')
+                    continue
+                batch_conflict = next((b for b in batch_periods.get(room.id, []) if b[0] <= end and b[1] >= start), None)
+                if batch_conflict:
+                    plan['errors'].append(f'{batch_conflict[2]}행과 기간이 겹칩니다.')
+                    continue
+                batch_periods.setdefault(room.id, []).append((start, end, item['row']))
+
+            if parsed['is_indefinite']:
+                months = 0
+            else:
+                months = max(round((end - start).days / 30), 1)
+            user_id = users_by_phone.get(parsed['phone'])
+            plan['action'] = 'create'
+            plan['values'] = {
+                'room_id': room.id,
+                'user_id': user_id,
+                'temp_user_name': None if user_id else parsed['name'],
+                'temp_user_phone': None if user_id else parsed['phone'],
+                'temp_user_email': None if user_id else parsed['email'],
+                'start_date': start,
+                'end_date': end,
+                'months': months,
+                'price': parsed['price'] if parsed['price'] is not None else room.price,
+                'deposit': parsed['deposit'] if parsed['deposit'] is not None else room.deposit,
+                'payment_method': 'bank',
+                'payment_day': parsed['payment_day'] or 1,
+                'status': parsed['status'],
+                'is_indefinite': parsed['is_indefinite'],
+            }
+        return plans
+
+    @staticmethod
+    def apply(plans, actor_id=None):
+        """
+        create 계획을 청크 단위로 저장 (커밋은 호출자가 수행)
+
+        계약은 청크마다 한 번 flush 하고, 상태 이력은 다중 행 INSERT 로 저장합니다.
+
+        Returns:
+            {행 번호: 생성된 계약 ID}
+        """
+        creates = [p for p in plans if p['action'] == 'create']
+        created = {}
+        occupied_room_ids = set()
+        now = datetime.now()
+
+        for offset in range(0, len(creates), IMPORT_CHUNK_SIZE):
+            chunk = creates[offset:offset + IMPORT_CHUNK_SIZE]
+            contracts = [Contract(created_at=now, **p['values']) for p in chunk]
+            db.session.add_all(contracts)
+            db.session.flush()
+
+            db.session.execute(insert(ContractStatusHistory), [{
+                'contract_id': contract.id,
+                'old_status': None,
+                'new_status': contract.status,
+                'actor_id': actor_id,
+                'actor_type': 'admin',
+                'source': 'batch',
+                'reason': '일괄 등록',
+                'changed_at': now,
+            } for contract in contracts])
+
+            for plan, contract in zip(chunk, contracts):
+                created[plan['row']] = contract.id
+                if contract.status == 'active':
+                    occupied_room_ids.add(contract.room_id)
+
+        # 방은 plan() 에서 이미 세션에 적재되어 있으므로 추가 조회 없이 변경 (flush 시 한 번에 UPDATE)
+        for room_id in occupied_room_ids:
+            db.session.get(Room, room_id).status = 'occupied'
+        db.session.flush()
+        return created
+
+    @staticmethod
+    def summarize(plans):
+        summary = {'total': len(plans), 'create': 0, 'skip': 0, 'error': 0}
+        for plan in plans:
+            summary[plan['action']] += 1
+        return summary
@@ -0,0 +1,77 @@
+"""
+관리자 계약 목록 조회 서비스: 쿼리 파라미터 -> 필터가 적용된 Contract 쿼리
+
+필터는 모두 SQL 조건으로 변환되어 DB에서 처리되며, 목록 API와 내보내기가 같은 규칙을 공유합니다.
+"""
+from app.models.branch import Room
+from app.models.contract import Contract
+from app.utils.pagination import int_arg, date_arg
+
+# 정렬 파라미터 -> 컬럼 (id 는 키셋 동률 처리용으로 항상 마지막에 붙음)
+CONTRACT_SORT_COLUMNS = {
+    'id': Contract.id,
+    'start_date': Contract.start_date,
+    'end_date': Contract.end_date,
+}
+
+class ContractQueryService:
+    @staticmethod
+    def filtered_query(args, join_room=False):
+        """
+        쿼리 파라미터로 필터링한 Contract 쿼리 반환
+
+        join_room=True 이면 필터와 관계없이 Room 을 조인합니다 (Room 컬럼을 함께 조회할 때).
+
+        지원 파라미터:
+            branch_id: 지점 ID
+            room_id: 방 ID
+            status: 상태 (쉼표로 여러 개)
+            room_type: 방 유형 (monthly, time_based 등)
+            date_from, date_to: 계약 기간이 [date_from, date_to] 와 겹치는 계약
+            mapped: true(회원 매핑됨) / false(미매핑)
+            user_id: 회원 ID
+
+        Raises:
+            ValueError: 잘못된 파라미터 값
+        """
+        query = Contract.query
+
+        branch_id = int_arg(args, 'branch_id')
+        room_type = args.get('room_type')
+        if join_room or branch_id is not None or room_type:
+            query = query.join(Room, Contract.room_id == Room.id)
+            if branch_id is not None:
+                query = query.filter(Room.branch_id == branch_id)
+            if room_type:
+                query = query.filter(Room.room_type == room_type)
+
+        room_id = int_arg(args, 'room_id')
+        if room_id is not None:
+            query = query.filter(Contract.room_id == room_id)
+
+        user_id = int_arg(args, 'user_id')
+        if user_id is not None:
+            query = query.filter(Contract.user_id == user_id)
+
+        statuses = [s.strip() for s in (args.get('status') or '').split(',') if s.strip()]
+        if statuses:
+            query = query.filter(Contract.status.in_(statuses))
+
+        date_from = date_arg(args, 'date_from')
+        date_to = date_arg(args, 'date_to')
+        if date_from and date_to and date_from > date_to:
+            raise ValueError('date_from must be before date_to')
+        if date_from:
+            query = query.filter(Contract.end_date >= date_from)
+        if date_to:
+            query = query.filter(Contract.start_date <= date_to)
+
+        mapped = (args.get('mapped') or '').lower()
+        if mapped in ('true', '1'):
+            query = query.filter(Contract.user_id.isnot(None))
+        elif mapped in ('false', '0'):
+            query = query.filter(Contract.user_id.is_(None))
+        elif mapped:
+            raise ValueError('mapped must be true or false')
+
+        return query
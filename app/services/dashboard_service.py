@@ -0,0 +1,357 @@
+"""
+관리자 대시보드 스냅샷 서비스
+
+/admin/api/stats 응답을 dashboard_snapshot 단일 행에 저장해 두고 조회 시 그대로 반환합니다.
+
+증분 갱신
+    - 계약/방/지점/회원 변경은 after_flush 에서 영향받는 방/지점/회원 수/만료 임박 목록을 모아 두고,
+    - 커밋 후 별도의 짧은 트랜잭션에서 스냅샷 행을 잠근 뒤 영향받은 지점 항목(과 회원 수, 만료 임박
+      목록)만 다시 계산해 바꿔 씁니다. 업무 트랜잭션은 스냅샷 행을 잠그거나 집계를 실행하지 않습니다.
+    - 갱신 실패나 만료 임박 기준일 변화처럼 날짜에 따라 바뀌는 값은 매일 밤 전체 재생성으로 보정합니다.
+      (조회는 DB에 쓰지 않음 - 스냅샷이 아직 없으면 계산한 값을 저장하지 않고 반환)
+"""
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import event, func, case, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.branch import Branch, Room
+from app.models.contract import Contract
+from app.models.dashboard_snapshot import DashboardSnapshot
+from app.models.sms import get_kst_now
+from app.models.user import User
+from app.serializers import ContractSerializer, RoomSerializer
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ID = 1
+EXPIRING_LIST_LIMIT = 100
+PENDING_CHANGES_KEY = 'dashboard_changes'
+
+# 대시보드 값에 영향을 주는 필드
+CONTRACT_FIELDS = ('status', 'room_id', 'price', 'deposit', 'end_date', 'is_indefinite', 'user_id', 'temp_user_name')
+ROOM_FIELDS = ('status', 'room_type', 'branch_id', 'price', 'deposit', 'name')
+BRANCH_FIELDS = ('name',)
+# 다른 지점/방으로 옮겨지면 이전 쪽도 영향받는 필드
+MOVE_FIELDS = {Room: 'branch_id', Contract: 'room_id'}
+
+class DashboardService:
+    @staticmethod
+    def _expiring_cutoff():
+        # 자정(KST) 기준으로 날짜가 바뀜 (UTC 날짜를 쓰면 오전 9시에 바뀜)
+        return get_kst_now().date() + timedelta(days=30)
+
+    @staticmethod
+    def build_branch_entries(branch_ids=None, session=None):
+        """
+        지점별 대시보드 항목 계산
+
+        Args:
+            branch_ids: 계산할 지점 ID 목록 (None 이면 전체)
+        Returns:
+            {branch_id: 항목 dict} 딕셔너리
+        """
+        session = session or db.session
+        one_month_from_now = DashboardService._expiring_cutoff()
+
+        def scoped(query, column):
+            return query if branch_ids is None else query.filter(column.in_(branch_ids))
+
+        branches = scoped(session.query(Branch), Branch.id).all()
+        if not branches:
+            return {}
+
+        # 활성 계약 매출/보증금/만료 임박 (가격이 없으면 방 기본가)
+        contract_stats = scoped(session.query(
+            Room.branch_id,
+            func.count(Contract.id).label('active'),
+            func.sum(case((Contract.price != None, Contract.price), else_=Room.price)).label('revenue'),
+            func.sum(case((Contract.deposit != None, Contract.deposit), else_=Room.deposit)).label('deposit'),
+            func.sum(case((
+                (Contract.is_indefinite == False) &
+                (Contract.end_date != None) &
+                (Contract.end_date <= one_month_from_now), 1
+            ), else_=0)).label('expiring')
+        ).select_from(Contract).join(Room).filter(Contract.status == 'active'), Room.branch_id).group_by(Room.branch_id).all()
+        contract_stats_map = {r.branch_id: r for r in contract_stats}
+
+        # 승인대기/서명대기 계약 수
+        status_counts = scoped(session.query(
+            Room.branch_id,
+            Contract.status,
+            func.count(Contract.id).label('count')
+        ).select_from(Contract).join(Room).filter(
+            Contract.status.in_(['requested', 'waiting_signature'])
+        ), Room.branch_id).group_by(Room.branch_id, Contract.status).all()
+        status_counts_map = {(r.branch_id, r.status): r.count for r in status_counts}
+
+        # 방 유형별/월 단위 방 상태별 개수 (Room.status는 계약 상태 변경 시 동기화됨)
+        monthly = Room.room_type == 'monthly'
+        room_stats = scoped(session.query(
+            Room.branch_id,
+            func.count(Room.id).label('total'),
+            func.count(case((Room.room_type == 'time_based', 1))).label('time_based'),
+            func.count(case((Room.room_type == 'manager', 1))).label('manager'),
+            func.count(case((monthly, 1))).label('total_monthly'),
+            func.count(case((monthly & (Room.status == 'occupied'), 1))).label('occupied_monthly'),
+            func.count(case((monthly & (Room.status == 'reserved'), 1))).label('reserved_monthly'),
+            func.count(case((monthly & (Room.status == 'available'), 1))).label('available_monthly'),
+            func.count(case((monthly & (Room.status == 'maintenance'), 1))).label('maintenance_monthly')
+        ), Room.branch_id).group_by(Room.branch_id).all()
+        room_stats_map = {r.branch_id: r for r in room_stats}
+
+        # 공실(월 단위) 방 목록
+        available_rooms = scoped(
+            session.query(Room).filter_by(room_type='monthly', status='available'), Room.branch_id
+        ).all()
+        available_rooms_by_branch = {}
+        for room, data in zip(available_rooms, RoomSerializer('price_summary').many(available_rooms)):
+            available_rooms_by_branch.setdefault(room.branch_id, []).append(data)
+
+        entries = {}
+        for branch in branches:
+            bid = branch.id
+            stats = contract_stats_map.get(bid)
+            r_stats = room_stats_map.get(bid)
+
+            def room_count(name):
+                return getattr(r_stats, name) if r_stats else 0
+
+            entries[bid] = {
+                'id': bid,
+                'name': branch.name,
+                'monthly_revenue': (stats.revenue or 0) if stats else 0,
+                'deposit': (stats.deposit or 0) if stats else 0,
+                'active_contracts': stats.active if stats else 0,
+                'expiring_contracts': (stats.expiring or 0) if stats else 0,
+                'pending_contracts': status_counts_map.get((bid, 'requested'), 0),
+                'waiting_signature': status_counts_map.get((bid, 'waiting_signature'), 0),
+                'total_rooms': room_count('total'),
+                'occupied_rooms': room_count('occupied_monthly') + room_count('reserved_monthly'), # Reserved counts as non-vacant
+                'available_rooms': room_count('available_monthly'),
+                'available_rooms_list': available_rooms_by_branch.get(bid, []),
+                'monthly_rooms': room_count('total_monthly'),
+                'total_monthly_rooms': room_count('total_monthly'),
+                'time_based_rooms': room_count('time_based'),
+                'manager_rooms': room_count('manager'),
+                'occupied_monthly_rooms': room_count('occupied_monthly'),
+                'reserved_monthly_rooms': room_count('reserved_monthly'),
+                'maintenance_rooms': room_count('maintenance_monthly')
+            }
+        return entries
+
+    @staticmethod
+    def build_expiring(session=None):
+        """만료 임박 활성 계약 (종료일 순 상위 목록)"""
+        session = session or db.session
+        expiring_query = session.query(Contract).filter(
+            Contract.status == 'active',
+            Contract.is_indefinite == False,
+            Contract.end_date != None,
+            Contract.end_date <= DashboardService._expiring_cutoff()
+        ).order_by(Contract.end_date.asc())
+        return ContractSerializer('expiring').many(expiring_query.limit(EXPIRING_LIST_LIMIT).all())
+
+    @staticmethod
+    def compose(branch_entries, total_users, expiring_list):
+        """지점 항목을 합산해 /admin/api/stats 응답 형태로 구성"""
+        branch_data = sorted(branch_entries, key=lambda b: b['id'])
+
+        def total(key):
+            return sum(b[key] for b in branch_data)
+
+        return {
+            'stats': {
+                'totalUsers': total_users,
+                'activeContracts': total('active_contracts'),
+                # User requested to only count contracts for "승인대기"
+                'pendingRequests': total('pending_contracts'),
+                'waitingSignature': total('waiting_signature'),
+                'expiringContracts': total('expiring_contracts'),
+                'monthlyRevenue': total('monthly_revenue'),
+                'totalDeposit': total('deposit'),
+                'totalRooms': total('total_rooms'), # All types (Monthly + Time + Mgr)
+                'occupiedRooms': total('occupied_rooms') + total('maintenance_rooms'), # All non-vacant monthly
+                'availableRooms': total('available_rooms'), # Truly available monthly
+                'monthlyRooms': total('monthly_rooms'),
+                'maintenanceRooms': total('maintenance_rooms')
+            },
+            'branchData': branch_data,
+            'expiringContracts': expiring_list
+        }
+
+    @staticmethod
+    def build_payload(session=None):
+        session = session or db.session
+        entries = DashboardService.build_branch_entries(session=session)
+        return DashboardService.compose(
+            entries.values(), session.query(func.count(User.id)).scalar(), DashboardService.build_expiring(session)
+        )
+
+    @staticmethod
+    def _lock_snapshot(session):
+        """스냅샷 행을 잠그고 payload 조회 (없으면 None) - 업무 트랜잭션에서는 호출하지 않음"""
+        return session.execute(
+            select(DashboardSnapshot.payload).where(DashboardSnapshot.id == SNAPSHOT_ID).with_for_update()
+        ).scalar()
+
+    @staticmethod
+    def rebuild():
+        """스냅샷 전체 재생성 (야간 작업, 호출자가 커밋)"""
+        # 계산 전에 행을 잠가 두어야 계산 중 커밋된 증분 갱신을 덮어쓰지 않음
+        exists = DashboardService._lock_snapshot(db.session) is not None
+        payload = DashboardService.build_payload()
+        now = datetime.utcnow()
+        table = DashboardSnapshot.__table__
+        values = dict(payload=payload, built_at=now, updated_at=now)
+        if exists:
+            db.session.execute(table.update().where(table.c.id == SNAPSHOT_ID).values(values))
+            return payload
+        try:
+            with db.session.connection().begin_nested():
+                db.session.execute(table.insert().values(id=SNAPSHOT_ID, **values))
+        except IntegrityError:
+            # 다른 워커가 먼저 생성한 경우
+            logger.info("Dashboard snapshot created concurrently")
+        return payload
+
+    @staticmethod
+    def apply_changes(changes, session):
+        """
+        커밋된 변경을 스냅샷에 반영 (영향받은 지점 항목/회원 수/만료 임박 목록만 다시 계산, 커밋은 호출자)
+
+        Args:
+            changes: {'rooms': 방 ID 집합, 'branches': 지점 ID 집합, 'users': bool, 'contracts': bool}
+        Returns:
+            갱신 여부 (스냅샷이 아직 없으면 야간 재생성에 맡기고 False)
+        """
+        payload = DashboardService._lock_snapshot(session)
+        if payload is None:
+            return False
+
+        branch_ids = set(changes['branches'])
+        if changes['rooms']:
+            branch_ids.update(bid for (bid,) in session.query(Room.branch_id).filter(Room.id.in_(changes['rooms'])))
+        branch_ids.discard(None)
+
+        entries = {entry['id']: entry for entry in payload['branchData']}
+        if branch_ids:
+            fresh = DashboardService.build_branch_entries(branch_ids, session=session)
+            for bid in branch_ids:
+                if bid in fresh:
+                    entries[bid] = fresh[bid]
+                else:
+                    entries.pop(bid, None)  # 삭제된 지점
+
+        total_users = session.query(func.count(User.id)).scalar() if changes['users'] else payload['stats']['totalUsers']
+        expiring = DashboardService.build_expiring(session) if changes['contracts'] else payload['expiringContracts']
+
+        table = DashboardSnapshot.__table__
+        session.execute(table.update().where(table.c.id == SNAPSHOT_ID).values(
+            payload=DashboardService.compose(entries.values(), total_users, expiring),
+            updated_at=datetime.utcnow()
+        ))
+        return True
+
+    @staticmethod
+    def get_payload():
+        """스냅샷 조회 (읽기만 함 - 아직 없으면 계산한 값을 저장하지 않고 반환)"""
+        payload = db.session.execute(
+            select(DashboardSnapshot.payload).where(DashboardSnapshot.id == SNAPSHOT_ID)
+        ).scalar()
+        return payload if payload is not None else DashboardService.build_payload()
+
+def _history_values(obj, field):
+    """현재 값과 flush 전 값 (방을 옮긴 계약/지점을 옮긴 방은 양쪽 모두 영향)"""
+    state = inspect(obj)
+    history = state.attrs[field].history
+    return set(history.added or ()) | set(history.deleted or ()) | set(history.unchanged or ()) | {state.dict.get(field)}
+
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+def _collect(changes, obj, new=False, deleted=False):
+    """변경된 객체의 영향 범위를 changes 에 추가"""
+    if isinstance(obj, User):
+        # 회원 수만 사용
+        if new or deleted:
+            changes['users'] = True
+        return
+    watched = {Contract: CONTRACT_FIELDS, Room: ROOM_FIELDS, Branch: BRANCH_FIELDS}
+    fields = watched.get(type(obj))
+    if fields is None or not (new or deleted or _changed(obj, fields)):
+        return
+    if isinstance(obj, Contract):
+        changes['rooms'].update(_history_values(obj, 'room_id'))
+        changes['contracts'] = True
+    elif isinstance(obj, Room):
+        changes['branches'].update(_history_values(obj, 'branch_id'))
+    else:
+        changes['branches'].add(obj.id)
+
+def _pending_changes(session):
+    return session.info.setdefault(
+        PENDING_CHANGES_KEY, {'rooms': set(), 'branches': set(), 'users': False, 'contracts': False}
+    )
+
+def _before_flush(session, flush_context, instances):
+    # 변경 전 값이 적재되지 않은 채 옮겨진 방/계약은 flush 전에 DB에서 이전 지점/방을 조회
+    moved = {}
+    for obj in session.dirty:
+        field = MOVE_FIELDS.get(type(obj))
+        if field:
+            state = inspect(obj)
+            history = state.attrs[field].history
+            if history.added and not history.deleted and state.identity:
+                moved.setdefault(type(obj), []).append(state.identity[0])
+    if not moved:
+        return
+    changes = _pending_changes(session)
+    for model, ids in moved.items():
+        column = getattr(model, MOVE_FIELDS[model])
+        previous = {value for (value,) in session.execute(select(column).where(model.id.in_(ids)))}
+        changes['branches' if model is Room else 'rooms'].update(previous)
+
+def _after_flush(session, flush_context):
+    # after_flush: 새 객체의 ID가 정해졌고, 변경 전 값(history)도 아직 남아 있음
+    changes = _pending_changes(session)
+    for obj in session.new:
+        _collect(changes, obj, new=True)
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            _collect(changes, obj)
+    for obj in session.deleted:
+        _collect(changes, obj, deleted=True)
+
+def _after_commit(session):
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    if not changes:
+        return
+    changes['rooms'].discard(None)
+    changes['branches'].discard(None)
+    if not (changes['rooms'] or changes['branches'] or changes['users'] or changes['contracts']):
+        return
+    try:
+        # 커밋된 데이터를 기준으로 별도의 짧은 트랜잭션에서 반영 (스냅샷 행 잠금은 이 트랜잭션 동안만)
+        with db.engine.begin() as connection:
+            refresh_session = Session(bind=connection)
+            try:
+                DashboardService.apply_changes(changes, refresh_session)
+            finally:
+                refresh_session.close()
+    except Exception as e:
+        # 야간 전체 재생성으로 보정됨
+        logger.error(f"Dashboard snapshot update failed after commit: {e}")
+
+def _after_rollback(session):
+    session.info.pop(PENDING_CHANGES_KEY, None)
+
+def register_dashboard_listeners():
+    """계약/방/지점/회원 변경을 커밋 후 대시보드 스냅샷에 반영하는 세션 이벤트 등록"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'before_flush', _before_flush)
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
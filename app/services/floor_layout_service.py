@@ -0,0 +1,107 @@
+"""
+층별 배치도(방 위치) 서비스
+
+배치도 저장은 방 ID 검증을 한 번의 조회로, 위치 변경은 CASE 식을 쓴 UPDATE 한 번으로 처리합니다.
+층마다 'floor_layout:{지점 ID}:{층}' 캐시 버전을 두어 저장할 때마다 올리고,
+클라이언트가 보낸 버전이 다르면 다른 관리자의 변경을 덮어쓰지 않도록 거부합니다.
+버전 확인과 증가는 조건부 UPDATE 한 문장(compare-and-set)이라 동시에 저장해도 한 곳만 성공합니다.
+"""
+from sqlalchemy import case, or_
+from app.extensions import db
+from app.models.branch import Room
+from app.utils.cache_version import (
+    get_cache_version, get_cache_versions, bump_cache_version, compare_and_bump_cache_version
+)
+from app.utils.catalog_cache import invalidate_catalog
+
+DEFAULT_FLOOR = '1F'  # 층이 없는 방은 1F로 표시 (RoomSerializer display_floor)
+
+# 요청 키 -> Room 컬럼
+POSITION_FIELDS = (('x', 'position_x'), ('y', 'position_y'), ('w', 'width'), ('h', 'height'))
+
+
+class LayoutConflictError(Exception):
+    """클라이언트의 배치도 버전이 현재 버전과 다름"""
+    def __init__(self, current_version):
+        super().__init__('다른 곳에서 배치도가 변경되었습니다. 새로고침 후 다시 시도해주세요.')
+        self.current_version = current_version
+
+
+def layout_cache_key(branch_id, floor):
+    return f'floor_layout:{branch_id}:{floor}'
+
+def _floor_filter(floor):
+    if floor == DEFAULT_FLOOR:
+        return or_(Room.floor == floor, Room.floor.is_(None))
+    return Room.floor == floor
+
+def _number(value, key, room_id):
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f'Invalid {key} for room {room_id}')
+    return float(value)
+
+
+class FloorLayoutService:
+    @staticmethod
+    def versions(branch_id, floors):
+        """{층: 배치도 버전} (한 번의 조회)"""
+        keys = {floor: layout_cache_key(branch_id, floor) for floor in floors}
+        versions = get_cache_versions(keys.values()) if keys else {}
+        return {floor: versions[key] for floor, key in keys.items()}
+
+    @staticmethod
+    def update_positions(branch_id, floor, positions, expected_version=None):
+        """
+        층의 방 위치 일괄 변경 (커밋은 호출자가 수행)
+
+        Args:
+            positions: [{'id', 'x', 'y', 'w', 'h'}, ...]
+            expected_version: 클라이언트가 마지막으로 읽은 배치도 버전 (None이면 검사하지 않음)
+        Returns:
+            새 배치도 버전
+        Raises:
+            ValueError: 형식 오류 또는 이 지점/층에 없는 방 ID
+            LayoutConflictError: expected_version 불일치
+        """
+        if not isinstance(positions, list):
+            raise ValueError('positions must be a list')
+
+        values = {}
+        for pos in positions:
+            room_id = pos.get('id') if isinstance(pos, dict) else None
+            if isinstance(room_id, bool) or not isinstance(room_id, int):
+                raise ValueError('Each position needs an integer id')
+            values[room_id] = {column: _number(pos.get(key), key, room_id) for key, column in POSITION_FIELDS}
+
+        if values:
+            valid_ids = {room_id for (room_id,) in db.session.query(Room.id).filter(
+                Room.id.in_(values),
+                Room.branch_id == branch_id,
+                _floor_filter(floor)
+            ).all()}
+            unknown = sorted(set(values) - valid_ids)
+            if unknown:
+                raise ValueError(f"Rooms not on this floor: {', '.join(map(str, unknown))}")
+
+        # 방 위치를 바꾸기 전에 버전부터 올림 (다른 저장이 먼저 커밋했거나 진행 중이면 여기서 실패)
+        key = layout_cache_key(branch_id, floor)
+        if expected_version is None:
+            bump_cache_version(key)
+        elif not compare_and_bump_cache_version(key, expected_version):
+            raise LayoutConflictError(get_cache_version(key))
+
+        if values:
+            # UPDATE rooms SET position_x = CASE id WHEN ... END, ... WHERE id IN (...)
+            table = Room.__table__
+            db.session.execute(
+                table.update().where(table.c.id.in_(values)).values({
+                    column: case({room_id: v[column] for room_id, v in values.items()}, value=table.c.id)
+                    for _, column in POSITION_FIELDS
+                })
+            )
+            # Core UPDATE는 flush 이벤트를 거치지 않으므로 공개 카탈로그 캐시를 직접 무효화
+            invalidate_catalog()
+
+        return expected_version + 1 if expected_version is not None else get_cache_version(key)
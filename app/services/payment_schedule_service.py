@@ -0,0 +1,242 @@
+"""
+관리자 캘린더 일정 서비스 (월세 결제일 + 시간제 예약)
+
+계약별로 월을 하나씩 넘기며 결제일을 계산하는 대신, 요청 범위의 달력 표
+(월 번호, 말일)를 한 번 만들고 모든 계약을 같은 표에 대해 한 번에 전개합니다.
+결제일이 말일보다 크면 말일로 맞춥니다 (예: 31일 결제 -> 2월 28/29일).
+
+결과는 (월, 유형) 단위로 워커 메모리에 캐시하고, 계약/방/지점/회원 변경 시
+flush 단계에서 감지해 커밋 후 'calendar' 캐시 버전을 올려 모든 워커의 캐시를 무효화합니다.
+"""
+import calendar
+import threading
+from datetime import date
+from sqlalchemy import event, inspect
+from app.extensions import db
+from app.models.branch import Branch, Room
+from app.models.contract import Contract
+from app.models.user import User
+from app.utils.cache_version import get_cache_version, bump_cache_version_after_commit
+
+CALENDAR_CACHE_KEY = 'calendar'
+EVENT_TYPES = ('time', 'monthly')
+
+# 캘린더 일정에 영향을 주는 필드
+CONTRACT_FIELDS = (
+    'status', 'room_id', 'user_id', 'temp_user_name', 'start_date', 'end_date',
+    'start_time', 'end_time', 'price', 'payment_day'
+)
+ROOM_FIELDS = ('name', 'branch_id', 'room_type')
+BRANCH_FIELDS = ('name',)
+USER_FIELDS = ('name',)
+
+
+def _month_index(d):
+    return d.year * 12 + d.month - 1
+
+def _month_of(index):
+    """월 번호 -> (연, 월)"""
+    return index // 12, index % 12 + 1
+
+def _month_key(index):
+    year, month = _month_of(index)
+    return f'{year:04d}-{month:02d}'
+
+def month_table(first_index, last_index):
+    """[(월 번호, 연, 월, 말일), ...] (요청 범위의 달력 표)"""
+    table = []
+    for index in range(first_index, last_index + 1):
+        year, month = _month_of(index)
+        table.append((index, year, month, calendar.monthrange(year, month)[1]))
+    return table
+
+def expand_payment_dates(schedules, table):
+    """
+    결제 일정 전개
+
+    Args:
+        schedules: (key, payment_day, start_date, end_date) 목록
+        table: month_table() 결과
+    Returns:
+        (key, 결제일) 목록 (계약 기간 안의 결제일만)
+    """
+    if not table:
+        return []
+    first_index = table[0][0]
+    last_position = len(table) - 1
+    result = []
+    for key, payment_day, start_date, end_date in schedules:
+        # 계약 기간과 표가 겹치는 구간을 월 번호 산술로 바로 계산 (월 단위 반복 없음)
+        begin = max(_month_index(start_date) - first_index, 0)
+        end = min(_month_index(end_date) - first_index, last_position)
+        for _, year, month, last_day in table[begin:end + 1]:
+            payment_date = date(year, month, min(payment_day, last_day))
+            if start_date <= payment_date <= end_date:
+                result.append((key, payment_date))
+    return result
+
+
+def _rows(filters):
+    """캘린더에 필요한 컬럼만 조회 (ORM 객체/지연 로딩 없음)"""
+    return db.session.query(
+        Contract.id, Contract.price, Contract.payment_day, Contract.start_date, Contract.end_date,
+        Contract.start_time, Contract.end_time, Contract.user_id, Contract.temp_user_name,
+        User.name.label('user_name'), Room.name.label('room_name'), Branch.name.label('branch_name')
+    ).join(
+        Room, Contract.room_id == Room.id
+    ).outerjoin(
+        Branch, Room.branch_id == Branch.id
+    ).outerjoin(
+        User, Contract.user_id == User.id
+    ).filter(*filters).all()
+
+def _user_name(row):
+    # Contract.get_user_info 와 같은 규칙: 매핑된 계약은 회원 이름, 아니면 임시 이름
+    return (row.user_name if row.user_id else row.temp_user_name) or 'Unknown'
+
+
+class PaymentScheduleService:
+    _lock = threading.Lock()
+    _entries = {}      # (월 키, 유형) -> (start, end, event) 목록
+    _version = None
+
+    @staticmethod
+    def _build_time(table):
+        """시간제 예약 일정 {월 키: [(시작일, 종료일, event), ...]}"""
+        first = date(table[0][1], table[0][2], 1)
+        last = date(table[-1][1], table[-1][2], table[-1][3])
+        result = {_month_key(index): [] for index, *_ in table}
+        rows = _rows([
+            Room.room_type == 'time_based',
+            Contract.start_date >= first,
+            Contract.start_date <= last
+        ])
+        for row in rows:
+            branch_name = row.branch_name or 'Unknown'
+            user_name = _user_name(row)
+            result[_month_key(_month_index(row.start_date))].append((row.start_date, row.end_date, {
+                'title': f'[{branch_name}] {user_name} ({row.start_time}~{row.end_time})',
+                'start': f'{row.start_date}T{row.start_time}',
+                'end': f'{row.end_date}T{row.end_time}',
+                'color': '#3b82f6', # Blue for time-based
+                'extendedProps': {
+                    'contract_id': row.id,
+                    'amount': row.price,
+                    'type': 'time',
+                    'room_name': row.room_name,
+                    'branch_name': branch_name
+                }
+            }))
+        return result
+
+    @staticmethod
+    def _build_monthly(table):
+        """월세 결제일 일정 {월 키: [(결제일, 결제일, event), ...]}"""
+        first = date(table[0][1], table[0][2], 1)
+        last = date(table[-1][1], table[-1][2], table[-1][3])
+        result = {_month_key(index): [] for index, *_ in table}
+        rows = _rows([
+            Room.room_type != 'time_based',
+            Contract.status == 'active',
+            Contract.payment_day.isnot(None),
+            Contract.start_date <= last,
+            Contract.end_date >= first
+        ])
+        by_id = {row.id: row for row in rows}
+        schedules = [(row.id, row.payment_day, row.start_date, row.end_date) for row in rows if row.payment_day]
+
+        for contract_id, payment_date in expand_payment_dates(schedules, table):
+            row = by_id[contract_id]
+            branch_name = row.branch_name or 'Unknown'
+            result[_month_key(_month_index(payment_date))].append((payment_date, payment_date, {
+                'title': f'[{branch_name}] 결제: {_user_name(row)} ({row.room_name})',
+                'start': payment_date.isoformat(),
+                'allDay': True,
+                'color': '#10b981', # Green for monthly payment
+                'extendedProps': {
+                    'contract_id': row.id,
+                    'amount': row.price,
+                    'type': 'monthly',
+                    'room_name': row.room_name,
+                    'branch_name': branch_name
+                }
+            }))
+        return result
+
+    @classmethod
+    def _month_entries(cls, first_index, last_index, event_type):
+        """월별 캐시 항목 (캐시에 없는 월만 한 번의 조회로 생성)"""
+        version = get_cache_version(CALENDAR_CACHE_KEY)
+        with cls._lock:
+            if cls._version != version:
+                cls._entries = {}
+                cls._version = version
+            entries = cls._entries
+
+        keys = [_month_key(index) for index in range(first_index, last_index + 1)]
+        missing = [index for index, key in zip(range(first_index, last_index + 1), keys)
+                   if (key, event_type) not in entries]
+        if missing:
+            builder = cls._build_time if event_type == 'time' else cls._build_monthly
+            built = builder(month_table(min(missing), max(missing)))
+            with cls._lock:
+                for key, items in built.items():
+                    entries[(key, event_type)] = items
+        return [entries[(key, event_type)] for key in keys]
+
+    @classmethod
+    def events(cls, start_date, end_date, event_type='all'):
+        """
+        [start_date, end_date] 범위의 캘린더 일정 (FullCalendar 이벤트 dict 목록)
+
+        Args:
+            event_type: 'all', 'time', 'monthly'
+        """
+        if end_date < start_date:
+            return []
+        types = EVENT_TYPES if event_type == 'all' else (event_type,)
+        events = []
+        for kind in types:
+            for items in cls._month_entries(_month_index(start_date), _month_index(end_date), kind):
+                events.extend(
+                    item for item_start, item_end, item in items
+                    if item_start >= start_date and item_end <= end_date
+                )
+        return events
+
+
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+def _is_calendar_change(obj, deleted=False):
+    watched = {Contract: CONTRACT_FIELDS, Room: ROOM_FIELDS, Branch: BRANCH_FIELDS, User: USER_FIELDS}
+    fields = watched.get(type(obj))
+    if fields is None:
+        return False
+    if deleted or inspect(obj).pending:
+        return isinstance(obj, (Contract, Room, Branch))
+    return _changed(obj, fields)
+
+def _before_flush(session, flush_context, instances):
+    if session.info.get('calendar_invalidated'):
+        return
+    changed = (
+        any(_is_calendar_change(obj) for obj in session.new) or
+        any(_is_calendar_change(obj) for obj in session.dirty if session.is_modified(obj)) or
+        any(_is_calendar_change(obj, deleted=True) for obj in session.deleted)
+    )
+    if changed:
+        bump_cache_version_after_commit(CALENDAR_CACHE_KEY, session=session)
+        # 같은 트랜잭션에서 여러 번 flush되어도 한 번만 버전 증가
+        session.info['calendar_invalidated'] = True
+
+def _reset_flag(session, *args):
+    session.info.pop('calendar_invalidated', None)
+
+def register_calendar_invalidation():
+    """flush 시 캘린더 일정 변경을 감지하는 세션 이벤트 등록"""
+    if not event.contains(db.session, 'before_flush', _before_flush):
+        event.listen(db.session, 'before_flush', _before_flush)
+        event.listen(db.session, 'after_commit', _reset_flag)
+        event.listen(db.session, 'after_rollback', _reset_flag)
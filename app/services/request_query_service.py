@@ -0,0 +1,58 @@
+"""
+관리자 요청 큐 조회 서비스: 쿼리 파라미터 -> 필터가 적용된 Request 쿼리
+
+requests.branch_id/room_id 는 생성 시점에 저장되므로 계약/방 조인 없이 필터링하며,
+(type|status|branch_id, created_at) 복합 인덱스를 사용합니다.
+"""
+from datetime import datetime, time
+from app.models.request import Request
+from app.utils.pagination import int_arg, date_arg, csv_arg
+
+class RequestQueryService:
+    @staticmethod
+    def filtered_query(args):
+        """
+        쿼리 파라미터로 필터링한 Request 쿼리 반환
+
+        지원 파라미터:
+            type: 요청 유형 (쉼표로 여러 개, 예: repair,supplies)
+            exclude_type: 제외할 요청 유형 (쉼표로 여러 개)
+            status: 상태 (쉼표로 여러 개)
+            branch_id: 지점 ID
+            user_id: 회원 ID
+            date_from, date_to: 접수일(created_at) 범위 (YYYY-MM-DD, 양끝 포함)
+
+        Raises:
+            ValueError: 잘못된 파라미터 값
+        """
+        query = Request.query
+
+        types = csv_arg(args, 'type')
+        if types:
+            query = query.filter(Request.type.in_(types))
+        excluded = csv_arg(args, 'exclude_type')
+        if excluded:
+            query = query.filter(Request.type.notin_(excluded))
+
+        statuses = csv_arg(args, 'status')
+        if statuses:
+            query = query.filter(Request.status.in_(statuses))
+
+        branch_id = int_arg(args, 'branch_id')
+        if branch_id is not None:
+            query = query.filter(Request.branch_id == branch_id)
+
+        user_id = int_arg(args, 'user_id')
+        if user_id is not None:
+            query = query.filter(Request.user_id == user_id)
+
+        date_from = date_arg(args, 'date_from')
+        date_to = date_arg(args, 'date_to')
+        if date_from and date_to and date_from > date_to:
+            raise ValueError('date_from must be before date_to')
+        if date_from:
+            query = query.filter(Request.created_at >= datetime.combine(date_from, time.min))
+        if date_to:
+            query = query.filter(Request.created_at <= datetime.combine(date_to, time.max))
+
+        return query
@@ -0,0 +1,160 @@
+"""
+예약 작업 리더 선출 (DB 임대)
+
+gunicorn 워커마다 스케줄러가 떠 있어도 scheduler_leases 의 임대를 가진 프로세스 하나만 작업을 실행합니다.
+    - 모든 프로세스가 LEASE_RENEW_SECONDS 마다 heartbeat(): 내 임대면 연장, 만료된 임대면 가져감
+      (조건부 UPDATE 한 문장이라 동시에 가져가려 해도 한 곳만 성공)
+    - 리더가 죽으면 LEASE_TTL_SECONDS 안에 다른 프로세스가 이어받음
+    - 하루 한 번 실행되는 작업(wait=True)은 리더가 아니면 임대가 만료되는지 잠시 지켜보다가,
+      리더가 살아 있으면(계속 연장되면) 건너뛰고 만료되면 가져가서 대신 실행 (리더 교체 순간에 누락 방지)
+
+웹 워커에서 스케줄러를 끄고(SCHEDULER_AUTOSTART=false) 전용 프로세스로 돌리려면 `flask scheduler`
+"""
+import atexit
+import functools
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+import click
+from sqlalchemy import or_
+from app.extensions import db, scheduler
+from app.models.scheduler_lease import SchedulerLease
+from app.utils.bulk_insert import insert_ignore
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'scheduler'
+LEASE_TTL_SECONDS = 30
+LEASE_RENEW_SECONDS = 10
+
+
+class SchedulerLeaseService:
+    _holder = None
+    _holder_pid = None
+    _valid_until = 0.0  # 이 프로세스가 리더로 행동할 수 있는 시각 (monotonic)
+
+    @classmethod
+    def holder_id(cls):
+        """프로세스 식별자 (fork 된 워커가 부모의 값을 물려받지 않도록 PID가 바뀌면 새로 만듦)"""
+        if cls._holder_pid != os.getpid():
+            cls._holder = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+            cls._holder_pid = os.getpid()
+            cls._valid_until = 0.0
+        return cls._holder
+
+    @classmethod
+    def try_acquire(cls, name=LEASE_NAME, ttl=LEASE_TTL_SECONDS):
+        """임대 연장 또는 (만료되었으면) 획득 후 커밋. Returns: 리더 여부"""
+        holder = cls.holder_id()
+        started = time.monotonic()
+        now = datetime.utcnow()
+        values = {'holder': holder, 'expires_at': now + timedelta(seconds=ttl), 'renewed_at': now}
+        table = SchedulerLease.__table__
+
+        result = db.session.execute(table.update().where(
+            table.c.name == name,
+            or_(table.c.holder == holder, table.c.expires_at < now)
+        ).values(values))
+        if result.rowcount:
+            acquired = True
+        else:
+            # 첫 실행: 행이 없으면 만들고, 다른 프로세스가 먼저 만들었으면 무시됨
+            insert_ignore(SchedulerLease, [{'name': name, **values}], 'name')
+            acquired = db.session.query(SchedulerLease.holder).filter_by(name=name).scalar() == holder
+        db.session.commit()
+
+        was_leader = cls.is_leader()
+        # 연장 주기 하나만큼 여유를 두고 만료 전에 스스로 리더에서 내려옴
+        cls._valid_until = started + ttl - LEASE_RENEW_SECONDS if acquired else 0.0
+        if acquired != was_leader:
+            logger.info(f"Scheduler leadership {'acquired' if acquired else 'lost'}: {holder}")
+        return acquired
+
+    @classmethod
+    def is_leader(cls):
+        cls.holder_id()
+        return time.monotonic() < cls._valid_until
+
+    @classmethod
+    def heartbeat(cls, app):
+        with app.app_context():
+            try:
+                return cls.try_acquire()
+            except Exception as e:
+                db.session.rollback()
+                cls._valid_until = 0.0
+                logger.error(f"Scheduler lease heartbeat failed: {e}")
+                return False
+            finally:
+                db.session.remove()
+
+    @classmethod
+    def ensure_leader(cls, app, wait=False):
+        """
+        작업 실행 직전 리더 확인
+
+        wait=True 이면 다른 프로세스의 임대가 만료될 때까지(최대 TTL + 연장 주기) 기다렸다가 가져갑니다.
+        """
+        if cls.is_leader():
+            return True
+        deadline = time.monotonic() + (LEASE_TTL_SECONDS + LEASE_RENEW_SECONDS if wait else 0)
+        while True:
+            if cls.heartbeat(app):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LEASE_RENEW_SECONDS / 2)
+
+    @classmethod
+    def release(cls, app):
+        """종료 시 임대 반납 (다른 프로세스가 TTL 을 기다리지 않고 바로 이어받도록)"""
+        if not cls.is_leader():
+            return
+        cls._valid_until = 0.0
+        with app.app_context():
+            try:
+                db.session.query(SchedulerLease).filter_by(name=LEASE_NAME, holder=cls.holder_id()).update(
+                    {'expires_at': datetime.utcnow()}, synchronize_session=False
+                )
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Scheduler lease release failed: {e}")
+
+
+def leader_only(app, wait=False):
+    """예약 작업 데코레이터: 리더 프로세스에서만 실행"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not SchedulerLeaseService.ensure_leader(app, wait=wait):
+                return None
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_scheduler_lease(app):
+    """임대 연장 작업 등록 (모든 프로세스에서 실행, 시작 즉시 한 번)"""
+    @scheduler.task('interval', id='scheduler_lease', seconds=LEASE_RENEW_SECONDS,
+                    next_run_time=datetime.now(), max_instances=1, coalesce=True)
+    def scheduled_lease_heartbeat():
+        SchedulerLeaseService.heartbeat(app)
+
+    atexit.register(SchedulerLeaseService.release, app)
+
+
+@click.command('scheduler')
+def scheduler_command():
+    """Run the scheduled jobs in this process (use with SCHEDULER_AUTOSTART=false on web workers)."""
+    if not scheduler.running:
+        scheduler.start()
+    click.echo(f'Scheduler running as {SchedulerLeaseService.holder_id()} (leader-elected, Ctrl+C to stop)')
+    try:
+        while True:
+            time.sleep(60)
+    except (KeyboardInterrupt, SystemExit):
+        scheduler.shutdown()
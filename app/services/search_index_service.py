@@ -0,0 +1,306 @@
+"""
+계약 검색 색인 서비스
+
+계약마다 세입자 이름(1·2-gram, 초성 1·2-gram), 전화번호(숫자 1~4-gram),
+방/지점 이름(1·2-gram)을 contract_search_tokens 에 저장합니다. (1-gram 은 '김' 같은 한 글자 검색어용)
+검색은 검색어에서 만든 토큰을 모두 가진 계약을 (token, field) 인덱스로 찾은 뒤,
+후보 전체를 청크 단위로 원문과 비교해 점수순으로 정렬합니다. (후보를 잘라내지 않음)
+
+계약/회원/방/지점의 관련 필드가 바뀌면 flush 직전에 대상을 모아 두었다가
+커밋 직전 훅(app.utils.commit_hooks)에서 해당 계약의 토큰만 다시 만듭니다.
+색인은 검색 요청 중에는 만들지 않습니다. 테이블을 만든 뒤(마이그레이션/create_all)나
+색인 규칙이 바뀐 뒤에는 `flask search-index rebuild` 로 전체를 생성합니다.
+"""
+import heapq
+import logging
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, func, inspect, or_, select
+from app.extensions import db
+from app.models.branch import Branch, Room
+from app.models.contract import Contract
+from app.models.search_token import ContractSearchToken
+from app.models.user import User
+from app.utils import hangul
+from app.utils.commit_hooks import register_before_commit_hook
+
+logger = logging.getLogger(__name__)
+
+TEXT_GRAM = 2            # 이름/방/지점 n-gram 길이
+TEXT_SHORT_GRAMS = (1,)  # TEXT_GRAM 보다 짧은 검색어용 n-gram (한 글자 검색어가 다른 검색어와 함께 쓰여도 찾음)
+PHONE_GRAM = 4           # 전화번호 n-gram 길이
+PHONE_SHORT_GRAMS = (1, 2, 3)   # PHONE_GRAM 보다 짧은 숫자 검색용 n-gram (번호 어디에 있어도 찾음)
+MIN_QUERY_LENGTH = 2
+REINDEX_CHUNK_SIZE = 500
+VERIFY_CHUNK_SIZE = 500  # 후보를 원문과 비교할 때 한 번에 조회하는 계약 수
+
+# 색인에 영향을 주는 필드
+CONTRACT_FIELDS = ('user_id', 'temp_user_name', 'temp_user_phone', 'room_id')
+USER_FIELDS = ('name', 'phone')
+ROOM_FIELDS = ('name', 'branch_id')
+BRANCH_FIELDS = ('name',)
+
+# 검색어 하나가 각 필드와 맞을 때 점수 (완전 일치, 앞부분 일치, 부분 일치)
+FIELD_SCORES = {
+    'name': (100, 80, 60),
+    'chosung': (70, 50, 40),
+    'phone': (90, 0, 50),
+    'room': (30, 20, 15),
+    'branch': (30, 20, 15),
+}
+PHONE_TAIL_SCORE = 75
+ACTIVE_BONUS = 5
+
+
+def _documents(contract_ids):
+    """{contract_id: {'names': [...], 'phones': [...], 'room': str, 'branch': str, 'status': str}}"""
+    rows = db.session.query(
+        Contract.id, Contract.status, Contract.temp_user_name, Contract.temp_user_phone,
+        User.name, User.phone, Room.name, Branch.name
+    ).outerjoin(
+        User, Contract.user_id == User.id
+    ).outerjoin(
+        Room, Contract.room_id == Room.id
+    ).outerjoin(
+        Branch, Room.branch_id == Branch.id
+    ).filter(Contract.id.in_(contract_ids)).all()
+
+    documents = {}
+    for contract_id, status, temp_name, temp_phone, user_name, user_phone, room_name, branch_name in rows:
+        documents[contract_id] = {
+            'names': [n for n in dict.fromkeys((user_name, temp_name)) if n],
+            'phones': [p for p in dict.fromkeys((user_phone, temp_phone)) if p],
+            'room': room_name or '',
+            'branch': branch_name or '',
+            'status': status,
+        }
+    return documents
+
+
+def _text_tokens(field, text):
+    return {(field, t) for n in (*TEXT_SHORT_GRAMS, TEXT_GRAM) for t in hangul.ngrams(text, n)}
+
+def _tokens(document):
+    """계약 문서 -> {(field, token)}"""
+    tokens = set()
+    for name in document['names']:
+        tokens.update(_text_tokens('name', hangul.normalize(name)))
+        tokens.update(_text_tokens('chosung', hangul.to_chosung(name)))
+    for phone in document['phones']:
+        number = hangul.digits(phone)
+        for n in (*PHONE_SHORT_GRAMS, PHONE_GRAM):
+            tokens.update(('phone', t) for t in hangul.ngrams(number, n))
+    tokens.update(_text_tokens('room', hangul.normalize(document['room'])))
+    tokens.update(_text_tokens('branch', hangul.normalize(document['branch'])))
+    return tokens
+
+
+def _term_queries(term):
+    """
+    검색어 하나 -> [(fields, tokens)] (어느 하나라도 모든 토큰을 가진 계약이 후보)
+
+    TEXT_GRAM 보다 짧은 검색어는 ngrams 가 검색어 자체를 돌려주므로 TEXT_SHORT_GRAMS 색인과 맞춰집니다.
+    """
+    queries = []
+    text = hangul.normalize(term)
+    number = hangul.digits(term)
+
+    if hangul.has_chosung(text):
+        queries.append((('chosung',), hangul.ngrams(hangul.to_chosung(text), TEXT_GRAM)))
+    else:
+        queries.append((('name', 'room', 'branch'), hangul.ngrams(text, TEXT_GRAM)))
+    if number and number == text.replace('-', ''):
+        if len(number) >= PHONE_GRAM:
+            queries.append((('phone',), hangul.ngrams(number, PHONE_GRAM)))
+        elif len(number) in PHONE_SHORT_GRAMS:
+            queries.append((('phone',), {number}))
+    return queries
+
+
+def _score(term, document):
+    """검색어 하나에 대한 문서 점수 (맞지 않으면 0)"""
+    text = hangul.normalize(term)
+    number = hangul.digits(term)
+    candidates = []
+    if hangul.has_chosung(text):
+        query = hangul.to_chosung(text)
+        candidates += [('chosung', hangul.to_chosung(n)) for n in document['names']]
+    else:
+        query = text
+        candidates += [('name', hangul.normalize(n)) for n in document['names']]
+        candidates += [('room', hangul.normalize(document['room'])), ('branch', hangul.normalize(document['branch']))]
+
+    best = 0
+    for field, value in candidates:
+        exact, prefix, partial = FIELD_SCORES[field]
+        if value == query:
+            best = max(best, exact)
+        elif value.startswith(query):
+            best = max(best, prefix)
+        elif query in value:
+            best = max(best, partial)
+
+    if number and number == text.replace('-', ''):
+        exact, _, partial = FIELD_SCORES['phone']
+        for phone in document['phones']:
+            phone_digits = hangul.digits(phone)
+            if phone_digits == number:
+                best = max(best, exact)
+            elif phone_digits.endswith(number):
+                best = max(best, PHONE_TAIL_SCORE)
+            elif number in phone_digits:
+                best = max(best, partial)
+    return best
+
+
+class SearchIndexService:
+    @staticmethod
+    def reindex_contracts(contract_ids):
+        """계약들의 토큰을 지우고 다시 생성 (삭제된 계약은 토큰만 삭제, 커밋은 호출자가 수행)"""
+        table = ContractSearchToken.__table__
+        contract_ids = sorted(set(contract_ids) - {None})
+        for offset in range(0, len(contract_ids), REINDEX_CHUNK_SIZE):
+            chunk = contract_ids[offset:offset + REINDEX_CHUNK_SIZE]
+            db.session.execute(table.delete().where(table.c.contract_id.in_(chunk)))
+            rows = [
+                {'contract_id': contract_id, 'field': field, 'token': token}
+                for contract_id, document in _documents(chunk).items()
+                for field, token in _tokens(document)
+            ]
+            if rows:
+                db.session.execute(table.insert(), rows)
+
+    @staticmethod
+    def rebuild_all():
+        """전체 색인 재생성 (커밋 포함)"""
+        db.session.execute(ContractSearchToken.__table__.delete())
+        contract_ids = [cid for (cid,) in db.session.query(Contract.id).order_by(Contract.id).all()]
+        SearchIndexService.reindex_contracts(contract_ids)
+        db.session.commit()
+        logger.info(f"Rebuilt contract search index for {len(contract_ids)} contracts")
+        return len(contract_ids)
+
+    @staticmethod
+    def _candidates(term):
+        """검색어 하나의 후보 계약 ID 집합"""
+        token_table = ContractSearchToken
+        result = set()
+        for fields, tokens in _term_queries(term):
+            if not tokens:
+                continue
+            query = select(token_table.contract_id).where(
+                token_table.field.in_(fields),
+                token_table.token.in_(tokens)
+            ).group_by(token_table.contract_id).having(
+                func.count(func.distinct(token_table.token)) >= len(tokens)
+            )
+            result.update(db.session.execute(query).scalars())
+        return result
+
+    @staticmethod
+    def search(q, limit=20):
+        """
+        계약 검색 (공백으로 나눈 검색어를 모두 만족하는 계약, 점수순)
+
+        Returns:
+            점수 내림차순 Contract ID 목록
+        """
+        terms = [t for t in (q or '').split() if t]
+        if len(hangul.normalize(q)) < MIN_QUERY_LENGTH or not terms:
+            return []
+
+        candidate_ids = None
+        for term in terms:
+            ids = SearchIndexService._candidates(term)
+            candidate_ids = ids if candidate_ids is None else candidate_ids & ids
+            if not candidate_ids:
+                return []
+
+        # n-gram 이 모두 있어도 원문에는 없을 수 있으므로 후보 전체를 원문과 비교
+        candidate_ids = sorted(candidate_ids)
+        ranked = []
+        for offset in range(0, len(candidate_ids), VERIFY_CHUNK_SIZE):
+            documents = _documents(candidate_ids[offset:offset + VERIFY_CHUNK_SIZE])
+            for contract_id, document in documents.items():
+                scores = [_score(term, document) for term in terms]
+                if all(scores):
+                    bonus = ACTIVE_BONUS if document['status'] == 'active' else 0
+                    ranked.append((sum(scores) + bonus, contract_id))
+        return [contract_id for _, contract_id in heapq.nlargest(limit, ranked)]
+
+
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+def _before_flush(session, flush_context, instances):
+    changes = session.info.setdefault('search_index_changes', {
+        'contract_ids': set(), 'new': [], 'user_ids': set(), 'room_ids': set(), 'branch_ids': set()
+    })
+
+    for obj in session.new:
+        if isinstance(obj, Contract):
+            # id는 flush 후에 확정되므로 커밋 직전에 확인
+            changes['new'].append(obj)
+
+    for obj in session.deleted:
+        if isinstance(obj, Contract):
+            changes['contract_ids'].add(obj.id)
+
+    for obj in session.dirty:
+        if isinstance(obj, Contract) and _changed(obj, CONTRACT_FIELDS):
+            changes['contract_ids'].add(obj.id)
+        elif isinstance(obj, User) and _changed(obj, USER_FIELDS):
+            changes['user_ids'].add(obj.id)
+        elif isinstance(obj, Room) and _changed(obj, ROOM_FIELDS):
+            changes['room_ids'].add(obj.id)
+        elif isinstance(obj, Branch) and _changed(obj, BRANCH_FIELDS):
+            changes['branch_ids'].add(obj.id)
+
+def _prepare_reindex(session):
+    """커밋 직전 훅: 모아 둔 변경으로 색인을 다시 만들 함수 (변경이 없으면 None)"""
+    changes = session.info.pop('search_index_changes', None)
+    if not changes:
+        return None
+
+    contract_ids = set(changes['contract_ids'])
+    contract_ids.update(obj.id for obj in changes['new'])
+    contract_ids.discard(None)
+    conditions = []
+    if changes['user_ids']:
+        conditions.append(Contract.user_id.in_(changes['user_ids']))
+    if changes['room_ids']:
+        conditions.append(Contract.room_id.in_(changes['room_ids']))
+    if changes['branch_ids']:
+        conditions.append(Contract.room_id.in_(
+            select(Room.id).where(Room.branch_id.in_(changes['branch_ids']))
+        ))
+    if not (contract_ids or conditions):
+        return None
+
+    def reindex():
+        if conditions:
+            contract_ids.update(cid for (cid,) in session.query(Contract.id).filter(or_(*conditions)).all())
+        contract_ids.discard(None)
+        if contract_ids:
+            SearchIndexService.reindex_contracts(contract_ids)
+    return reindex
+
+def _reset_changes(session, *args):
+    session.info.pop('search_index_changes', None)
+
+def register_search_index_listeners():
+    """계약/회원/방/지점 변경 시 검색 색인을 갱신하는 세션 이벤트 등록"""
+    if not event.contains(db.session, 'before_flush', _before_flush):
+        event.listen(db.session, 'before_flush', _before_flush)
+        event.listen(db.session, 'after_rollback', _reset_changes)
+    register_before_commit_hook('Contract search index', _prepare_reindex)
+
+
+search_index_cli = AppGroup('search-index', help='Contract search index commands.')
+
+@search_index_cli.command('rebuild')
+def rebuild_command():
+    """Rebuild the contract search index from scratch."""
+    count = SearchIndexService.rebuild_all()
+    click.echo(f'Indexed {count} contracts.')
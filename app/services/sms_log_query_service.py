@@ -0,0 +1,83 @@
+"""
+관리자 SMS 발송 이력 조회 서비스: 쿼리 파라미터 -> 필터가 적용된 SmsLog 쿼리
+
+(sent_at, id) 키셋 순서와 (type|status|contract_id, sent_at) 복합 인덱스를 사용합니다.
+본문 검색(q)은 인덱스를 쓸 수 없는 부분 일치이므로, 다른 필터/날짜 범위와 함께 쓰면
+최신순으로 읽다가 한 페이지가 차는 즉시 멈춥니다.
+"""
+from datetime import datetime, time
+from sqlalchemy import or_, select
+from app.models.branch import Room
+from app.models.contract import Contract
+from app.models.sms import SmsLog
+from app.utils.pagination import int_arg, date_arg, csv_arg, like_escape
+
+MIN_CONTENT_QUERY_LENGTH = 2
+# 발송 성공은 'SENT(Aligo)', 'SENT(Stub)' 처럼 Provider 이름이 붙어 저장되므로 앞부분 일치로 찾음
+PREFIX_STATUSES = ('SENT',)
+
+class SmsLogQueryService:
+    @staticmethod
+    def filtered_query(args):
+        """
+        쿼리 파라미터로 필터링한 SmsLog 쿼리 반환
+
+        지원 파라미터:
+            type: 메시지 유형 (쉼표로 여러 개, 예: PAYMENT_REMINDER,MANUAL)
+            status: 발송 상태 (쉼표로 여러 개, SENT, FAILED, SKIPPED, PENDING)
+                    SENT 는 모든 Provider 의 성공(SENT(...))과 일치, 'SENT(Aligo)' 처럼 주면 정확히 일치
+            contract_id: 계약 ID
+            branch_id: 계약 방의 지점 ID
+            date_from, date_to: 발송일(sent_at) 범위 (YYYY-MM-DD, 양끝 포함)
+            dedup_prefix: 중복 방지 키 앞부분 (예: 'PAYMENT_REMINDER_12_')
+            q: 발송 본문 부분 검색 (2자 이상)
+
+        Raises:
+            ValueError: 잘못된 파라미터 값
+        """
+        query = SmsLog.query
+
+        types = csv_arg(args, 'type')
+        if types:
+            query = query.filter(SmsLog.type.in_(types))
+
+        statuses = csv_arg(args, 'status')
+        if statuses:
+            prefixes = [status for status in statuses if status in PREFIX_STATUSES]
+            exact = [status for status in statuses if status not in PREFIX_STATUSES]
+            conditions = [SmsLog.status.like(like_escape(prefix) + '%', escape='\\') for prefix in prefixes]
+            if exact:
+                conditions.append(SmsLog.status.in_(exact))
+            query = query.filter(or_(*conditions))
+
+        contract_id = int_arg(args, 'contract_id')
+        if contract_id is not None:
+            query = query.filter(SmsLog.contract_id == contract_id)
+
+        branch_id = int_arg(args, 'branch_id')
+        if branch_id is not None:
+            query = query.filter(SmsLog.contract_id.in_(
+                select(Contract.id).join(Room, Contract.room_id == Room.id).where(Room.branch_id == branch_id)
+            ))
+
+        date_from = date_arg(args, 'date_from')
+        date_to = date_arg(args, 'date_to')
+        if date_from and date_to and date_from > date_to:
+            raise ValueError('date_from must be before date_to')
+        if date_from:
+            query = query.filter(SmsLog.sent_at >= datetime.combine(date_from, time.min))
+        if date_to:
+            query = query.filter(SmsLog.sent_at <= datetime.combine(date_to, time.max))
+
+        # dedup_key 유니크 인덱스로 앞부분 일치 범위 조회
+        dedup_prefix = (args.get('dedup_prefix') or '').strip()
+        if dedup_prefix:
+            query = query.filter(SmsLog.dedup_key.like(like_escape(dedup_prefix) + '%', escape='\\'))
+
+        q = (args.get('q') or '').strip()
+        if q:
+            if len(q) < MIN_CONTENT_QUERY_LENGTH:
+                raise ValueError(f'q must be at least {MIN_CONTENT_QUERY_LENGTH} characters')
+            query = query.filter(SmsLog.content_snapshot.like('%' + like_escape(q) + '%', escape='\\'))
+
+        return query
@@ -0,0 +1,168 @@
+"""
+SMS 발송 대기열(outbox) 서비스
+
+API 요청은 업무 변경과 같은 트랜잭션에 SmsOutbox 행만 기록하고(enqueue), 실제 발송은
+스케줄러의 디스패처(dispatch)가 몇 초 간격으로 처리합니다. 문자 Provider가 느리거나
+실패해도 API 응답 시간과 업무 트랜잭션에는 영향이 없습니다.
+
+디스패처 규칙
+    - 발송할 행을 SENDING 으로 표시하고 커밋한 뒤 발송 (MySQL은 SKIP LOCKED 로 워커 간 중복 선점 방지)
+    - SENDING 상태로 STALE_CLAIM_SECONDS 가 지난 행은 중단된 것으로 보고 다시 가져감
+    - 발송 전 가져온 행 전체의 dedup_key 를 sms_logs 와 한 번에 비교해 이미 보낸 문자는 SKIPPED 처리
+      (재시도/재선점 시 중복 발송 방지)
+    - 발송 직전 PENDING 로그를 예약(SmsLogWriter.reserve)하고 이 디스패처가 예약한 경우에만 발송
+      (같은 키를 동시에 보내는 send_sms/일괄 작업과 겹치면 SKIPPED, 재시도할 실패는 예약을 지움)
+    - 실패하면 RETRY_BASE_SECONDS * 2^(시도 횟수 - 1) 뒤에 재시도, MAX_ATTEMPTS 회 실패하면 FAILED 로그 기록
+    - Provider 서킷이 열려 있으면(CircuitOpenError) 시도 횟수를 올리지 않고 남은 행을 모두 되돌려 둠
+"""
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from app.extensions import db
+from app.models.sms_outbox import SmsOutbox
+from app.utils.sms_log_writer import SmsLogWriter
+from app.utils.sms_transport import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_INTERVAL_SECONDS = 5
+DISPATCH_BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+STALE_CLAIM_SECONDS = 300
+
+
+def retry_delay(attempts):
+    """attempts 번째 실패 후 다음 시도까지의 대기 시간"""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+class SmsOutboxService:
+    @staticmethod
+    def enqueue(contract, msg_type, to_number=None, related_date=None, **context_kwargs):
+        """
+        계약 기준 문자를 대기열에 적재 (커밋은 호출자가 수행)
+
+        컨텍스트 생성/렌더링 오류가 업무 변경을 막지 않도록 SAVEPOINT 안에서 처리하고,
+        실패하면 대기열 기록만 되돌린 뒤 로그를 남깁니다.
+        Returns:
+            (성공 여부, 메시지)
+        """
+        from app.utils.sms_service import sms_service
+        from app.utils.sms_context import build_sms_context
+        try:
+            with db.session.begin_nested():
+                context = build_sms_context(contract, msg_type, **context_kwargs)
+                return sms_service.enqueue(
+                    contract.id, msg_type, context, related_date=related_date, to_number=to_number
+                )
+        except Exception as e:
+            logger.exception(f"SMS enqueue error ({msg_type})")
+            return False, str(e)
+
+    @staticmethod
+    def _claim(batch_size, now):
+        """발송할 행을 SENDING 으로 표시하고 커밋 (다른 워커/다음 주기와 겹치지 않도록)"""
+        stale_before = now - timedelta(seconds=STALE_CLAIM_SECONDS)
+        rows = SmsOutbox.query.filter(or_(
+            and_(SmsOutbox.status == 'PENDING', SmsOutbox.next_attempt_at <= now),
+            and_(SmsOutbox.status == 'SENDING', SmsOutbox.claimed_at < stale_before)
+        )).order_by(SmsOutbox.next_attempt_at, SmsOutbox.id).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        for row in rows:
+            row.status = 'SENDING'
+            row.claimed_at = now
+        db.session.commit()
+        return rows
+
+    @staticmethod
+    def _log_row(row):
+        """대기열 행의 PENDING 로그 행 (SmsService._log_row 형식)"""
+        from app.utils.sms_service import sms_service
+        return sms_service._log_row(
+            contract_id=row.contract_id,
+            msg_type=row.msg_type,
+            dedup_key=row.dedup_key,
+            related_date=row.related_date,
+            content=row.content,
+            context=row.context_snapshot,
+            status='PENDING'
+        )
+
+    @staticmethod
+    def _send(row, unsent):
+        from app.utils.sms_service import sms_service
+
+        # 발송 전에 PENDING 로그 예약 (이미 기록되었거나 다른 발송자가 먼저 예약했으면 건너뜀)
+        writer = SmsLogWriter()
+        if row.dedup_key not in unsent or row.dedup_key not in writer.reserve([SmsOutboxService._log_row(row)]):
+            row.status = 'SKIPPED'
+            db.session.commit()
+            return 'SKIPPED'
+        unsent.discard(row.dedup_key)  # 같은 배치에 같은 키가 또 있으면 건너뛰도록
+
+        try:
+            provider_name, provider_msg_id = sms_service.deliver(row.to_number, row.content)
+        except CircuitOpenError:
+            writer.release(row.dedup_key)
+            writer.flush()  # 커밋은 dispatch 가 남은 행을 되돌리며 수행
+            raise
+        except Exception as e:
+            logger.warning(f"SMS outbox send failed ({row.dedup_key}, attempt {row.attempts + 1}): {e}")
+            row.attempts += 1
+            row.last_error = str(e)
+            if row.attempts >= MAX_ATTEMPTS:
+                row.status = 'FAILED'
+                writer.resolve(row.dedup_key, status='FAILED', error_message=str(e))
+            else:
+                row.status = 'PENDING'
+                row.next_attempt_at = datetime.utcnow() + retry_delay(row.attempts)
+                writer.release(row.dedup_key)  # 다음 시도에서 다시 예약
+            writer.checkpoint()
+            return row.status
+
+        row.status = 'SENT'
+        row.attempts += 1
+        row.sent_at = datetime.utcnow()
+        writer.resolve(
+            row.dedup_key, status=f"SENT({provider_name})", provider_info=provider_name, provider_message_id=provider_msg_id
+        )
+        writer.checkpoint()
+        return 'SENT'
+
+    @staticmethod
+    def dispatch(batch_size=DISPATCH_BATCH_SIZE):
+        """
+        발송 시각이 된 대기열을 처리
+
+        Returns:
+            {상태: 건수}
+        """
+        from app.utils.sms_service import sms_service
+
+        rows = SmsOutboxService._claim(batch_size, datetime.utcnow())
+        unsent = set(sms_service.filter_unsent(row.dedup_key for row in rows)) if rows else set()
+        counts = {}
+        for position, row in enumerate(rows):
+            try:
+                status = SmsOutboxService._send(row, unsent)
+            except CircuitOpenError as e:
+                # Provider 장애: 이번 행과 남은 행을 서킷이 다시 닫힐 즈음으로 미룸
+                retry_at = datetime.utcnow() + timedelta(seconds=e.retry_after)
+                remaining = rows[position:]
+                for pending in remaining:
+                    pending.status = 'PENDING'
+                    pending.claimed_at = None
+                    pending.next_attempt_at = retry_at
+                    pending.last_error = str(e)
+                db.session.commit()
+                counts['DEFERRED'] = len(remaining)
+                break
+            except Exception:
+                # DB 오류 등: SENDING 으로 남은 행은 STALE_CLAIM_SECONDS 뒤 다시 가져감
+                db.session.rollback()
+                logger.exception(f"SMS outbox dispatch error ({row.dedup_key})")
+                status = 'ERROR'
+            counts[status] = counts.get(status, 0) + 1
+        return counts
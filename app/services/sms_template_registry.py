@@ -0,0 +1,68 @@
+"""
+SMS 템플릿 레지스트리: 유형 -> 템플릿 (워커 메모리)
+
+템플릿은 수십 건뿐이므로 전체를 한 번에 적재해 두고, 발송할 때마다 조회하지 않습니다.
+관리자가 템플릿을 수정하면 'sms_templates' 캐시 버전이 올라가고, 각 워커는
+TEMPLATE_REGISTRY_TTL 주기로 버전만 확인해 바뀌었을 때 다시 적재합니다.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+from app.extensions import db
+from app.models.sms import SmsTemplate
+from app.utils.cache_version import get_cache_version, bump_cache_version
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_CACHE_KEY = 'sms_templates'
+TEMPLATE_REGISTRY_TTL = 5  # 버전 확인 주기 (초)
+
+# 세션과 무관한 읽기 전용 스냅샷 (SmsTemplate 과 같은 속성 이름)
+TemplateSnapshot = namedtuple(
+    'TemplateSnapshot', ('id', 'type', 'title', 'content', 'is_active', 'schedule_offset', 'updated_at')
+)
+
+class SmsTemplateRegistry:
+    _lock = threading.Lock()
+    _templates = {}   # type -> TemplateSnapshot
+    _version = None
+    _checked_at = 0.0
+
+    @classmethod
+    def load(cls):
+        """DB의 전체 템플릿을 메모리에 적재"""
+        version = get_cache_version(TEMPLATE_CACHE_KEY)
+        rows = db.session.query(
+            SmsTemplate.id, SmsTemplate.type, SmsTemplate.title, SmsTemplate.content,
+            SmsTemplate.is_active, SmsTemplate.schedule_offset, SmsTemplate.updated_at
+        ).all()
+        templates = {row.type: TemplateSnapshot(*row) for row in rows}
+
+        with cls._lock:
+            cls._templates = templates
+            cls._version = version
+            cls._checked_at = time.monotonic()
+        logger.info(f"Loaded {len(templates)} SMS templates (version {version})")
+
+    @classmethod
+    def _ensure_fresh(cls):
+        if cls._version is not None and time.monotonic() - cls._checked_at < TEMPLATE_REGISTRY_TTL:
+            return
+        if cls._version is None or get_cache_version(TEMPLATE_CACHE_KEY) != cls._version:
+            cls.load()
+        else:
+            cls._checked_at = time.monotonic()
+
+    @classmethod
+    def get(cls, msg_type):
+        """활성 템플릿 스냅샷 (없거나 비활성이면 None)"""
+        cls._ensure_fresh()
+        template = cls._templates.get(msg_type)
+        return template if template and template.is_active else None
+
+    @classmethod
+    def invalidate(cls):
+        """템플릿 변경 후 호출: 다른 워커에 알리고 (커밋 후) 로컬 레지스트리는 다음 조회 시 재적재"""
+        bump_cache_version(TEMPLATE_CACHE_KEY)
+        cls._version = None
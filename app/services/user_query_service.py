@@ -0,0 +1,51 @@
+"""
+관리자 회원 목록 조회 서비스: 쿼리 파라미터 -> 필터가 적용된 User 쿼리
+"""
+import re
+from sqlalchemy import func, or_
+from app.models.branch import Room
+from app.models.contract import Contract
+from app.models.user import User
+from app.utils.pagination import int_arg
+
+MIN_PHONE_DIGITS = 3  # 숫자만으로 검색할 때 하이픈 없는 전화번호 비교를 시작하는 길이
+
+class UserQueryService:
+    @staticmethod
+    def filtered_query(args):
+        """
+        쿼리 파라미터로 필터링한 User 쿼리 반환
+
+        지원 파라미터:
+            q: 이름/이메일/전화번호 부분 검색 (숫자만 입력하면 하이픈을 무시하고 전화번호 비교)
+            role: user, admin
+            branch_id: 해당 지점에 활성 계약이 있는 회원
+
+        Raises:
+            ValueError: 잘못된 파라미터 값
+        """
+        query = User.query
+
+        q = (args.get('q') or '').strip()
+        if q:
+            pattern = f'%{q}%'
+            conditions = [User.name.like(pattern), User.email.like(pattern), User.phone.like(pattern)]
+            digits = re.sub(r'\D', '', q)
+            if len(digits) >= MIN_PHONE_DIGITS and digits == q.replace('-', '').replace(' ', ''):
+                conditions.append(func.replace(User.phone, '-', '').like(f'%{digits}%'))
+            query = query.filter(or_(*conditions))
+
+        role = args.get('role')
+        if role:
+            query = query.filter(User.role == role)
+
+        branch_id = int_arg(args, 'branch_id')
+        if branch_id is not None:
+            active_in_branch = Contract.query.join(Room, Contract.room_id == Room.id).filter(
+                Contract.user_id == User.id,
+                Contract.status == 'active',
+                Room.branch_id == branch_id
+            ).exists()
+            query = query.filter(active_in_branch)
+
+        return query
@@ -601,7 +601,7 @@ function registerBranchesPage() {
                         this.branchRooms = data.rooms || [];
                         this.roomsByFloor = data.rooms_by_floor || {};
                         this.floorPlans = data.floor_plans || {};
-                        this.currentBranch = { ...branch, floors: data.floors || [] };
+                        this.currentBranch = { ...branch, floors: data.floors || [], layout_versions: data.layout_versions || {} };
                         this.selectedFloor = (data.floors && data.floors.length > 0) ? data.floors[0] : '1F';
                     }
                 } catch (error) {
@@ -887,12 +887,23 @@ function registerBranchesPage() {
                                 'Content-Type': 'application/json',
                                 Authorization: 'Bearer ' + token
                             },
-                            body: JSON.stringify({ positions })
+                            body: JSON.stringify({
+                                positions,
+                                version: this.currentBranch.layout_versions?.[this.selectedFloor]
+                            })
                         }
                     )
 
                     if (response.ok) {
+                        const data = await response.json()
+                        this.currentBranch.layout_versions = {
+                            ...(this.currentBranch.layout_versions || {}),
+                            [this.selectedFloor]: data.version
+                        }
                         window.showAlert?.('성공', '방 위치가 저장되었습니다.', 'success');
+                    } else if (response.status === 409) {
+                        const data = await response.json()
+                        window.showAlert?.('저장 실패', data.error, 'error')
                     } else {
                         window.showAlert?.('저장 실패', '저장에 실패했습니다.', 'error')
                     }
@@ -2,6 +2,9 @@ document.addEventListener('alpine:init', () => {
     Alpine.data('smsTab', () => ({
         templates: [],
         logs: [],
+        logsCursor: null,
+        loadingLogs: false,
+        logFilters: { q: '', status: '', type: '' },
         loading: false,
         activeSmsSubTab: 'templates', // 'templates' or 'logs'
 
@@ -70,14 +73,30 @@ document.addEventListener('alpine:init', () => {
             }
         },
 
-        async loadLogs() {
+        async loadLogs(append = false) {
+            if (this.loadingLogs) return;
+            const params = new URLSearchParams({ limit: 50 });
+            Object.entries(this.logFilters).forEach(([key, value]) => {
+                if (value && value.trim()) params.set(key, value.trim());
+            });
+            if (append && this.logsCursor) params.set('cursor', this.logsCursor);
+
+            this.loadingLogs = true;
             try {
-                const response = await fetch('/admin/api/sms/logs', {
+                const response = await fetch(`/admin/api/sms/logs?${params}`, {
                     headers: { 'Authorization': 'Bearer ' + localStorage.getItem('token') }
                 });
-                this.logs = await response.json();
+                const data = await response.json();
+                if (!response.ok) {
+                    window.showAlert?.('조회 실패', data.error || '발송 내역을 불러오지 못했습니다.', 'error');
+                    return;
+                }
+                this.logs = append ? [...this.logs, ...data.items] : data.items;
+                this.logsCursor = data.next_cursor;
             } catch (error) {
                 console.error('Error loading SMS logs:', error);
+            } finally {
+                this.loadingLogs = false;
             }
         },
 
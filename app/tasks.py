@@ -75,14 +75,59 @@ def terminate_expired_contracts(app):
             print(f"[{get_kst_now()}] Auto-cancelled {expired_waiting_count} expired waiting contracts and updated room statuses.")
 
 
+def rebuild_dashboard_snapshot(app):
+    """관리자 대시보드 스냅샷을 전체 재생성합니다. (증분 갱신 누락/만료 임박 기준일 변화 보정)"""
+    with app.app_context():
+        from app.services.dashboard_service import DashboardService
+        try:
+            DashboardService.rebuild()
+            db.session.commit()
+            print(f"[{get_kst_now()}] Rebuilt admin dashboard snapshot.")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[{get_kst_now()}] Dashboard snapshot rebuild failed: {e}")
+
+
+def rebuild_billing_ledger(app):
+    """월 청구 원장을 오늘 기준 기간으로 재생성합니다. (기간 이동/증분 갱신 누락 보정)"""
+    with app.app_context():
+        from app.services.billing_ledger_service import BillingLedgerService
+        try:
+            count = BillingLedgerService.rebuild_all()
+            print(f"[{get_kst_now()}] Rebuilt billing ledger for {count} contracts.")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[{get_kst_now()}] Billing ledger rebuild failed: {e}")
+
+
+def dispatch_sms_outbox(app):
+    """SMS 발송 대기열(outbox)에서 발송 시각이 된 문자를 발송합니다. (재시도/백오프 포함)"""
+    with app.app_context():
+        from app.services.sms_outbox_service import SmsOutboxService
+        try:
+            counts = SmsOutboxService.dispatch()
+            if counts:
+                print(f"[{get_kst_now()}] Dispatched SMS outbox: {counts}")
+        except Exception as e:
+            db.session.rollback()
+            print(f"[{get_kst_now()}] SMS outbox dispatch failed: {e}")
+        finally:
+            db.session.remove()
+
+
 def process_daily_sms_tasks(app):
     """결제 안내, 자동 연장 안내 등 매일 오전 9시에 실행되는 일괄 SMS 작업을 처리합니다."""
     from app.utils.sms_service import sms_service
     from app.utils.sms_context import build_sms_context
     
     with app.app_context():
+        from app.utils.sms_log_writer import SmsLogWriter
+        from app.services.billing_ledger_service import BillingLedgerService, month_key
         now_kst = get_kst_now()
         today = now_kst.date()
+
+        # 0. 이전 실행이 발송 도중 중단되어 PENDING 으로 남은 로그 정리
+        SmsLogWriter.reconcile()
         
         # 1. PAYMENT_REMINDER
         template = sms_service.get_template('PAYMENT_REMINDER')
@@ -93,10 +138,19 @@ def process_daily_sms_tasks(app):
             Contract.status == 'active',
             Contract.payment_day == target_payment_date.day
         ).all()
+        # 청구액은 계약마다 조회하지 않고 IN 조회 한 번으로 미리 적재
+        reminder_bills = BillingLedgerService.month_entries(
+            [contract.id for contract in reminder_contracts], month_key(target_payment_date)
+        )
         
-        for contract in reminder_contracts:
-            context = build_sms_context(contract, 'PAYMENT_REMINDER', due_date=target_payment_date.strftime('%Y-%m-%d'))
-            sms_service.send_sms(contract.id, 'PAYMENT_REMINDER', context, related_date=target_payment_date)
+        sms_service.send_batch('PAYMENT_REMINDER', [{
+            'contract_id': contract.id,
+            'context': build_sms_context(
+                contract, 'PAYMENT_REMINDER', billing_entries=reminder_bills,
+                due_date=target_payment_date.strftime('%Y-%m-%d')
+            ),
+            'related_date': target_payment_date,
+        } for contract in reminder_contracts])
  
         # 2. AUTO_RENEW_NOTICE (30일 전 연장 예정 알림 + 자동연장 대기 상태 전환)
         template = sms_service.get_template('AUTO_RENEW_NOTICE')
@@ -110,9 +164,12 @@ def process_daily_sms_tasks(app):
             Contract.auto_extend_status.in_(['none', None])  # 아직 대기 상태가 아닌 계약만
         ).all()
         
-        for contract in expiry_contracts:
-            context = build_sms_context(contract, 'AUTO_RENEW_NOTICE', renew_deadline=today.strftime('%Y-%m-%d'))
-            success, msg = sms_service.send_sms(contract.id, 'AUTO_RENEW_NOTICE', context, related_date=contract.end_date)
+        results = sms_service.send_batch('AUTO_RENEW_NOTICE', [{
+            'contract_id': contract.id,
+            'context': build_sms_context(contract, 'AUTO_RENEW_NOTICE', renew_deadline=today.strftime('%Y-%m-%d')),
+            'related_date': contract.end_date,
+        } for contract in expiry_contracts])
+        for contract, (success, msg) in zip(expiry_contracts, results):
             if success:
                 # 발송 성공 시 자동연장 대기 상태로 전환
                 contract.auto_extend_status = 'notified'
@@ -155,9 +212,11 @@ def process_daily_sms_tasks(app):
             Contract.end_date == target_moveout_date,
             Contract.is_indefinite == False
         ).all()
-        for contract in moveout_contracts:
-            context = build_sms_context(contract, 'MOVEOUT_DAY')
-            sms_service.send_sms(contract.id, 'MOVEOUT_DAY', context, related_date=target_moveout_date)
+        sms_service.send_batch('MOVEOUT_DAY', [{
+            'contract_id': contract.id,
+            'context': build_sms_context(contract, 'MOVEOUT_DAY'),
+            'related_date': target_moveout_date,
+        } for contract in moveout_contracts])
 
         # 6. WELCOME_MESSAGE (On start_date)
         template = sms_service.get_template('WELCOME_MESSAGE')
@@ -168,9 +227,11 @@ def process_daily_sms_tasks(app):
             Contract.status == 'active',
             Contract.start_date == target_start_date
         ).all()
-        for contract in welcome_contracts:
-            context = build_sms_context(contract, 'WELCOME_MESSAGE')
-            sms_service.send_sms(contract.id, 'WELCOME_MESSAGE', context, related_date=target_start_date)
+        sms_service.send_batch('WELCOME_MESSAGE', [{
+            'contract_id': contract.id,
+            'context': build_sms_context(contract, 'WELCOME_MESSAGE'),
+            'related_date': target_start_date,
+        } for contract in welcome_contracts])
 
         # 7. AUTO_EXTEND_PROCESS (15일 전 즉시 연장 처리)
         # notified(30일 전 알림 수신) 또는 none(알림 미수신 엣지케이스) 모두 연장
@@ -189,6 +250,7 @@ def process_daily_sms_tasks(app):
             Contract.auto_extend_status.in_(['notified', 'none', None])
         ).all()
 
+        auto_extend_messages = []
         for contract in auto_extend_contracts:
             extend_months = contract.months or 1
             new_end_date = contract.end_date + relativedelta(months=extend_months)
@@ -208,8 +270,13 @@ def process_daily_sms_tasks(app):
             contract.end_date = new_end_date
             contract.auto_extend_status = 'none'  # 초기화
 
-            context = build_sms_context(contract, 'AUTO_EXTEND_COMPLETED')
-            sms_service.send_sms(contract.id, 'AUTO_EXTEND_COMPLETED', context, related_date=today)
+            auto_extend_messages.append({
+                'contract_id': contract.id,
+                'context': build_sms_context(contract, 'AUTO_EXTEND_COMPLETED'),
+                'related_date': today,
+            })
+
+        sms_service.send_batch('AUTO_EXTEND_COMPLETED', auto_extend_messages)
 
         db.session.commit()
 
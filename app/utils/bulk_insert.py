@@ -0,0 +1,46 @@
+"""
+DB 방언별 일괄 INSERT 헬퍼
+
+insert_ignore: 유니크 키가 겹치는 행은 예외 없이 버리는 INSERT (행 목록을 한 번에 실행)
+    - MySQL: INSERT ... ON DUPLICATE KEY UPDATE <키> = <키>  (INSERT IGNORE 와 달리 다른 오류는 그대로 발생)
+    - SQLite / PostgreSQL: INSERT ... ON CONFLICT (<키>) DO NOTHING
+    - 그 외: 행마다 SAVEPOINT 안에서 INSERT 하고 IntegrityError 는 건너뜀
+"""
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+
+
+def insert_ignore(table, rows, conflict_column):
+    """
+    rows 를 table 에 INSERT, conflict_column 유니크 값이 이미 있는 행은 버림 (커밋은 호출자)
+
+    Args:
+        table: Table 또는 모델 클래스
+        rows: [{컬럼: 값}, ...] - 모든 행이 같은 키를 가져야 함 (빠진 컬럼은 컬럼 기본값)
+        conflict_column: 유니크 컬럼 이름 (예: 'dedup_key')
+    """
+    if not rows:
+        return
+    table = getattr(table, '__table__', table)
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        column = table.c[conflict_column]
+        stmt = insert(table).on_duplicate_key_update({conflict_column: column})
+    elif dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).on_conflict_do_nothing(index_elements=[conflict_column])
+    else:
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(table.insert(), row)
+            except IntegrityError:
+                pass
+        return
+
+    db.session.execute(stmt, rows)
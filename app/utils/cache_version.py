@@ -0,0 +1,133 @@
+"""
+캐시 버전 카운터 유틸리티
+
+워커별 인메모리 캐시를 여러 gunicorn 워커에서 일관되게 무효화하기 위해
+DB의 cache_versions 테이블에 네임스페이스별 버전 번호를 저장합니다.
+
+    - bump_cache_version: 현재 트랜잭션 안에서 버전 증가 (커밋과 동시에 모든 워커가 새 버전을 봄)
+    - bump_cache_version_after_commit: 커밋 후 별도의 짧은 트랜잭션에서 버전 증가
+      자주 바뀌는 데이터의 flush 이벤트용. 업무 트랜잭션이 끝날 때까지 cache_versions 행 잠금을
+      쥐고 있지 않으므로 동시 요청이 그 행에서 줄을 서거나 교착되지 않습니다.
+      (커밋과 버전 증가 사이의 아주 짧은 시간 동안은 다른 워커가 이전 캐시를 볼 수 있음)
+"""
+import logging
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.cache_version import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+PENDING_BUMPS_KEY = 'cache_version_bumps'
+
+def get_cache_version(name, session=None):
+    """네임스페이스의 현재 버전 조회 (행이 없으면 0)"""
+    session = session or db.session
+    version = session.execute(
+        select(CacheVersion.version).where(CacheVersion.name == name)
+    ).scalar()
+    return version or 0
+
+def get_cache_versions(names, session=None):
+    """여러 네임스페이스의 버전을 한 번의 쿼리로 조회"""
+    session = session or db.session
+    rows = session.execute(
+        select(CacheVersion.name, CacheVersion.version).where(CacheVersion.name.in_(list(names)))
+    ).all()
+    versions = {name: 0 for name in names}
+    versions.update({row.name: row.version for row in rows})
+    return versions
+
+def _bump(connection, *names):
+    """버전 증가 (여러 이름은 UPDATE 한 번, 행이 없는 이름만 생성)"""
+    table = CacheVersion.__table__
+    increment = (
+        table.update()
+        .where(table.c.name.in_(names))
+        .values(version=table.c.version + 1, updated_at=db.func.now())
+    )
+    if connection.execute(increment).rowcount == len(names):
+        return
+
+    # 최초 사용 시 행 생성 (동시에 다른 워커가 생성한 경우 UPDATE로 재시도)
+    existing = set(connection.execute(select(table.c.name).where(table.c.name.in_(names))).scalars())
+    for name in names:
+        if name in existing:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(table.insert().values(name=name, version=1, updated_at=db.func.now()))
+        except IntegrityError:
+            logger.info(f"Cache version row created concurrently, retrying bump: {name}")
+            connection.execute(
+                table.update()
+                .where(table.c.name == name)
+                .values(version=table.c.version + 1, updated_at=db.func.now())
+            )
+
+def bump_cache_version(name, session=None):
+    """
+    네임스페이스 버전을 1 증가 (현재 트랜잭션에 포함되어 함께 커밋됨)
+
+    ORM 객체를 건드리지 않는 Core UPDATE를 사용하므로 flush 이벤트 안에서도 호출할 수 있습니다.
+    """
+    session = session or db.session
+    _bump(session.connection(), name)
+
+def compare_and_bump_cache_version(name, expected, session=None):
+    """
+    버전이 expected 일 때만 1 증가 (현재 트랜잭션에 포함, 낙관적 잠금용)
+
+    조건부 UPDATE 한 문장이라 동시에 호출해도 한 곳만 성공합니다.
+    (성공한 트랜잭션이 커밋될 때까지 다른 호출은 행 잠금을 기다렸다가 실패)
+    Returns:
+        성공 여부
+    """
+    session = session or db.session
+    table = CacheVersion.__table__
+    result = session.execute(
+        table.update()
+        .where(table.c.name == name, table.c.version == expected)
+        .values(version=table.c.version + 1, updated_at=db.func.now())
+    )
+    if result.rowcount:
+        return True
+    if expected != 0:
+        return False
+
+    # 버전 0 = 아직 행이 없음: 먼저 만든 쪽만 성공
+    try:
+        with session.begin_nested():
+            session.execute(table.insert().values(name=name, version=1, updated_at=db.func.now()))
+    except IntegrityError:
+        return False
+    return True
+
+def bump_cache_version_after_commit(name, session=None):
+    """
+    세션이 커밋된 뒤 별도 트랜잭션에서 버전을 1 증가 (롤백되면 취소)
+
+    같은 트랜잭션에서 여러 번 호출해도 한 번만 증가합니다. flush 이벤트 안에서도 호출할 수 있습니다.
+    """
+    session = session or db.session
+    session.info.setdefault(PENDING_BUMPS_KEY, set()).add(name)
+
+def _after_commit(session):
+    names = session.info.pop(PENDING_BUMPS_KEY, None)
+    if not names:
+        return
+    try:
+        with db.engine.begin() as connection:
+            # 여러 워커가 같은 순서로 잠그도록 이름순으로 증가
+            _bump(connection, *sorted(names))
+    except Exception as e:
+        logger.error(f"Cache version bump failed after commit ({', '.join(sorted(names))}): {e}")
+
+def _after_rollback(session):
+    session.info.pop(PENDING_BUMPS_KEY, None)
+
+def register_cache_version_listeners():
+    """커밋 후 버전 증가를 실행하는 세션 이벤트 등록"""
+    if not event.contains(db.session, 'after_commit', _after_commit):
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
@@ -0,0 +1,122 @@
+"""
+공개 지점/호실 카탈로그 캐시
+
+/api/public 의 지점·호실 응답은 관리자 수정이 있을 때만 바뀌므로, 'catalog' 캐시 버전과
+오늘 날짜(입실 가능일 계산 기준)를 기준으로 직렬화된 JSON을 워커 메모리에 보관하고
+강한 ETag를 붙여 If-None-Match 요청에는 본문 없이 304를 돌려줍니다.
+
+지점/별칭/호실/이미지/평면도 변경과 방 상태·입실 가능일에 영향을 주는 계약 변경은
+flush 시점에 감지하고, 커밋 후 별도의 짧은 트랜잭션에서 버전을 올립니다.
+"""
+import hashlib
+import threading
+from datetime import date
+from flask import request, jsonify, current_app
+from sqlalchemy import event, inspect
+from app.extensions import db
+from app.utils.cache_version import get_cache_version, bump_cache_version_after_commit
+
+CATALOG_CACHE_KEY = 'catalog'
+
+# 입실 가능일(next_available_date) 계산에 영향을 주는 계약 필드
+CONTRACT_CATALOG_FIELDS = ('status', 'room_id', 'end_date', 'termination_effective_date', 'is_indefinite')
+
+_lock = threading.Lock()
+_entries = {}  # cache_key -> (version_tag, body)
+_current_tag = None
+
+def get_catalog_version_tag():
+    """현재 카탈로그 버전 태그 (DB 버전 + 기준일)"""
+    return f"{get_cache_version(CATALOG_CACHE_KEY)}:{date.today().isoformat()}"
+
+def _make_etag(cache_key, version_tag):
+    return hashlib.sha1(f"{cache_key}|{version_tag}".encode('utf-8')).hexdigest()
+
+def catalog_response(cache_key, builder):
+    """
+    카탈로그 응답을 캐시에서 반환하거나 builder()로 생성합니다.
+
+    Args:
+        cache_key: 응답을 구분하는 키 (예: 'branch:3')
+        builder: JSON 직렬화 가능한 데이터를 반환하는 함수.
+                 (data, status_code) 튜플을 반환하면 200이 아닌 응답은 캐시하지 않습니다.
+
+    Returns:
+        Flask Response (ETag 포함, 변경이 없으면 304)
+    """
+    global _current_tag
+
+    version_tag = get_catalog_version_tag()
+    etag = _make_etag(cache_key, version_tag)
+
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    entry = _entries.get(cache_key)
+    if entry and entry[0] == version_tag:
+        body = entry[1]
+    else:
+        result = builder()
+        status_code = 200
+        if isinstance(result, tuple):
+            result, status_code = result
+        if status_code != 200:
+            return jsonify(result), status_code
+
+        body = jsonify(result).get_data()
+        with _lock:
+            # 버전이 바뀌면 이전 버전 항목은 모두 폐기
+            if _current_tag != version_tag:
+                _entries.clear()
+                _current_tag = version_tag
+            _entries[cache_key] = (version_tag, body)
+
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def invalidate_catalog(session=None):
+    """카탈로그 캐시 무효화 (현재 트랜잭션이 커밋된 뒤 버전 증가)"""
+    bump_cache_version_after_commit(CATALOG_CACHE_KEY, session=session)
+
+def _is_catalog_change(obj, deleted=False):
+    from app.models.branch import Branch, BranchAlias, BranchFloor, BranchImage, Room, RoomImage
+    from app.models.contract import Contract
+
+    if isinstance(obj, (Branch, BranchAlias, BranchFloor, BranchImage, Room, RoomImage)):
+        return True
+    if isinstance(obj, Contract):
+        if deleted:
+            return True
+        state = inspect(obj)
+        if state.pending:
+            return True
+        return any(state.attrs[field].history.has_changes() for field in CONTRACT_CATALOG_FIELDS)
+    return False
+
+def _before_flush(session, flush_context, instances):
+    if session.info.get('catalog_invalidated'):
+        return
+    changed = (
+        any(_is_catalog_change(obj) for obj in session.new) or
+        any(_is_catalog_change(obj) for obj in session.dirty if session.is_modified(obj)) or
+        any(_is_catalog_change(obj, deleted=True) for obj in session.deleted)
+    )
+    if changed:
+        invalidate_catalog(session=session)
+        # 같은 트랜잭션에서 여러 번 flush되어도 한 번만 버전 증가
+        session.info['catalog_invalidated'] = True
+
+def _reset_flag(session, *args):
+    session.info.pop('catalog_invalidated', None)
+
+def register_catalog_invalidation():
+    """flush 시 카탈로그 변경을 감지하는 세션 이벤트 등록"""
+    if not event.contains(db.session, 'before_flush', _before_flush):
+        event.listen(db.session, 'before_flush', _before_flush)
+        event.listen(db.session, 'after_commit', _reset_flag)
+        event.listen(db.session, 'after_rollback', _reset_flag)
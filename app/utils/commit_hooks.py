@@ -0,0 +1,42 @@
+"""
+커밋 직전 파생 데이터 갱신 훅 (청구 원장, 검색 색인)
+
+before_commit 리스너를 하나만 등록해 남은 변경을 한 번만 flush하고,
+이번 트랜잭션에 할 일이 있는 훅만 각자의 SAVEPOINT 안에서 실행합니다.
+(할 일이 없는 훅은 SAVEPOINT 도 만들지 않음)
+
+훅은 prepare(session) 함수로 등록합니다. flush 이벤트에서 모아 둔 변경을 꺼내
+실행할 함수(인자 없음)를 돌려주거나, 할 일이 없으면 None 을 돌려줍니다.
+실행 중 오류는 해당 훅의 SAVEPOINT 만 되돌리고 기록하므로 원래 작업은 그대로 커밋됩니다.
+"""
+import logging
+from sqlalchemy import event
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+_hooks = []  # [(이름, prepare)]
+
+def register_before_commit_hook(name, prepare):
+    """커밋 직전 훅 등록 (같은 이름은 한 번만)"""
+    if not any(existing == name for existing, _ in _hooks):
+        _hooks.append((name, prepare))
+    if not event.contains(db.session, 'before_commit', _before_commit):
+        event.listen(db.session, 'before_commit', _before_commit)
+
+def _before_commit(session):
+    # before_commit은 커밋의 flush보다 먼저 호출되므로 남은 변경을 여기서 flush해야 훅에 반영됨
+    session.flush()
+    jobs = []
+    for name, prepare in _hooks:
+        job = prepare(session)
+        if job is not None:
+            jobs.append((name, job))
+
+    for name, job in jobs:
+        try:
+            with session.connection().begin_nested():
+                job()
+        except Exception as e:
+            # 파생 데이터 갱신 실패가 원래 작업을 막지 않도록 함 (전체 재생성으로 보정)
+            logger.error(f"{name} update failed: {e}")
@@ -0,0 +1,42 @@
+"""
+한글 검색 보조 함수 (초성 분해, 검색어 정규화)
+"""
+import re
+
+CHOSUNG = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'
+]
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSUNG_JONGSUNG_COUNT = 21 * 28
+CHOSUNG_SET = set(CHOSUNG)
+
+def normalize(text):
+    """소문자 + 공백 제거"""
+    return re.sub(r'\s+', '', text or '').lower()
+
+def digits(text):
+    """숫자만 남기기 (전화번호 비교용)"""
+    return re.sub(r'\D', '', text or '')
+
+def to_chosung(text):
+    """'홍길동' -> 'ㅎㄱㄷ' (완성형 한글이 아닌 문자는 그대로)"""
+    result = []
+    for ch in normalize(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSUNG[(code - HANGUL_BASE) // JUNGSUNG_JONGSUNG_COUNT])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+def has_chosung(text):
+    """초성(호환 자모 자음)이 하나라도 포함된 검색어인지"""
+    return any(ch in CHOSUNG_SET for ch in text)
+
+def ngrams(text, n):
+    """길이 n 부분 문자열 집합 (text가 n보다 짧으면 text 자체)"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
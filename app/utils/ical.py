@@ -0,0 +1,87 @@
+"""
+iCalendar(.ics, RFC 5545) 스트리밍 유틸리티
+
+캘린더 이벤트 dict(FullCalendar 형식)를 VEVENT로 변환해 한 건씩 생성합니다.
+시간은 Asia/Seoul 기준의 floating time 으로 출력합니다.
+"""
+from datetime import datetime
+
+PRODID = '-//eroom//admin calendar//KO'
+MAX_LINE_OCTETS = 75
+
+def escape_text(value):
+    """TEXT 값 이스케이프 (\\, ;, , , 줄바꿈)"""
+    return (str(value or '')
+            .replace('\\', '\\\\')
+            .replace(';', '\\;')
+            .replace(',', '\\,')
+            .replace('\r\n', '\\n')
+            .replace('\n', '\\n'))
+
+def fold_line(line):
+    """75 octet 초과 줄을 접어서 CRLF로 끝나는 문자열 반환 (UTF-8 문자 중간에서 자르지 않음)"""
+    parts = []
+    current = ''
+    current_octets = 0
+    for ch in line:
+        octets = len(ch.encode('utf-8'))
+        if current_octets + octets > MAX_LINE_OCTETS:
+            parts.append(current)
+            current = ' '  # 이어지는 줄은 공백 한 칸으로 시작
+            current_octets = 1
+        current += ch
+        current_octets += octets
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+def _format_start_end(event):
+    """FullCalendar start/end -> (DTSTART 줄, DTEND 줄)"""
+    try:
+        if not event.get('allDay'):
+            start = datetime.fromisoformat(event['start']).strftime('%Y%m%dT%H%M%S')
+            end = datetime.fromisoformat(event['end']).strftime('%Y%m%dT%H%M%S') if event.get('end') else None
+            return f'DTSTART:{start}', (f'DTEND:{end}' if end else None)
+    except ValueError:
+        pass  # 시간 정보가 없는 예약은 종일 일정으로 출력
+    day = event['start'][:10].replace('-', '')
+    return f'DTSTART;VALUE=DATE:{day}', None
+
+def stream_ics(events, calendar_name, uid_domain):
+    """
+    이벤트 목록 -> .ics 본문 조각 생성기
+
+    Args:
+        events: FullCalendar 이벤트 dict iterable (title, start, end, allDay, extendedProps)
+        calendar_name: 구독 캘린더 표시 이름
+        uid_domain: UID 뒷부분 (예: 요청 호스트)
+    """
+    stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    yield ''.join(fold_line(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(calendar_name)}',
+        'X-WR-TIMEZONE:Asia/Seoul',
+    ))
+
+    for event in events:
+        props = event.get('extendedProps', {})
+        dtstart, dtend = _format_start_end(event)
+        lines = [
+            'BEGIN:VEVENT',
+            f"UID:{props.get('type')}-{props.get('contract_id')}-{event['start'].replace(':', '')}@{uid_domain}",
+            f'DTSTAMP:{stamp}',
+            dtstart,
+        ]
+        if dtend:
+            lines.append(dtend)
+        lines.append(f"SUMMARY:{escape_text(event['title'])}")
+        amount = props.get('amount')
+        if amount is not None:
+            lines.append(f"DESCRIPTION:{escape_text(f'금액: {amount:,}원')}")
+        lines.append('END:VEVENT')
+        yield ''.join(fold_line(line) for line in lines)
+
+    yield fold_line('END:VCALENDAR')
@@ -0,0 +1,160 @@
+"""
+키셋(커서) 페이지네이션 유틸리티
+
+OFFSET 대신 마지막 행의 (정렬값, id)를 커서로 넘겨 다음 페이지를 인덱스 범위 조회로 가져옵니다.
+커서는 클라이언트에 불투명한 base64 문자열입니다.
+"""
+import base64
+import json
+from datetime import date, datetime
+from flask import current_app
+from sqlalchemy import and_, or_
+
+def int_arg(args, name):
+    """정수 쿼리 파라미터 (없으면 None, 형식 오류 시 ValueError)"""
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+def csv_arg(args, name):
+    """쉼표로 구분한 쿼리 파라미터 -> 값 목록 (공백 항목 제외)"""
+    return [v.strip() for v in (args.get(name) or '').split(',') if v.strip()]
+
+def like_escape(text, escape='\\'):
+    """LIKE 패턴에서 %, _ 를 문자 그대로 비교하도록 이스케이프"""
+    return text.replace(escape, escape * 2).replace('%', escape + '%').replace('_', escape + '_')
+
+def date_arg(args, name):
+    """YYYY-MM-DD 쿼리 파라미터 (없으면 None, 형식 오류 시 ValueError)"""
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be YYYY-MM-DD')
+
+def limit_arg(args, maximum, name='limit'):
+    """페이지 크기 파라미터 (없으면 None, 1~maximum 범위 밖이면 ValueError)"""
+    value = args.get(name)
+    if value is None:
+        return None
+    limit = int(value) if value.isdigit() else 0
+    if not 1 <= limit <= maximum:
+        raise ValueError(f'{name} must be between 1 and {maximum}')
+    return limit
+
+def encode_cursor(values):
+    """[정렬값, id] -> 커서 문자열"""
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor, columns):
+    """
+    커서 문자열 -> 컬럼 타입에 맞춘 값 목록
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError('Invalid cursor')
+
+    result = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        if value is not None and python_type in (date, datetime):
+            value = python_type.fromisoformat(value)
+        result.append(value)
+    return result
+
+def keyset_after(query, columns, values, descending=False):
+    """
+    (columns) 가 values 다음인 행만 남기는 조건 추가 (정렬 방향 기준)
+
+    columns 의 마지막은 유일한 컬럼(id)이어야 합니다.
+    """
+    conditions = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        conditions.append(and_(*equal, beyond))
+    return query.filter(or_(*conditions))
+
+def parse_sort(sort, allowed, default):
+    """
+    '-start_date' 형태의 정렬 파라미터 해석
+
+    Returns:
+        (정렬 키, 내림차순 여부)
+    Raises:
+        ValueError: 허용되지 않은 정렬 키
+    """
+    sort = sort or default
+    descending = sort.startswith('-')
+    key = sort.lstrip('-')
+    if key not in allowed:
+        raise ValueError(f"sort must be one of {sorted(allowed)} (prefix '-' for descending)")
+    return key, descending
+
+def iter_keyset(query, columns, limit=None, cursor_values=None, descending=False, chunk_size=200):
+    """
+    키셋 순서로 chunk_size 개씩 행 묶음을 생성 (limit 개까지)
+
+    마지막에 ('next', 다음 커서 값 또는 None)을 한 번 생성합니다.
+    각 묶음은 별도 쿼리이므로 큰 페이지도 메모리에 한 번에 올라가지 않습니다.
+    """
+    order = [c.desc() if descending else c.asc() for c in columns]
+    remaining = limit
+    last_values = cursor_values
+
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        page_query = query if last_values is None else keyset_after(query, columns, last_values, descending)
+        rows = page_query.order_by(*order).limit(size + 1).all()
+
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if rows:
+            yield 'rows', rows
+            last_values = [getattr(rows[-1], c.key) for c in columns]
+        if not has_more:
+            yield 'next', None
+            return
+        if remaining is not None:
+            remaining -= len(rows)
+
+    yield 'next', last_values
+
+def stream_json_page(chunks, serialize, meta=None, legacy_array=False):
+    """
+    iter_keyset 결과를 JSON으로 스트리밍하는 제너레이터
+
+    legacy_array=True 이면 항목 배열만 출력하고, 아니면
+    {"items": [...], "next_cursor": ..., **meta} 형태로 출력합니다.
+    """
+    dumps = current_app.json.dumps
+    yield '[' if legacy_array else '{"items": ['
+    first = True
+    next_values = None
+    for kind, value in chunks:
+        if kind == 'next':
+            next_values = value
+            continue
+        for item in serialize(value):
+            yield ('' if first else ',') + dumps(item)
+            first = False
+
+    if legacy_array:
+        yield ']'
+        return
+    tail = dict(meta or {})
+    tail['next_cursor'] = encode_cursor(next_values) if next_values else None
+    yield '], ' + dumps(tail)[1:]
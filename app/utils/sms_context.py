@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta
 from app.models.sms import get_kst_now
+from app.services.billing_ledger_service import BillingLedgerService, due_date_for
 
-def build_sms_context(contract, msg_type, **kwargs):
+def build_sms_context(contract, msg_type, billing_entries=None, **kwargs):
     """
     계약 객체와 SMS 타입에 기반하여 템플릿 치환을 위한 컨텍스트 변수 사전을 생성합니다.
     kwargs를 통해 수동으로 변수들을 주입하거나 덮어쓸 수 있습니다.
+    billing_entries: 일괄 발송 시 미리 조회한 해당 월 청구액 (BillingLedgerService.month_entries 결과)
     """
     user_info = contract.get_user_info()
     today = get_kst_now().date()
@@ -24,36 +26,26 @@ def build_sms_context(contract, msg_type, **kwargs):
         context['due_date'] = f"매월 {contract.payment_day}일"
 
     elif msg_type in ['PAYMENT_REMINDER', 'PAYMENT_OVERDUE_STAGE1', 'PAYMENT_OVERDUE_STAGE2']:
-        base_amount = int(contract.price or 0)
-        
         # date_override가 있으면 사용 (tasks.py 등에서 계산된 날짜)
         due_date = kwargs.get('due_date')
-        if not due_date:
-            # 기본값: 이번 달 납부일 계산
-            try:
-                due_date_obj = today.replace(day=contract.payment_day)
-            except ValueError:
-                # 말일 처리 (2월 30일 등)
-                import calendar
-                last_day = calendar.monthrange(today.year, today.month)[1]
-                due_date_obj = today.replace(day=last_day)
+        if due_date:
+            due_date_obj = datetime.strptime(due_date, '%Y-%m-%d').date()
+        else:
+            # 기본값: 이번 달 납부일 (말일 보정)
+            due_date_obj = due_date_for(contract.payment_day, today.year, today.month)
             due_date = due_date_obj.strftime('%Y-%m-%d')
-            
-        target_month = due_date[:7] # YYYY-MM
-        
-        from app.models.custom_discount import CustomDiscount
-        discount = CustomDiscount.query.filter_by(contract_id=contract.id, target_month=target_month).first()
-        
-        discount_amount = discount.amount if discount else 0
-        discount_reason = discount.reason if discount else None
-        
-        final_amount = max(0, base_amount - discount_amount)
-        
+
+        # 월 청구 원장 (특별 할인 반영된 금액)
+        entry = BillingLedgerService.entry(contract, due_date_obj, prefetched=billing_entries)
+        base_amount = entry['base_amount']
+        discount_amount = entry['discount_amount']
+        final_amount = entry['final_amount']
+
         context['base_amount'] = base_amount
         context['discount_applied'] = discount_amount
         context['amount_final'] = final_amount
-        context['discount_reason'] = discount_reason
-        context['month_key'] = target_month
+        context['discount_reason'] = entry['discount_reason']
+        context['month_key'] = entry['month']
         
         if final_amount == 0 and discount_amount > 0:
             context['amount'] = "0 (할인 적용)"
@@ -0,0 +1,142 @@
+"""
+SMS 발송 로그 버퍼 기록기 (발송 전 PENDING 예약 + 결과 기록)
+
+메시지마다 커밋하지 않고 로그 INSERT/UPDATE 를 모아 두었다가 청크 단위 일괄 실행으로 기록합니다.
+커밋은 청크 발송 직전(reserve)과 단계 끝(checkpoint)에서만 일어납니다.
+
+장애 대비
+    - 발송 전에 PENDING 로그를 먼저 커밋해 두므로, 발송 도중 프로세스가 죽어도 dedup_key 가
+      남아 같은 문자를 다시 보내지 않습니다.
+    - PENDING 로그는 기록기마다 만든 token(reservation_token)과 함께 insert-or-ignore 로 기록하고,
+      커밋 후 이 token 으로 다시 조회되는 키만 발송합니다. 동시에 같은 키를 예약한 다른 발송자는
+      INSERT 가 무시되므로 발송하지 않습니다. (resolve/release 도 이 token 의 행만 변경)
+    - 결과를 기록하지 못하고 RECONCILE_AFTER_MINUTES 이상 PENDING 으로 남은 로그는
+      reconcile() 이 FAILED(결과 미확인)로 정리합니다. (리더 하나만 실행하는 일일 작업 시작 시 실행 -
+      워커마다 실행하면 다른 워커가 발송 중인 PENDING 을 건드릴 수 있음)
+      실제 발송 여부는 Provider 전송 내역으로 확인 후 필요하면 수동 재발송합니다.
+
+로그는 호출자의 세션으로 기록합니다. (별도 연결을 쓰면 같은 계약 행을 수정 중인 배치 트랜잭션과
+sms_logs -> contracts 외래 키 검사가 서로를 기다릴 수 있음)
+"""
+import logging
+import uuid
+from datetime import timedelta
+from sqlalchemy import bindparam
+from app.extensions import db
+from app.models.sms import SmsLog, get_kst_now
+from app.utils.bulk_insert import insert_ignore
+
+logger = logging.getLogger(__name__)
+
+LOG_CHUNK_SIZE = 500
+OWNED_QUERY_CHUNK_SIZE = 1000  # reserve 후 소유 키 조회의 IN 목록 최대 길이
+RECONCILE_AFTER_MINUTES = 30
+INTERRUPTED_MESSAGE = 'Interrupted before provider result was recorded (check provider history before resending)'
+
+# resolve 로 바꾸는 컬럼
+RESULT_FIELDS = ('status', 'provider_info', 'provider_message_id', 'error_message')
+
+
+class SmsLogWriter:
+    def __init__(self, chunk_size=LOG_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.token = uuid.uuid4().hex  # 이 기록기가 예약한 PENDING 로그 표시
+        self._inserts = []
+        self._updates = []
+        self._releases = []
+
+    def add(self, row):
+        """최종 상태 로그 행 추가 (SmsService._log_row 형식)"""
+        self._inserts.append(row)
+        self._flush_if_full()
+
+    def reserve(self, rows):
+        """
+        발송 직전: PENDING 로그를 기록하고 커밋 (이 시점까지의 세션 변경도 함께 커밋됨)
+
+        Returns:
+            이 기록기가 실제로 예약한 dedup_key 집합 - 이 키만 발송해야 함
+            (이미 다른 발송자가 기록한 키는 INSERT 가 무시되어 빠짐)
+        """
+        self._inserts.extend(dict(row, reservation_token=self.token) for row in rows)
+        self.checkpoint()
+
+        table = SmsLog.__table__
+        keys = [row['dedup_key'] for row in rows]
+        owned = set()
+        for start in range(0, len(keys), OWNED_QUERY_CHUNK_SIZE):
+            owned.update(key for (key,) in db.session.execute(
+                table.select().with_only_columns(table.c.dedup_key).where(
+                    table.c.dedup_key.in_(keys[start:start + OWNED_QUERY_CHUNK_SIZE]),
+                    table.c.reservation_token == self.token,
+                    table.c.status == 'PENDING'
+                )
+            ))
+        return owned
+
+    def resolve(self, dedup_key, **result):
+        """PENDING 로그를 발송 결과로 변경 (status, provider_info, provider_message_id, error_message)"""
+        self._updates.append({'b_dedup_key': dedup_key, **{f'b_{f}': result.get(f) for f in RESULT_FIELDS}})
+        self._flush_if_full()
+
+    def release(self, dedup_key):
+        """발송하지 않은 메시지의 PENDING 로그 삭제 (발송 대기열로 넘긴 경우)"""
+        self._releases.append(dedup_key)
+        self._flush_if_full()
+
+    def _flush_if_full(self):
+        if len(self._inserts) + len(self._updates) + len(self._releases) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 INSERT/UPDATE/DELETE 실행 (커밋은 하지 않음)"""
+        table = SmsLog.__table__
+        if self._inserts:
+            for start in range(0, len(self._inserts), self.chunk_size):
+                insert_ignore(SmsLog, self._inserts[start:start + self.chunk_size], 'dedup_key')
+            self._inserts = []
+        if self._updates:
+            db.session.execute(
+                table.update()
+                .where(
+                    table.c.dedup_key == bindparam('b_dedup_key'),
+                    table.c.reservation_token == self.token,
+                    table.c.status == 'PENDING'
+                )
+                .values({f: bindparam(f'b_{f}') for f in RESULT_FIELDS}),
+                self._updates
+            )
+            self._updates = []
+        if self._releases:
+            for start in range(0, len(self._releases), self.chunk_size):
+                db.session.execute(table.delete().where(
+                    table.c.dedup_key.in_(self._releases[start:start + self.chunk_size]),
+                    table.c.reservation_token == self.token,
+                    table.c.status == 'PENDING'
+                ))
+            self._releases = []
+
+    def checkpoint(self):
+        """flush 후 커밋 (단계 경계)"""
+        self.flush()
+        db.session.commit()
+
+    @staticmethod
+    def reconcile(older_than_minutes=RECONCILE_AFTER_MINUTES):
+        """
+        결과 없이 남은 오래된 PENDING 로그를 FAILED 로 정리하고 커밋
+
+        Returns:
+            정리한 건수
+        """
+        table = SmsLog.__table__
+        cutoff = get_kst_now() - timedelta(minutes=older_than_minutes)
+        result = db.session.execute(
+            table.update()
+            .where(table.c.status == 'PENDING', table.c.sent_at < cutoff)
+            .values(status='FAILED', error_message=INTERRUPTED_MESSAGE)
+        )
+        db.session.commit()
+        if result.rowcount:
+            logger.warning(f"Reconciled {result.rowcount} interrupted SMS logs (PENDING -> FAILED)")
+        return result.rowcount
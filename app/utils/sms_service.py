@@ -1,14 +1,25 @@
-import re
 import json
 import logging
-import requests
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from flask import current_app
 from app.extensions import db
-from app.models.sms import SmsTemplate, SmsLog, get_kst_now
+from app.models.sms import SmsLog, get_kst_now
+from app.models.sms_outbox import SmsOutbox
+from app.services.sms_template_registry import SmsTemplateRegistry
+from app.utils.sms_template import compile_template, measure
+from app.utils.sms_transport import CircuitOpenError, get_transport
+from app.utils.bulk_insert import insert_ignore
+from app.utils.sms_log_writer import SmsLogWriter, LOG_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
+DEDUP_QUERY_CHUNK_SIZE = 1000  # filter_unsent 의 IN 목록 최대 길이
+
+def make_dedup_key(msg_type, contract_id, related_date):
+    """중복 방지 키 (Decision 1: {type}:{contract_id}:{related_date})"""
+    return f"{msg_type}:{contract_id}:{related_date}"
+
 # --- Source of Truth: 타입별 허용 변수 목록 ---
 SMS_VARIABLE_SCHEMA = {
     'CONTRACT_APPLIED': ['user_name', 'branch_name', 'room_name'],
@@ -33,10 +44,34 @@ SMS_VARIABLE_SCHEMA = {
     'AUTO_EXTEND_COMPLETED': ['user_name', 'branch_name', 'room_name', 'end_date']
 }
 
+class UnconfirmedSendError(Exception):
+    """Provider 가 접수했지만 수신자별 결과를 확인하지 못함 (로그는 PENDING 으로 두고 reconcile 로 정리)"""
+    def __init__(self, provider_message_id):
+        super().__init__(f"Provider result unconfirmed (msg_id={provider_message_id}, check provider history)")
+        self.provider_message_id = provider_message_id
+
 class SmsProviderInterface:
     def send(self, to_number, content):
         raise NotImplementedError
 
+    def send_batch(self, messages):
+        """
+        여러 건 발송 (기본 구현: 한 건씩 send)
+
+        Args:
+            messages: [(수신 번호, 본문), ...]
+        Returns:
+            [(provider_message_id, None) 또는 (None, 예외), ...] - messages 순서
+            (UnconfirmedSendError 는 접수는 되었으나 결과를 모르는 건이므로 다시 보내면 안 됨)
+        """
+        results = []
+        for to_number, content in messages:
+            try:
+                results.append((self.send(to_number, content), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
 class SmsProviderStub(SmsProviderInterface):
     """실제 발송은 하지 않고 로그만 남기는 Stub"""
     def send(self, to_number, content):
@@ -45,11 +80,14 @@ class SmsProviderStub(SmsProviderInterface):
 
 class AligoSmsProvider(SmsProviderInterface):
     """알리고 문자를 통한 실제 발송"""
-    def __init__(self, api_key, user_id, sender):
+    MASS_LIMIT = 500  # send_mass 1회 최대 수신자 수
+    DELIVERED_STATE = '발송완료'  # sms_list 의 sms_state 발송 완료 값
+
+    def __init__(self, api_key, user_id, sender, transport):
         self.api_key = api_key
         self.user_id = user_id
         self.sender = sender
-        self.api_url = "https://apis.aligo.in/send/"
+        self.transport = transport  # SmsTransport (연결 풀/타임아웃/속도 제한/서킷 브레이커)
 
     def send(self, to_number, content):
         # Remove hyphens and spaces from numbers
@@ -66,8 +104,7 @@ class AligoSmsProvider(SmsProviderInterface):
         }
         
         try:
-            response = requests.post(self.api_url, data=data)
-            res_json = response.json()
+            res_json = self.transport.post('send', data)
             
             # 알리고 응답 코드 확인: result_code가 1이면 성공 (숫자형으로 올 수 있으므로 str 변환 후 비교)
             if str(res_json.get('result_code')) == '1':
@@ -81,16 +118,104 @@ class AligoSmsProvider(SmsProviderInterface):
             logger.error(f"Aligo SMS Send Failed: {str(e)}")
             raise e
 
+    def send_batch(self, messages):
+        """
+        알리고 send_mass(수신자별 개별 본문)로 일괄 발송
+
+        send_mass 는 호출마다 msg_type 이 하나이므로 SMS/LMS 로 나누고, MASS_LIMIT 건씩 잘라 호출합니다.
+        알리고는 호출 단위로 msg_id 하나를 돌려주므로, 일부 실패(error_cnt > 0)가 있으면 전송 내역(sms_list)에서
+        수신자별 결과를 확인해 발송 완료가 확인된 건만 성공으로, 나머지는 UnconfirmedSendError 로 돌려줍니다.
+        """
+        results = [None] * len(messages)
+        groups = {}
+        for index, (_, content) in enumerate(messages):
+            groups.setdefault(measure(content)[1], []).append(index)
+
+        for msg_type, indexes in groups.items():
+            for start in range(0, len(indexes), self.MASS_LIMIT):
+                chunk = indexes[start:start + self.MASS_LIMIT]
+                chunk_messages = [messages[i] for i in chunk]
+                try:
+                    msg_id, error_cnt = self._send_mass(msg_type, chunk_messages)
+                except Exception as e:
+                    logger.error(f"Aligo SMS Mass Send Failed ({len(chunk)} messages): {str(e)}")
+                    outcomes = [(None, e)] * len(chunk)
+                else:
+                    if error_cnt:
+                        outcomes = self._confirm_mass(msg_id, chunk_messages)
+                    else:
+                        outcomes = [(msg_id, None)] * len(chunk)
+                for index, outcome in zip(chunk, outcomes):
+                    results[index] = outcome
+        return results
+
+    def _send_mass(self, msg_type, messages):
+        """
+        Returns:
+            (msg_id, error_cnt)
+        """
+        data = {
+            'key': self.api_key,
+            'user_id': self.user_id,
+            'sender': "".join(filter(str.isdigit, self.sender)),
+            'msg_type': msg_type,
+            'cnt': len(messages),
+        }
+        for n, (to_number, content) in enumerate(messages, 1):
+            data[f'rec_{n}'] = "".join(filter(str.isdigit, to_number))
+            data[f'msg_{n}'] = content
+
+        res_json = self.transport.post('send_mass', data)
+        if str(res_json.get('result_code')) != '1':
+            raise Exception(f"Aligo API Error: {res_json.get('result_code')} - {res_json.get('message', 'Unknown Error')}")
+        error_cnt = int(res_json.get('error_cnt') or 0)
+        if error_cnt:
+            logger.warning(f"Aligo send_mass partial failure: msg_id={res_json.get('msg_id')}, "
+                           f"success={res_json.get('success_cnt')}, error={error_cnt}")
+        return str(res_json.get('msg_id')), error_cnt
+
+    def _confirm_mass(self, msg_id, messages):
+        """
+        send_mass 일부 실패 시 전송 내역(sms_list)으로 수신자별 결과 확인
+
+        발송 완료(DELIVERED_STATE)가 확인된 수신자만 (msg_id, None), 나머지는 (None, UnconfirmedSendError).
+        조회에 실패하면 청크 전체가 미확인입니다. (이미 접수된 건이므로 CircuitOpenError 도 재발송하지 않음)
+        """
+        delivered = {}
+        try:
+            res_json = self.transport.post('sms_list', {
+                'key': self.api_key,
+                'user_id': self.user_id,
+                'mid': msg_id,
+                'page_size': self.MASS_LIMIT,
+            })
+            if str(res_json.get('result_code')) != '1':
+                raise Exception(f"Aligo API Error: {res_json.get('result_code')} - {res_json.get('message', 'Unknown Error')}")
+            for entry in res_json.get('list') or []:
+                if entry.get('sms_state') == self.DELIVERED_STATE:
+                    receiver = "".join(filter(str.isdigit, str(entry.get('receiver', ''))))
+                    delivered[receiver] = delivered.get(receiver, 0) + 1
+        except Exception as e:
+            logger.error(f"Aligo sms_list lookup failed (msg_id={msg_id}): {str(e)}")
+
+        outcomes = []
+        for to_number, _ in messages:
+            receiver = "".join(filter(str.isdigit, to_number))
+            if delivered.get(receiver):
+                delivered[receiver] -= 1
+                outcomes.append((msg_id, None))
+            else:
+                outcomes.append((None, UnconfirmedSendError(msg_id)))
+        return outcomes
+
     def get_balance(self):
         """남은 잔액 조회 API 호출"""
-        url = "https://apis.aligo.in/remain/"
         data = {
             'key': self.api_key,
             'user_id': self.user_id
         }
         try:
-            response = requests.post(url, data=data)
-            res_json = response.json()
+            res_json = self.transport.post('remain', data)
             # 0 이상이면 성공 (보통 1)
             if int(res_json.get('result_code', -1)) >= 0:
                 return {
@@ -107,17 +232,43 @@ class AligoSmsProvider(SmsProviderInterface):
 
 class SmsService:
     def __init__(self):
-        pass
+        # 템플릿 ID -> (updated_at, CompiledTemplate)
+        self._compiled = {}
+        self._compiled_lock = threading.Lock()
+        # (설정 키, provider, provider_name) - 설정이 바뀔 때만 다시 생성
+        self._provider = None
 
     def _get_provider(self):
-        """현재 앱 컨텍스트 설정에 따라 Provider 반환"""
-        api_key = current_app.config.get('ALIGO_API_KEY')
-        user_id = current_app.config.get('ALIGO_USER_ID')
-        sender = current_app.config.get('ALIGO_SENDER')
+        """현재 앱 컨텍스트 설정에 따라 Provider 반환 (워커 내에서 재사용)"""
+        config = current_app.config
+        api_key = config.get('ALIGO_API_KEY')
+        user_id = config.get('ALIGO_USER_ID')
+        sender = config.get('ALIGO_SENDER')
+
+        transport = get_transport(config) if api_key and user_id and sender else None
+        key = (api_key, user_id, sender, id(transport))
+        cached = self._provider
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
+
+        if transport:
+            provider, provider_name = AligoSmsProvider(api_key, user_id, sender, transport), "Aligo"
+        else:
+            provider, provider_name = SmsProviderStub(), "Stub"
+        self._provider = (key, provider, provider_name)
+        return provider, provider_name
+
+    def deliver(self, to_number, content):
+        """
+        렌더링된 본문을 현재 Provider로 발송 (중복 체크/로그 없음 - 디스패처용)
 
-        if api_key and user_id and sender:
-            return AligoSmsProvider(api_key, user_id, sender), "Aligo"
-        return SmsProviderStub(), "Stub"
+        Returns:
+            (provider_name, provider_message_id)
+        Raises:
+            Exception: Provider 발송 실패
+        """
+        provider, provider_name = self._get_provider()
+        return provider_name, provider.send(to_number, content)
 
     def get_balance(self):
         """통합 잔액 조회 인터페이스"""
@@ -127,70 +278,289 @@ class SmsService:
         return {"SMS_CNT": 9999, "LMS_CNT": 9999, "MMS_CNT": 9999}
 
     def get_template(self, msg_type):
-        """SMS 템플릿 조회"""
-        return SmsTemplate.query.filter_by(type=msg_type, is_active=True).first()
+        """SMS 템플릿 조회 (워커 메모리 레지스트리, 비활성이면 None)"""
+        return SmsTemplateRegistry.get(msg_type)
+
+    def compile(self, template):
+        """
+        SmsTemplate(또는 레지스트리 스냅샷) -> CompiledTemplate (템플릿 ID + updated_at 기준으로 캐시)
+
+        updated_at 이 초 단위로 저장되는 DB에서 같은 초에 두 번 수정되는 경우를 위해 본문도 비교합니다.
+        """
+        entry = self._compiled.get(template.id)
+        if entry and entry[0] == template.updated_at and entry[1].source == template.content:
+            return entry[1]
+        compiled = compile_template(template.content)
+        with self._compiled_lock:
+            self._compiled[template.id] = (template.updated_at, compiled)
+        return compiled
+
+    def unknown_variables(self, msg_type, compiled):
+        """SMS_VARIABLE_SCHEMA 에 없는 변수 (스키마에 없는 타입은 검사하지 않음)"""
+        allowed = SMS_VARIABLE_SCHEMA.get(msg_type)
+        return compiled.unknown_variables(allowed) if allowed is not None else []
+
+    def template_preview(self, template):
+        """더미 컨텍스트로 렌더링한 (바이트 수, 'SMS' | 'LMS') - 템플릿이 바뀔 때만 다시 계산"""
+        compiled = self.compile(template)
+        if compiled.preview is None:
+            from app.utils.sms_context import get_dummy_context
+            _, _, size, kind = compiled.render_measured(get_dummy_context())
+            compiled.preview = (size, kind)
+        return compiled.preview
 
     def render_template(self, template_str, context):
         """
         {{variable}} 형태의 변수를 context 데이터로 치환합니다.
         치환되지 않은 변수가 남아있으면 (text, list_of_missing_vars)를 반환합니다.
         """
-        missing_vars = []
-        rendered = template_str
-        
-        # 중복된 변수들 추출
-        placeholders = re.findall(r'\{\{(.*?)\}\}', template_str)
+        return compile_template(template_str).render(context)
+
+    def filter_unsent(self, keys):
+        """
+        dedup_key 후보 중 sms_logs 에 아직 없는 키 목록 (입력 순서, 중복 제거)
+
+        단계 하나의 후보 전체를 IN 조회 한 번(DEDUP_QUERY_CHUNK_SIZE 건 단위)으로 확인합니다.
+        """
+        keys = list(dict.fromkeys(keys))
+        sent = set()
+        for start in range(0, len(keys), DEDUP_QUERY_CHUNK_SIZE):
+            chunk = keys[start:start + DEDUP_QUERY_CHUNK_SIZE]
+            sent.update(key for (key,) in db.session.query(SmsLog.dedup_key).filter(SmsLog.dedup_key.in_(chunk)))
+        return [key for key in keys if key not in sent]
+
+    def _prepare(self, compiled, contract_id, msg_type, context, related_date=None, to_number=None, force_send=False, unsent=None, writer=None):
+        """
+        중복 체크, 수신 번호 확인, 렌더링/검증
+
+        Args:
+            unsent: filter_unsent 로 미리 구한 미발송 키 집합 (None 이면 이 메시지만 조회)
+            writer: SmsLogWriter (있으면 실패 로그를 버퍼에 추가, 없으면 바로 기록 후 커밋)
+        Returns:
+            (메시지 dict, None) - 발송할 메시지
+            (None, (성공 여부, 메시지)) - 발송하지 않는 경우의 결과 (변수 누락은 FAILED 로그 기록)
+        """
+        # dedup_key 생성 (Decision 1: {type}:{contract_id}:{related_date})
+        r_date = related_date or get_kst_now().date()
+        dedup_key = make_dedup_key(msg_type, contract_id, r_date)
         
-        for p in placeholders:
-            val = context.get(p.strip())
-            if val is not None:
-                rendered = rendered.replace(f'{{{{{p}}}}}', str(val))
+        if force_send:
+            # 수동 발송 등 강제 전송 시 유니크 키 생성 (Timestamp 추가)
+            dedup_key += f":force:{int(datetime.now().timestamp())}"
+
+        # 중복 체크 (Decision 3: UNIQUE(dedup_key))
+        if unsent is None:
+            unsent = self.filter_unsent([dedup_key])
+        if dedup_key not in unsent:
+            logger.info(f"SMS Skipped (Duplicate): {dedup_key}")
+            return None, (True, "Skipped(Duplicate)")
+
+        # 수신 번호 확인 (Context에 있는 경우 우선)
+        target_number = to_number or context.get('user_phone')
+        if not target_number:
+            return None, (False, "Receiver phone number missing")
+
+        # 렌더링 및 검증 (Decision 5 & 6)
+        content, missing = compiled.render(context)
+        message = {
+            'contract_id': contract_id,
+            'msg_type': msg_type,
+            'dedup_key': dedup_key,
+            'related_date': r_date,
+            'to_number': target_number,
+            'content': content,
+            'context': context,
+        }
+        if missing:
+            # 렌더링 실패 로그 기록 (Decision 6: FAILED)
+            error_message = f"Missing variables: {', '.join(missing)}"
+            if writer:
+                writer.add(self._log_row(status="FAILED", error_message=error_message, **message))
             else:
-                missing_vars.append(p)
-        
-        return rendered, missing_vars
+                self.create_log(status="FAILED", error_message=error_message, **message)
+            return None, (False, f"Missing variables: {missing}")
+        return message, None
 
     def send_sms(self, contract_id, msg_type, context, related_date=None, to_number=None, content_override=None, force_send=False):
         """
         문자 발송 통합 함수 (Idempotency & Validation 포함)
         """
-        # 1. 템플릿 조회
-        content_template = ""
+        # 1. 템플릿 조회 (컴파일 결과는 템플릿 수정 전까지 재사용)
         if content_override:
-            content_template = content_override
+            compiled = compile_template(content_override)
         else:
-            template = SmsTemplate.query.filter_by(type=msg_type, is_active=True).first()
+            template = self.get_template(msg_type)
             if not template:
                 logger.error(f"SMS Template not found or inactive: {msg_type}")
                 return False, "Template not found"
-            content_template = template.content
+            compiled = self.compile(template)
+
+        # 2. 중복 체크 / 수신 번호 / 렌더링
+        message, result = self._prepare(compiled, contract_id, msg_type, context, related_date, to_number, force_send)
+        if result:
+            return result
+
+        # 3. PENDING 로그를 먼저 예약하고, 이 호출이 예약한 경우에만 실제 발송
+        #    (동시에 같은 키를 보내는 다른 발송자가 먼저 기록했으면 INSERT 가 무시되어 건너뜀)
+        writer = SmsLogWriter()
+        if message['dedup_key'] not in writer.reserve([self._log_row(status="PENDING", **message)]):
+            logger.info(f"SMS Skipped (Duplicate): {message['dedup_key']}")
+            return True, "Skipped(Duplicate)"
+
+        logger.info(f"[SMS Debug] Sending {msg_type} to {message['to_number']}. Context keys: {list(context.keys())}")
+        provider, provider_name = self._get_provider()
+        try:
+            provider_msg_id = provider.send(message['to_number'], message['content'])
+        except CircuitOpenError as e:
+            # Provider 장애 중: 실패 처리하지 않고 발송 대기열에 넣어 디스패처가 다시 보냄
+            writer.release(message['dedup_key'])
+            self._queue(message, e.retry_after)
+            writer.checkpoint()
+            return True, "Queued(provider unavailable)"
+        except Exception as e:
+            logger.exception("SMS provider error")
+            writer.resolve(message['dedup_key'], status="FAILED", error_message=str(e))
+            writer.checkpoint()
+            return False, str(e)
+
+        # 발송 성공 로그 (Decision 6: SENT(Provider))
+        writer.resolve(
+            message['dedup_key'],
+            status=f"SENT({provider_name})",
+            provider_info=provider_name,
+            provider_message_id=provider_msg_id
+        )
+        writer.checkpoint()
+        return True, "Sent"
+
+    def send_batch(self, msg_type, items):
+        """
+        같은 유형의 문자 여러 건을 Provider 일괄 발송 API로 한 번에 발송 (일괄 작업용)
+
+        LOG_CHUNK_SIZE 건씩 PENDING 로그를 커밋한 뒤 발송하고, 결과 로그는 SmsLogWriter 에 모아
+        단계 끝에서 일괄 기록/커밋합니다. (메시지마다 커밋하지 않음)
+        Args:
+            items: [{'contract_id', 'context', 'related_date'(선택), 'to_number'(선택)}, ...]
+        Returns:
+            [(성공 여부, 메시지), ...] - items 순서
+        """
+        if not items:
+            return []
+        template = self.get_template(msg_type)
+        if not template:
+            logger.error(f"SMS Template not found or inactive: {msg_type}")
+            return [(False, "Template not found")] * len(items)
+        compiled = self.compile(template)
+
+        # 단계 전체의 중복 체크를 한 번에
+        today = get_kst_now().date()
+        unsent = set(self.filter_unsent(
+            make_dedup_key(msg_type, item['contract_id'], item.get('related_date') or today) for item in items
+        ))
+
+        writer = SmsLogWriter()
+        results = [None] * len(items)
+        pending = []  # (items 인덱스, 메시지)
+        seen = set()
+        for index, item in enumerate(items):
+            message, result = self._prepare(
+                compiled, item['contract_id'], msg_type, item['context'],
+                item.get('related_date') or today, item.get('to_number'), unsent=unsent, writer=writer
+            )
+            if result is None and message['dedup_key'] in seen:
+                result = (True, "Skipped(Duplicate)")
+            if result:
+                results[index] = result
+                continue
+            seen.add(message['dedup_key'])
+            pending.append((index, message))
+
+        provider, provider_name = self._get_provider() if pending else (None, None)
+        for start in range(0, len(pending), LOG_CHUNK_SIZE):
+            chunk = pending[start:start + LOG_CHUNK_SIZE]
+            # 발송 전에 PENDING 로그 커밋 (중단되거나 결과를 확인하지 못해도 재발송되지 않고 reconcile 로 정리됨)
+            # 이 실행이 예약한 행만 발송 (중복 체크 이후 다른 발송자가 먼저 예약한 키는 건너뜀)
+            owned = writer.reserve([self._log_row(status="PENDING", **m) for _, m in chunk])
+            for index, message in chunk:
+                if message['dedup_key'] not in owned:
+                    logger.info(f"SMS Skipped (Duplicate): {message['dedup_key']}")
+                    results[index] = (True, "Skipped(Duplicate)")
+            chunk = [(index, message) for index, message in chunk if message['dedup_key'] in owned]
+            if not chunk:
+                continue
+            outcomes = provider.send_batch([(m['to_number'], m['content']) for _, m in chunk])
+            for (index, message), (provider_msg_id, error) in zip(chunk, outcomes):
+                if error is None:
+                    writer.resolve(
+                        message['dedup_key'],
+                        status=f"SENT({provider_name})",
+                        provider_info=provider_name,
+                        provider_message_id=provider_msg_id
+                    )
+                    results[index] = (True, "Sent")
+                elif isinstance(error, UnconfirmedSendError):
+                    # 접수되었지만 결과를 모름: SENT/FAILED 로 찍지 않고 PENDING 으로 남겨 reconcile 로 정리
+                    logger.warning(f"SMS result unconfirmed, left PENDING: {message['dedup_key']}")
+                    results[index] = (False, str(error))
+                elif isinstance(error, CircuitOpenError):
+                    writer.release(message['dedup_key'])
+                    self._queue(message, error.retry_after)
+                    results[index] = (True, "Queued(provider unavailable)")
+                else:
+                    writer.resolve(message['dedup_key'], status="FAILED", error_message=str(error))
+                    results[index] = (False, str(error))
+
+        writer.checkpoint()
+        logger.info(f"SMS batch {msg_type}: {len(pending)} submitted / {len(items)} candidates")
+        return results
+
+    def _queue(self, message, retry_after):
+        """렌더링된 메시지를 retry_after 초 뒤 발송하도록 대기열에 추가 (커밋은 호출자)"""
+        logger.warning(f"SMS queued while provider unavailable: {message['dedup_key']}")
+        db.session.add(SmsOutbox(
+            contract_id=message['contract_id'],
+            msg_type=message['msg_type'],
+            dedup_key=message['dedup_key'],
+            related_date=message['related_date'],
+            to_number=message['to_number'],
+            content=message['content'],
+            context_snapshot=message['context'],
+            status='PENDING',
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=retry_after)
+        ))
+
+    def enqueue(self, contract_id, msg_type, context, related_date=None, to_number=None):
+        """
+        문자를 발송 대기열(SmsOutbox)에 적재 - 커밋은 호출자의 업무 트랜잭션이 수행
+
+        템플릿 렌더링/검증과 중복 체크는 send_sms 와 같고, 실제 발송은 SmsOutboxService 디스패처가 합니다.
+        Returns:
+            (성공 여부, 메시지)
+        """
+        template = self.get_template(msg_type)
+        if not template:
+            logger.error(f"SMS Template not found or inactive: {msg_type}")
+            return False, "Template not found"
 
-        # 2. dedup_key 생성 (Decision 1: {type}:{contract_id}:{related_date})
         r_date = related_date or get_kst_now().date()
-        dedup_key = f"{msg_type}:{contract_id}:{r_date}"
-        
-        if force_send:
-            # 수동 발송 등 강제 전송 시 유니크 키 생성 (Timestamp 추가)
-            dedup_key += f":force:{int(datetime.now().timestamp())}"
+        dedup_key = make_dedup_key(msg_type, contract_id, r_date)
 
-        # 3. 중복 체크 (Decision 3: UNIQUE(dedup_key))
-        existing_log = SmsLog.query.filter_by(dedup_key=dedup_key).first()
-        if existing_log:
+        # 이미 발송했거나 대기 중이면 건너뜀
+        if not self.filter_unsent([dedup_key]) or \
+                db.session.query(SmsOutbox.id).filter(
+                    SmsOutbox.dedup_key == dedup_key,
+                    SmsOutbox.status.in_(['PENDING', 'SENDING'])
+                ).first():
             logger.info(f"SMS Skipped (Duplicate): {dedup_key}")
             return True, "Skipped(Duplicate)"
 
-        # 4. 수신 번호 확인 (Context에 있는 경우 우선)
         target_number = to_number or context.get('user_phone')
         if not target_number:
             return False, "Receiver phone number missing"
 
-        # 5. 렌더링 및 검증 (Decision 5 & 6)
-        logger.info(f"[SMS Debug] Sending {msg_type} to {target_number}. Context keys: {list(context.keys())}")
-        content, missing = self.render_template(content_template, context)
-        
+        content, missing = self.compile(template).render(context)
         if missing:
-            # 렌더링 실패 로그 기록 (Decision 6: FAILED)
-            self._create_log(
+            self.create_log(
                 contract_id=contract_id,
                 msg_type=msg_type,
                 dedup_key=dedup_key,
@@ -198,59 +568,49 @@ class SmsService:
                 content=content,
                 context=context,
                 status="FAILED",
-                error_message=f"Missing variables: {', '.join(missing)}"
+                error_message=f"Missing variables: {', '.join(missing)}",
+                commit=False
             )
             return False, f"Missing variables: {missing}"
 
-        # 6. 실제 발송
-        provider, provider_name = self._get_provider()
-        try:
-            provider_msg_id = provider.send(target_number, content)
-            
-            # 발송 성공 로그 (Decision 6: SENT(Provider))
-            self._create_log(
-                contract_id=contract_id,
-                msg_type=msg_type,
-                dedup_key=dedup_key,
-                related_date=r_date,
-                content=content,
-                context=context,
-                status=f"SENT({provider_name})",
-                provider_info=provider_name,
-                provider_message_id=provider_msg_id
-            )
-            return True, "Sent"
-        except Exception as e:
-            logger.exception("SMS provider error")
-            self._create_log(
-                contract_id=contract_id,
-                msg_type=msg_type,
-                dedup_key=dedup_key,
-                related_date=r_date,
-                content=content,
-                context=context,
-                status="FAILED",
-                error_message=str(e)
-            )
-            return False, str(e)
+        db.session.add(SmsOutbox(
+            contract_id=contract_id,
+            msg_type=msg_type,
+            dedup_key=dedup_key,
+            related_date=r_date,
+            to_number=target_number,
+            content=content,
+            context_snapshot=context,
+            status='PENDING'
+        ))
+        return True, "Queued"
 
-    def _create_log(self, **kwargs):
-        """로그 생성 Helper"""
-        new_log = SmsLog(
-            contract_id=kwargs.get('contract_id'),
-            type=kwargs.get('msg_type'),
-            dedup_key=kwargs.get('dedup_key'),
-            related_date=kwargs.get('related_date'),
-            content_snapshot=kwargs.get('content'),
-            context_snapshot=kwargs.get('context'),
-            status=kwargs.get('status'),
-            provider_info=kwargs.get('provider_info'),
-            provider_message_id=kwargs.get('provider_message_id'),
-            error_message=kwargs.get('error_message')
-        )
-        db.session.add(new_log)
-        db.session.commit()
-        return new_log
+    def _log_row(self, **kwargs):
+        """sms_logs INSERT 용 행 dict"""
+        return {
+            'contract_id': kwargs.get('contract_id'),
+            'type': kwargs.get('msg_type'),
+            'dedup_key': kwargs.get('dedup_key'),
+            'related_date': kwargs.get('related_date'),
+            'content_snapshot': kwargs.get('content'),
+            'context_snapshot': kwargs.get('context'),
+            'status': kwargs.get('status'),
+            'provider_info': kwargs.get('provider_info'),
+            'provider_message_id': kwargs.get('provider_message_id'),
+            'error_message': kwargs.get('error_message'),
+            'sent_at': get_kst_now(),
+            'reservation_token': kwargs.get('reservation_token'),
+        }
+
+    def create_log(self, commit=True, **kwargs):
+        """
+        로그 생성 Helper (commit=False 이면 커밋은 호출자)
+
+        이미 있는 dedup_key 는 예외 없이 버림 (발송하지 않는 최종 로그용 - 발송 전 예약은 SmsLogWriter.reserve)
+        """
+        insert_ignore(SmsLog, [self._log_row(**kwargs)], 'dedup_key')
+        if commit:
+            db.session.commit()
 
 # 싱글톤 인스턴스 (Decision 4와 연계 - 앱 내에서 공유)
 sms_service = SmsService()
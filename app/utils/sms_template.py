@@ -0,0 +1,129 @@
+"""
+SMS 템플릿 컴파일러
+
+'{{변수}}' 템플릿을 한 번 파싱해 (문자열 | 변수) 조각 목록으로 만들어 두고,
+렌더링은 조각을 이어 붙이는 join 한 번으로 처리합니다.
+고정 문자열 조각의 EUC-KR 바이트 수를 미리 계산해 두어 발송 문자의 바이트 수와
+SMS/LMS 구분도 변수 값만 인코딩해서 구합니다.
+
+치환 규칙은 기존 SmsService.render_template 과 같습니다.
+    - '{{' 와 가장 가까운 '}}' 사이(줄바꿈 제외)가 변수 이름이며 앞뒤 공백은 무시
+    - 값이 None 이거나 없는 변수는 원문 그대로 남기고 missing 에 (공백 포함 원래 이름으로) 추가
+"""
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(.*?)\}\}')
+SMS_MAX_BYTES = 90  # 초과하면 LMS
+
+def _byte_length(text):
+    """(EUC-KR 바이트 수, 인코딩 가능 여부) - 알리고는 EUC-KR 기준으로 SMS/LMS를 구분"""
+    try:
+        return len(text.encode('euc-kr')), True
+    except UnicodeEncodeError:
+        return len(text.encode('utf-8')), False
+
+def measure(text):
+    """
+    문자 본문 바이트 수와 유형
+
+    EUC-KR로 표현할 수 없는 문자(일부 이모지 등)가 있으면 UTF-8 길이로 추정합니다.
+    Returns:
+        (바이트 수, 'SMS' | 'LMS')
+    """
+    size, _ = _byte_length(text)
+    return size, message_type(size)
+
+def message_type(size):
+    return 'LMS' if size > SMS_MAX_BYTES else 'SMS'
+
+
+class CompiledTemplate:
+    """
+    파싱된 템플릿
+
+    Attributes:
+        segments: 고정 문자열(str) 또는 (원래 이름, 변수 이름) 튜플 목록
+        variables: 템플릿이 쓰는 변수 이름 (등장 순서, 중복 제거)
+    """
+    __slots__ = ('source', 'segments', 'variables', '_literal_euc', '_literal_utf8', 'preview')
+
+    def __init__(self, source):
+        self.source = source
+        segments = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            if match.start() > position:
+                segments.append(source[position:match.start()])
+            raw = match.group(1)
+            segments.append((raw, raw.strip()))
+            position = match.end()
+        if position < len(source):
+            segments.append(source[position:])
+
+        self.segments = tuple(segments)
+        self.variables = tuple(dict.fromkeys(s[1] for s in segments if isinstance(s, tuple)))
+
+        literals = [s for s in segments if isinstance(s, str)]
+        euc = [_byte_length(s) for s in literals]
+        self._literal_euc = sum(size for size, _ in euc) if all(ok for _, ok in euc) else None
+        self._literal_utf8 = sum(len(s.encode('utf-8')) for s in literals)
+        self.preview = None  # (바이트 수, 유형) - 더미 컨텍스트 기준 (SmsService가 채움)
+
+    def unknown_variables(self, allowed):
+        """allowed 에 없는 변수 이름 목록"""
+        allowed = set(allowed)
+        return [name for name in self.variables if name not in allowed]
+
+    def _parts(self, context):
+        parts = []
+        values = []
+        missing = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            raw, name = segment
+            value = context.get(name)
+            if value is None:
+                parts.append('{{' + raw + '}}')
+                missing.append(raw)
+            else:
+                text = str(value)
+                parts.append(text)
+                values.append(text)
+        return parts, values, missing
+
+    def render(self, context):
+        """(본문, 누락 변수 목록)"""
+        parts, _, missing = self._parts(context)
+        return ''.join(parts), missing
+
+    def render_measured(self, context):
+        """
+        (본문, 누락 변수 목록, 바이트 수, 'SMS' | 'LMS')
+
+        고정 문자열 조각의 바이트 수는 컴파일 시 계산한 값을 쓰고 치환된 값만 인코딩합니다.
+        """
+        parts, values, missing = self._parts(context)
+        text = ''.join(parts)
+        if missing:
+            # 남은 '{{이름}}' 까지 포함한 길이는 본문 전체로 계산
+            size, _ = _byte_length(text)
+            return text, missing, size, message_type(size)
+
+        size = None
+        if self._literal_euc is not None:
+            size = self._literal_euc
+            for value in values:
+                value_size, ok = _byte_length(value)
+                if not ok:
+                    size = None
+                    break
+                size += value_size
+        if size is None:
+            size = self._literal_utf8 + sum(len(v.encode('utf-8')) for v in values)
+        return text, missing, size, message_type(size)
+
+
+def compile_template(source):
+    return CompiledTemplate(source or '')
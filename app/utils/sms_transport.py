@@ -0,0 +1,170 @@
+"""
+SMS Provider HTTP 전송 계층 (워커당 하나)
+
+    - requests.Session 을 재사용해 keep-alive 연결 풀을 유지하고, 연결/응답 타임아웃을 명시
+    - 토큰 버킷으로 초당 호출 수를 Provider 허용치 이하로 제한
+      (버킷은 프로세스마다 있으므로 설정한 전체 속도를 발송 프로세스 수(SMS_SENDER_PROCESSES)로 나눠 적용)
+    - 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 동안 호출하지 않고 CircuitOpenError 로 즉시 실패
+      (호출자는 문자를 실패 처리하지 않고 발송 대기열에 남겨 두었다가 다시 보냄)
+
+base_url 을 설정(ALIGO_API_URL)으로 바꿀 수 있어 로컬 가짜 알리고 서버로 시험할 수 있습니다.
+"""
+import logging
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않음 (retry_after 초 뒤 다시 시도)"""
+    def __init__(self, retry_after):
+        super().__init__(f'SMS provider unavailable (circuit open, retry after {retry_after:.0f}s)')
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """초당 rate 개씩 채워지는 최대 capacity 개의 토큰"""
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    연속 failure_threshold 번 실패하면 reset_timeout 초 동안 열림(OPEN)
+
+    시간이 지나면 한 번의 시험 호출만 허용(HALF_OPEN)하고, 성공하면 닫고 실패하면 다시 엽니다.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'CLOSED', 'OPEN', 'HALF_OPEN'
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Raises:
+            CircuitOpenError: 열려 있거나 다른 시험 호출이 진행 중
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+                return
+            raise CircuitOpenError(max(remaining, 1))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"SMS provider circuit opened after {self._failures} failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class SmsTransport:
+    """
+    Provider API 호출 (POST form -> JSON)
+
+    연결 실패, 타임아웃, 5xx, JSON 이 아닌 응답만 서킷 실패로 셉니다.
+    (잔액 부족 같은 API 오류 응답은 Provider 가 살아 있다는 뜻이므로 제외)
+    """
+    def __init__(self, base_url, connect_timeout=3, read_timeout=10, rate_per_second=5, burst=10,
+                 failure_threshold=5, reset_timeout=60, pool_size=4):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self.session = requests.Session()
+        # 재시도는 발송 대기열이 담당 (HTTP 계층에서 재전송하면 문자가 중복 발송될 수 있음)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, path, data):
+        """
+        Returns:
+            응답 JSON (dict)
+        Raises:
+            CircuitOpenError: 서킷이 열려 있음 (호출하지 않음)
+            requests.RequestException / ValueError: 전송 실패
+        """
+        self.breaker.before_call()
+        self.bucket.acquire()
+        try:
+            response = self.session.post(f'{self.base_url}/{path.strip("/")}/', data=data, timeout=self.timeout)
+            if response.status_code >= 500:
+                raise requests.HTTPError(f'HTTP {response.status_code}', response=response)
+            result = response.json()
+        except (requests.RequestException, ValueError):
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def close(self):
+        self.session.close()
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+def get_transport(config):
+    """
+    설정별 워커 공용 SmsTransport (설정 값이 바뀌면 새로 생성)
+
+    SMS_RATE_PER_SECOND / SMS_RATE_BURST 는 전체 합계이므로 SMS_SENDER_PROCESSES 로 나눈 값을 이 워커에 적용합니다.
+    """
+    processes = max(int(config.get('SMS_SENDER_PROCESSES') or 1), 1)
+    key = (
+        config.get('ALIGO_API_URL') or 'https://apis.aligo.in',
+        config.get('SMS_CONNECT_TIMEOUT', 3),
+        config.get('SMS_READ_TIMEOUT', 10),
+        config.get('SMS_RATE_PER_SECOND', 5) / processes,
+        max(config.get('SMS_RATE_BURST', 10) / processes, 1),
+        config.get('SMS_CIRCUIT_FAILURES', 5),
+        config.get('SMS_CIRCUIT_RESET_SECONDS', 60),
+    )
+    transport = _transports.get(key)
+    if transport is None:
+        with _transports_lock:
+            transport = _transports.get(key)
+            if transport is None:
+                transport = SmsTransport(
+                    key[0], connect_timeout=key[1], read_timeout=key[2], rate_per_second=key[3],
+                    burst=key[4], failure_threshold=key[5], reset_timeout=key[6]
+                )
+                _transports[key] = transport
+    return transport
@@ -12,6 +12,24 @@ class Config:
     ALIGO_API_KEY = os.environ.get('ALIGO_API_KEY')
     ALIGO_USER_ID = os.environ.get('ALIGO_USER_ID')
     ALIGO_SENDER = os.environ.get('ALIGO_SENDER')
+    ALIGO_API_URL = os.environ.get('ALIGO_API_URL') or 'https://apis.aligo.in'  # 로컬 가짜 서버로 시험할 때 변경
+
+    # SMS 전송 계층 (app/utils/sms_transport.py)
+    SMS_CONNECT_TIMEOUT = float(os.environ.get('SMS_CONNECT_TIMEOUT', 3))         # 초
+    SMS_READ_TIMEOUT = float(os.environ.get('SMS_READ_TIMEOUT', 10))              # 초
+    SMS_RATE_PER_SECOND = float(os.environ.get('SMS_RATE_PER_SECOND', 5))         # 전체 프로세스 합계 초당 API 호출 수
+    SMS_RATE_BURST = int(os.environ.get('SMS_RATE_BURST', 10))
+    # 문자를 보내는 프로세스 수 (gunicorn 워커 + `flask scheduler`): 속도 제한을 이 수로 나눠 워커마다 적용
+    SMS_SENDER_PROCESSES = int(os.environ.get('SMS_SENDER_PROCESSES') or os.environ.get('WEB_CONCURRENCY') or 1)
+    SMS_CIRCUIT_FAILURES = int(os.environ.get('SMS_CIRCUIT_FAILURES', 5))         # 연속 실패 시 서킷 열림
+    SMS_CIRCUIT_RESET_SECONDS = float(os.environ.get('SMS_CIRCUIT_RESET_SECONDS', 60))
+
+    # 예약 작업 스케줄러: false 이면 웹 프로세스에서 시작하지 않음 (`flask scheduler` 로 별도 실행)
+    # 켜 둔 프로세스가 여럿이어도 DB 임대(scheduler_leases)를 가진 하나만 작업을 실행
+    SCHEDULER_AUTOSTART = os.environ.get('SCHEDULER_AUTOSTART', 'true').lower() in ('1', 'true', 'yes')
+
+    # 관리자 캘린더 .ics 구독 토큰 (설정하지 않으면 구독 피드 비활성화)
+    CALENDAR_FEED_TOKEN = os.environ.get('CALENDAR_FEED_TOKEN')
     
     # MySQL 연결 끊김 문제 해결을 위한 설정
     SQLALCHEMY_ENGINE_OPTIONS = {
@@ -34,8 +52,15 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     DEBUG = False
 
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # MySQL 연결 옵션 제외
+    SCHEDULER_AUTOSTART = False
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
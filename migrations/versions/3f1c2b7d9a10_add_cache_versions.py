@@ -0,0 +1,36 @@
+"""add_cache_versions
+
+Revision ID: 3f1c2b7d9a10
+Revises: 7626f8865d63
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2b7d9a10'
+down_revision = '7626f8865d63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(
+        sa.table('cache_versions',
+            sa.column('name', sa.String),
+            sa.column('version', sa.Integer)
+        ),
+        [{'name': 'catalog', 'version': 1}]
+    )
+
+
+def downgrade():
+    op.drop_table('cache_versions')
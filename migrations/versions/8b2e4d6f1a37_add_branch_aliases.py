@@ -0,0 +1,74 @@
+"""add_branch_aliases
+
+Revision ID: 8b2e4d6f1a37
+Revises: 3f1c2b7d9a10
+Create Date: 2026-10-18 11:02:17.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a37'
+down_revision = '3f1c2b7d9a10'
+branch_labels = None
+depends_on = None
+
+# 기존 rooms-status 하드코딩 매핑 (slug -> 지점명 검색어)
+LEGACY_MAPPING = {
+    "samsung": ["삼성점", "삼성", "samsung"],
+    "hongdae": ["홍대점", "홍대", "hongdae"],
+    "incheon": ["인천점", "인천", "incheon"],
+    "mokdong": ["목동점", "목동", "mokdong"],
+    "bongcheon": ["봉천점", "봉천", "bongcheon"],
+    "bucheon": ["부천점", "부천", "bucheon"]
+}
+
+
+def upgrade():
+    op.create_table('branch_aliases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('branch_id', sa.Integer(), nullable=False),
+    sa.Column('alias', sa.String(length=100), nullable=False),
+    sa.Column('is_primary', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['branch_id'], ['branches.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_branch_aliases_alias', 'branch_aliases', ['alias'], unique=True)
+
+    # 기존 매핑을 별칭 데이터로 이관 (기존과 동일하게 지점명 부분 일치로 지점 결정)
+    conn = op.get_bind()
+    branches = conn.execute(sa.text("SELECT id, name FROM branches ORDER BY id")).fetchall()
+    rows = []
+    seen = set()
+    for slug, names in LEGACY_MAPPING.items():
+        branch_id = None
+        for name in names:
+            branch_id = next((b.id for b in branches if name.lower() in (b.name or '').lower()), None)
+            if branch_id:
+                break
+        if not branch_id:
+            continue
+        for alias in [slug] + names:
+            alias = alias.lower()
+            if alias in seen:
+                continue
+            seen.add(alias)
+            rows.append({'branch_id': branch_id, 'alias': alias, 'is_primary': alias == slug})
+
+    if rows:
+        op.bulk_insert(
+            sa.table('branch_aliases',
+                sa.column('branch_id', sa.Integer),
+                sa.column('alias', sa.String),
+                sa.column('is_primary', sa.Boolean)
+            ),
+            rows
+        )
+
+
+def downgrade():
+    op.drop_index('ix_branch_aliases_alias', table_name='branch_aliases')
+    op.drop_table('branch_aliases')
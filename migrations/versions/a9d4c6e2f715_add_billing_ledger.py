@@ -0,0 +1,39 @@
+"""add_billing_ledger
+
+Revision ID: a9d4c6e2f715
+Revises: f3b8d1e6a274
+Create Date: 2026-10-18 21:02:13.410582
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4c6e2f715'
+down_revision = 'f3b8d1e6a274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 원장 데이터는 업그레이드 후 `flask billing-ledger rebuild` 로 생성 (없는 월은 조회 시 직접 계산)
+    op.create_table('billing_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=False),
+    sa.Column('base_amount', sa.Integer(), nullable=False),
+    sa.Column('discount_amount', sa.Integer(), nullable=False),
+    sa.Column('discount_reason', sa.String(length=255), nullable=True),
+    sa.Column('final_amount', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('contract_id', 'month', name='uix_billing_ledger_contract_month')
+    )
+    op.create_index('ix_billing_ledger_month_due_date', 'billing_ledger', ['month', 'due_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_billing_ledger_month_due_date', table_name='billing_ledger')
+    op.drop_table('billing_ledger')
@@ -0,0 +1,42 @@
+"""add_sms_log_indexes
+
+Revision ID: b5e8f1a3c927
+Revises: a9d4c6e2f715
+Create Date: 2026-10-18 21:48:36.207154
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e8f1a3c927'
+down_revision = 'a9d4c6e2f715'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_sms_logs_sent_at_id', ['sent_at', 'id']),
+    ('ix_sms_logs_type_sent_at', ['type', 'sent_at']),
+    ('ix_sms_logs_status_sent_at', ['status', 'sent_at']),
+    ('ix_sms_logs_contract_sent_at', ['contract_id', 'sent_at']),
+)
+
+
+def _has_sms_logs():
+    # sms_logs 는 이전 마이그레이션 밖에서 생성되었으므로 없는 DB에서는 건너뜀 (create_all 시 모델 인덱스로 생성)
+    return 'sms_logs' in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade():
+    if not _has_sms_logs():
+        return
+    for name, columns in INDEXES:
+        op.create_index(name, 'sms_logs', columns, unique=False)
+
+
+def downgrade():
+    if not _has_sms_logs():
+        return
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='sms_logs')
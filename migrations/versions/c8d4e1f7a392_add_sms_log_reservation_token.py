@@ -0,0 +1,28 @@
+"""add_sms_log_reservation_token
+
+Revision ID: c8d4e1f7a392
+Revises: d2f7b4e9a163
+Create Date: 2026-10-19 14:03:52.917364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8d4e1f7a392'
+down_revision = 'd2f7b4e9a163'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sms_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reservation_token', sa.String(length=32), nullable=True))
+        batch_op.create_index(batch_op.f('ix_sms_logs_reservation_token'), ['reservation_token'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('sms_logs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sms_logs_reservation_token'))
+        batch_op.drop_column('reservation_token')
@@ -0,0 +1,45 @@
+"""add_sms_outbox
+
+Revision ID: c8e2a5f71d36
+Revises: b5e8f1a3c927
+Create Date: 2026-10-18 22:31:05.118437
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e2a5f71d36'
+down_revision = 'b5e8f1a3c927'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sms_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=True),
+    sa.Column('msg_type', sa.String(length=50), nullable=False),
+    sa.Column('dedup_key', sa.String(length=100), nullable=False),
+    sa.Column('related_date', sa.Date(), nullable=True),
+    sa.Column('to_number', sa.String(length=20), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('context_snapshot', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sms_outbox_dedup_key', 'sms_outbox', ['dedup_key'], unique=False)
+    op.create_index('ix_sms_outbox_status_next_attempt', 'sms_outbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sms_outbox_status_next_attempt', table_name='sms_outbox')
+    op.drop_index('ix_sms_outbox_dedup_key', table_name='sms_outbox')
+    op.drop_table('sms_outbox')
@@ -0,0 +1,28 @@
+"""add_contract_list_indexes
+
+Revision ID: d1f5a3b7c902
+Revises: c4a7e2f9b815
+Create Date: 2026-10-18 17:12:40.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1f5a3b7c902'
+down_revision = 'c4a7e2f9b815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_contracts_start_date', 'contracts', ['start_date'], unique=False)
+    op.create_index('ix_contracts_end_date', 'contracts', ['end_date'], unique=False)
+    op.create_index('ix_contracts_status', 'contracts', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_contracts_status', table_name='contracts')
+    op.drop_index('ix_contracts_end_date', table_name='contracts')
+    op.drop_index('ix_contracts_start_date', table_name='contracts')
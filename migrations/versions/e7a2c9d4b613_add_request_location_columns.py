@@ -0,0 +1,96 @@
+"""add_request_location_columns
+
+Revision ID: e7a2c9d4b613
+Revises: d1f5a3b7c902
+Create Date: 2026-10-18 18:02:11.530914
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2c9d4b613'
+down_revision = 'd1f5a3b7c902'
+branch_labels = None
+depends_on = None
+
+
+def _id_type(conn, table):
+    """참조할 id 컬럼과 같은 타입 (MySQL 은 unsigned 여부까지 같아야 FK 를 만들 수 있음)"""
+    for column in sa.inspect(conn).get_columns(table):
+        if column['name'] == 'id':
+            return column['type']
+    return sa.Integer()
+
+
+def upgrade():
+    conn = op.get_bind()
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('room_id', _id_type(conn, 'rooms'), nullable=True))
+        batch_op.add_column(sa.Column('branch_id', _id_type(conn, 'branches'), nullable=True))
+
+    op.create_index('ix_requests_status_created_at', 'requests', ['status', 'created_at'], unique=False)
+    op.create_index('ix_requests_type_status_created_at', 'requests', ['type', 'status', 'created_at'], unique=False)
+    op.create_index('ix_requests_branch_status_created_at', 'requests', ['branch_id', 'status', 'created_at'], unique=False)
+
+    # 기존 요청 백필 1: 계약이 있는 요청은 계약의 방
+    op.execute(
+        "UPDATE requests SET room_id = "
+        "(SELECT contracts.room_id FROM contracts WHERE contracts.id = requests.contract_id) "
+        "WHERE contract_id IS NOT NULL"
+    )
+
+    # 백필 2: 계약 없는 문의는 details JSON 의 room_id / branch_id
+    rows = conn.execute(sa.text(
+        "SELECT id, details FROM requests WHERE room_id IS NULL AND details IS NOT NULL"
+    )).fetchall()
+    for request_id, details in rows:
+        try:
+            data = json.loads(details)
+        except ValueError:
+            continue
+        if not isinstance(data, dict):
+            continue
+        room_id = str(data.get('room_id') or '')
+        branch_id = str(data.get('branch_id') or '')
+        if room_id.isdigit():
+            conn.execute(sa.text("UPDATE requests SET room_id = :room_id WHERE id = :id"),
+                         {'room_id': int(room_id), 'id': request_id})
+        elif branch_id.isdigit():
+            conn.execute(sa.text("UPDATE requests SET branch_id = :branch_id WHERE id = :id"),
+                         {'branch_id': int(branch_id), 'id': request_id})
+
+    # 백필 3: 방이 정해진 요청은 방의 지점 (삭제된 방이면 room_id 비움)
+    op.execute(
+        "UPDATE requests SET branch_id = "
+        "(SELECT rooms.branch_id FROM rooms WHERE rooms.id = requests.room_id) "
+        "WHERE room_id IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE requests SET room_id = NULL "
+        "WHERE room_id IS NOT NULL AND branch_id IS NULL"
+    )
+    # details 에만 있던 지점이 삭제된 경우
+    op.execute(
+        "UPDATE requests SET branch_id = NULL "
+        "WHERE branch_id IS NOT NULL AND branch_id NOT IN (SELECT id FROM branches)"
+    )
+
+    # 방/지점이 삭제되면 요청은 남기고 위치만 비움
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.create_foreign_key('fk_requests_room_id', 'rooms', ['room_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_foreign_key('fk_requests_branch_id', 'branches', ['branch_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade():
+    op.drop_index('ix_requests_branch_status_created_at', table_name='requests')
+    op.drop_index('ix_requests_type_status_created_at', table_name='requests')
+    op.drop_index('ix_requests_status_created_at', table_name='requests')
+
+    with op.batch_alter_table('requests', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_requests_branch_id', type_='foreignkey')
+        batch_op.drop_constraint('fk_requests_room_id', type_='foreignkey')
+        batch_op.drop_column('branch_id')
+        batch_op.drop_column('room_id')
@@ -0,0 +1,35 @@
+"""add_contract_search_tokens
+
+Revision ID: f3b8d1e6a274
+Revises: e7a2c9d4b613
+Create Date: 2026-10-18 19:20:47.882016
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1e6a274'
+down_revision = 'e7a2c9d4b613'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('contract_search_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('field', sa.String(length=10), nullable=False),
+    sa.Column('token', sa.String(length=16), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_contract_search_tokens_contract_id', 'contract_search_tokens', ['contract_id'], unique=False)
+    op.create_index('ix_contract_search_tokens_token', 'contract_search_tokens', ['token', 'field', 'contract_id'], unique=False)
+    # 기존 계약 색인은 업그레이드 후 `flask search-index rebuild` 로 생성 (앱 코드에 의존하지 않도록)
+
+
+def downgrade():
+    op.drop_index('ix_contract_search_tokens_token', table_name='contract_search_tokens')
+    op.drop_index('ix_contract_search_tokens_contract_id', table_name='contract_search_tokens')
+    op.drop_table('contract_search_tokens')
@@ -1,5 +1,6 @@
 import os
 import json
+import urllib.parse
 import urllib.request
 import urllib.error
 from datetime import datetime
@@ -82,24 +83,32 @@ MOCK_DATA = {
     }
 }
 
-def fetch_branch_data(branch):
-    """서버 API로부터 지점 정보를 가져옵니다. 실패 시 Mock 데이터를 사용합니다."""
-    url = f"{API_BASE_URL}/api/public/branches/{branch}/rooms-status"
-    print(f"[{branch.upper()}] API 호출 시도: {url}")
-    
+def fetch_all_branch_data(branches):
+    """서버 API 한 번으로 전체 지점 공실 정보를 가져옵니다. 실패하거나 누락된 지점은 Mock 데이터를 사용합니다."""
+    query = urllib.parse.urlencode({"branches": ",".join(branches)})
+    url = f"{API_BASE_URL}/api/public/rooms-status?{query}"
+    print(f"[ALL] API 호출 시도: {url}")
+
+    fetched = {}
     try:
-        # 2초 타임아웃으로 API 요청
+        # 5초 타임아웃으로 API 요청 (전체 지점 일괄 조회)
         req = urllib.request.Request(url, headers={'User-Agent': 'EroomTemplateBuilder/1.0'})
-        with urllib.request.urlopen(req, timeout=2.0) as response:
+        with urllib.request.urlopen(req, timeout=5.0) as response:
             data = json.loads(response.read().decode('utf-8'))
-            print(f"[{branch.upper()}] API 연동 성공!")
-            # API 응답 구조에 맞게 파싱 (예: {"status": "success", "data": {...}} 또는 {...} 직접 전달)
-            if "data" in data:
-                return data["data"]
-            return data
+            fetched = data.get("branches", {})
+            print(f"[ALL] API 연동 성공! ({len(fetched)}개 지점)")
     except Exception as e:
-        print(f"[{branch.upper()}] API 호출 실패 ({type(e).__name__}: {e}). Mock 데이터를 사용합니다.")
-        return MOCK_DATA[branch]
+        print(f"[ALL] API 호출 실패 ({type(e).__name__}: {e}). Mock 데이터를 사용합니다.")
+
+    result = {}
+    for branch in branches:
+        if branch in fetched:
+            result[branch] = fetched[branch]
+        else:
+            if fetched:
+                print(f"[{branch.upper()}] API 응답에 지점 정보가 없습니다. Mock 데이터를 사용합니다.")
+            result[branch] = MOCK_DATA.get(branch, {})
+    return result
 
 def generate_rooms_html(rooms):
     """공실 목록을 세로형 프리미엄 카드 리스트 마크업으로 변환"""
@@ -166,6 +175,7 @@ def build_templates():
     """지점별 HTML 템플릿을 API 기반으로 변환하여 생성합니다."""
     generated_files = {}
     today_str = datetime.now().strftime("%y-%m-%d")
+    branch_data = fetch_all_branch_data(BRANCHES)
     
     for branch in BRANCHES:
         source_path = os.path.join(TEMPLATE_DIR, f"source_template_{branch}.html")
@@ -175,7 +185,7 @@ def build_templates():
             print(f"[ERROR] 소스 템플릿 파일을 찾을 수 없습니다: {source_path}")
             continue
             
-        data = fetch_branch_data(branch)
+        data = branch_data[branch]
         rooms = data.get("available_rooms", [])
         is_occupied = data.get("is_fully_occupied", False) or len(rooms) == 0
         next_date = data.get("next_available_date")
@@ -0,0 +1,19 @@
+import pytest
+from app import create_app
+from app.extensions import db as _db
+
+
+@pytest.fixture(scope='session')
+def app():
+    """테스트용 앱 (SQLite 메모리 DB, 스케줄러 미시작)"""
+    return create_app('testing')
+
+
+@pytest.fixture
+def db(app):
+    """테스트마다 빈 테이블로 시작"""
+    with app.app_context():
+        _db.create_all()
+        yield _db
+        _db.session.remove()
+        _db.drop_all()
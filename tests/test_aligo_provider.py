@@ -0,0 +1,59 @@
+from app.utils.sms_service import AligoSmsProvider, UnconfirmedSendError
+
+
+class FakeTransport:
+    """path 별로 정해 둔 응답을 돌려주는 전송 계층"""
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def post(self, path, data):
+        self.calls.append((path, data))
+        response = self.responses[path]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _provider(responses):
+    transport = FakeTransport(responses)
+    return AligoSmsProvider('key', 'user', '02-000-0000', transport), transport
+
+
+MESSAGES = [('010-1111-1111', '안내 1'), ('010-2222-2222', '안내 2'), ('010-3333-3333', '안내 3')]
+
+
+def test_send_batch_without_errors_marks_every_message_sent():
+    provider, transport = _provider({
+        'send_mass': {'result_code': 1, 'msg_id': 77, 'success_cnt': 3, 'error_cnt': 0},
+    })
+
+    assert provider.send_batch(MESSAGES) == [('77', None)] * 3
+    assert [path for path, _ in transport.calls] == ['send_mass']
+
+
+def test_partial_failure_confirms_each_receiver_from_sms_list():
+    provider, transport = _provider({
+        'send_mass': {'result_code': 1, 'msg_id': 77, 'success_cnt': 1, 'error_cnt': 2},
+        'sms_list': {'result_code': 1, 'list': [
+            {'receiver': '01011111111', 'sms_state': '발송완료'},
+            {'receiver': '01022222222', 'sms_state': '수신거부'},
+        ]},
+    })
+
+    results = provider.send_batch(MESSAGES)
+
+    assert results[0] == ('77', None)
+    assert [type(error) for _, error in results[1:]] == [UnconfirmedSendError] * 2
+    assert transport.calls[1][1]['mid'] == '77'
+
+
+def test_partial_failure_lookup_error_leaves_chunk_unconfirmed():
+    provider, _ = _provider({
+        'send_mass': {'result_code': 1, 'msg_id': 77, 'success_cnt': 2, 'error_cnt': 1},
+        'sms_list': ValueError('bad json'),
+    })
+
+    results = provider.send_batch(MESSAGES)
+
+    assert all(msg_id is None and isinstance(error, UnconfirmedSendError) for msg_id, error in results)
@@ -0,0 +1,55 @@
+import pytest
+from app.models.branch import Branch, BranchAlias
+from app.services.branch_alias_service import BranchAliasService
+
+
+@pytest.fixture(autouse=True)
+def fresh_alias_map():
+    BranchAliasService._version = None
+    yield
+    BranchAliasService._version = None
+
+
+def _branch(db, name):
+    branch = Branch(name=name)
+    db.session.add(branch)
+    db.session.commit()
+    return branch
+
+
+def test_legacy_slug_resolves_branch_created_after_migration(db):
+    # 별칭 행이 없는 지점 (마이그레이션 이후 생성 / 새 DB)
+    _branch(db, '홍대입구점')
+    samsung = _branch(db, '삼성점')
+
+    resolved = BranchAliasService.resolve_branch_ids(['samsung', 'SAMSUNG', 'gangnam'])
+
+    assert resolved == {'samsung': samsung.id, 'SAMSUNG': samsung.id, 'gangnam': None}
+
+
+def test_add_default_alias_registers_legacy_slug_as_primary(db):
+    branch = Branch(name='삼성점')
+    db.session.add(branch)
+    added = BranchAliasService.add_default_alias(branch)
+    db.session.commit()
+
+    assert sorted((a.alias, a.is_primary) for a in added) == [('samsung', True), ('삼성점', False)]
+    assert BranchAliasService.get_primary_slug(branch.id) == 'samsung'
+    assert BranchAliasService.resolve_branch_ids(['samsung'])['samsung'] == branch.id
+
+
+def test_add_default_alias_uses_branch_name_without_legacy_slug(db):
+    branch = Branch(name='강남점')
+    db.session.add(branch)
+    BranchAliasService.add_default_alias(branch)
+    db.session.commit()
+
+    assert [(a.alias, a.is_primary) for a in BranchAlias.query.all()] == [('강남점', True)]
+
+
+def test_rooms_status_accepts_legacy_slug(app, db):
+    _branch(db, '삼성점')
+    client = app.test_client()
+
+    assert client.get('/api/public/branches/samsung/rooms-status').status_code == 200
+    assert client.get('/api/public/rooms-status?branches=samsung').get_json()['not_found'] == []
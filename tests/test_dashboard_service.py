@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+from app.models.branch import Branch, Room
+from app.models.contract import Contract
+from app.models.dashboard_snapshot import DashboardSnapshot
+from app.services.dashboard_service import DashboardService
+
+
+def _snapshot(db):
+    db.session.expire_all()
+    return db.session.get(DashboardSnapshot, 1)
+
+
+def _entries(db):
+    return {entry['name']: entry for entry in _snapshot(db).payload['branchData']}
+
+
+def _setup(db):
+    samsung, hongdae = Branch(name='삼성점'), Branch(name='홍대점')
+    db.session.add_all([samsung, hongdae])
+    db.session.flush()
+    rooms = [Room(branch_id=samsung.id, name='101호', price=500000), Room(branch_id=hongdae.id, name='201호', price=400000)]
+    db.session.add_all(rooms)
+    db.session.commit()
+    DashboardService.rebuild()
+    db.session.commit()
+    return samsung, hongdae, rooms
+
+
+def test_committed_changes_update_only_affected_branches(db):
+    samsung, hongdae, rooms = _setup(db)
+    built_at = _snapshot(db).built_at
+
+    # 홍대점 항목을 일부러 어긋나게 해 두면, 삼성점만 바뀐 커밋 후에도 그대로 남아야 함 (증분 갱신)
+    snapshot = _snapshot(db)
+    payload = dict(snapshot.payload)
+    payload['branchData'] = [dict(e, total_rooms=99) if e['id'] == hongdae.id else e for e in payload['branchData']]
+    snapshot.payload = payload
+    db.session.commit()
+
+    db.session.add(Contract(
+        room_id=rooms[0].id, status='active', price=450000, deposit=1000000,
+        start_date=date.today(), end_date=date.today() + timedelta(days=10)
+    ))
+    db.session.commit()
+
+    entries = _entries(db)
+    assert entries['삼성점']['active_contracts'] == 1
+    assert entries['삼성점']['monthly_revenue'] == 450000
+    assert entries['홍대점']['total_rooms'] == 99
+    assert len(_snapshot(db).payload['expiringContracts']) == 1
+    assert _snapshot(db).built_at == built_at
+
+
+def test_room_moved_between_branches_updates_both(db):
+    samsung, hongdae, rooms = _setup(db)
+
+    rooms[0].branch_id = hongdae.id
+    db.session.commit()
+
+    entries = _entries(db)
+    assert (entries['삼성점']['total_rooms'], entries['홍대점']['total_rooms']) == (0, 2)
+    assert _snapshot(db).payload['stats']['totalRooms'] == 2
+
+
+def test_rolled_back_changes_are_not_applied(db):
+    samsung, hongdae, rooms = _setup(db)
+
+    db.session.add(Room(branch_id=samsung.id, name='102호'))
+    db.session.flush()
+    db.session.rollback()
+    db.session.add(Branch(name='목동점'))
+    db.session.commit()
+
+    entries = _entries(db)
+    assert entries['삼성점']['total_rooms'] == 1
+    assert entries['목동점']['total_rooms'] == 0
+
+
+def test_get_payload_does_not_write_snapshot(db):
+    db.session.add(Branch(name='삼성점'))
+    db.session.commit()
+
+    assert [entry['name'] for entry in DashboardService.get_payload()['branchData']] == ['삼성점']
+    db.session.commit()
+    assert _snapshot(db) is None
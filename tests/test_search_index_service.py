@@ -0,0 +1,38 @@
+from datetime import date
+import pytest
+from app.models.branch import Branch, Room
+from app.models.contract import Contract
+from app.models.user import User
+from app.services.search_index_service import SearchIndexService
+
+
+@pytest.fixture
+def contracts(db):
+    branch = Branch(name='삼성점')
+    db.session.add(branch)
+    db.session.flush()
+    room = Room(branch_id=branch.id, name='101호')
+    kim, lee = User(name='김철수', phone='010-1234-5678'), User(name='이영희', phone='010-9876-5432')
+    db.session.add_all([room, kim, lee])
+    db.session.flush()
+    rows = {
+        name: Contract(user_id=user.id, room_id=room.id, status='active',
+                       start_date=date(2026, 1, 1), end_date=date(2026, 12, 31))
+        for name, user in (('kim', kim), ('lee', lee))
+    }
+    db.session.add_all(rows.values())
+    db.session.commit()  # 커밋 직전 훅이 색인 생성
+    return {name: contract.id for name, contract in rows.items()}
+
+
+def test_single_character_term_narrows_multi_term_query(contracts):
+    assert SearchIndexService.search('김 삼성점') == [contracts['kim']]
+    assert SearchIndexService.search('영 101') == [contracts['lee']]
+    assert SearchIndexService.search('ㄱ 삼성') == [contracts['kim']]
+    assert SearchIndexService.search('9 삼성') == [contracts['lee']]
+
+
+def test_rebuild_all_indexes_existing_contracts(contracts):
+    assert SearchIndexService.rebuild_all() == 2
+    assert SearchIndexService.search('김철수') == [contracts['kim']]
+    assert sorted(SearchIndexService.search('삼성')) == sorted(contracts.values())
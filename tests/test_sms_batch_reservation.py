@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta
+import pytest
+from app.models.sms import SmsLog, get_kst_now
+from app.services.sms_template_registry import TemplateSnapshot
+from app.utils.sms_log_writer import INTERRUPTED_MESSAGE, SmsLogWriter
+from app.utils.sms_service import SmsProviderInterface, make_dedup_key, sms_service
+
+RELATED = date(2026, 10, 1)
+TEMPLATE = TemplateSnapshot(1, 'MOVEOUT_DAY', '퇴실', '{{user_name}}님 퇴실일입니다.', True, 0, datetime(2026, 1, 1))
+
+
+class BatchProvider(SmsProviderInterface):
+    def __init__(self):
+        self.batches = []
+        self.interrupt = False
+
+    def send_batch(self, messages):
+        if self.interrupt:
+            raise RuntimeError('worker killed mid-send')
+        self.batches.append([to_number for to_number, _ in messages])
+        return [(f'msg-{n}', None) for n, _ in enumerate(messages)]
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = BatchProvider()
+    monkeypatch.setattr(sms_service, '_get_provider', lambda: (provider, 'Fake'))
+    monkeypatch.setattr(sms_service, 'get_template', lambda msg_type: TEMPLATE)
+    return provider
+
+
+ITEMS = [
+    {'contract_id': n, 'related_date': RELATED, 'context': {'user_name': f'입주자{n}', 'user_phone': f'010-0000-000{n}'}}
+    for n in (1, 2, 3)
+]
+
+
+def _statuses():
+    return {log.dedup_key: log.status for log in SmsLog.query.all()}
+
+
+def test_batch_sends_only_rows_this_run_reserved(db, provider, monkeypatch):
+    # 다른 발송자가 중복 체크 이후 2번 계약 문자를 먼저 예약
+    monkeypatch.setattr(sms_service, 'filter_unsent', lambda keys: list(keys))
+    other_key = make_dedup_key('MOVEOUT_DAY', 2, RELATED)
+    db.session.add(SmsLog(
+        type='MOVEOUT_DAY', dedup_key=other_key, content_snapshot='본문', status='PENDING', reservation_token='other'
+    ))
+    db.session.commit()
+
+    results = sms_service.send_batch('MOVEOUT_DAY', ITEMS)
+
+    assert results == [(True, "Sent"), (True, "Skipped(Duplicate)"), (True, "Sent")]
+    assert provider.batches == [['010-0000-0001', '010-0000-0003']]
+    assert _statuses()[other_key] == 'PENDING'
+
+
+def test_interrupted_stage_is_not_resent_and_is_reconciled(db, provider):
+    provider.interrupt = True
+    with pytest.raises(RuntimeError):
+        sms_service.send_batch('MOVEOUT_DAY', ITEMS)
+    db.session.rollback()
+    assert set(_statuses().values()) == {'PENDING'}
+
+    # 다시 실행해도 예약된 문자는 보내지 않음
+    provider.interrupt = False
+    assert sms_service.send_batch('MOVEOUT_DAY', ITEMS) == [(True, "Skipped(Duplicate)")] * 3
+    assert provider.batches == []
+
+    # 진행 중일 수 있는 최근 PENDING 은 그대로, 오래된 PENDING 만 FAILED 로 정리
+    assert SmsLogWriter.reconcile() == 0
+    stale = SmsLog.query.filter_by(contract_id=1).one()
+    stale.sent_at = get_kst_now() - timedelta(hours=1)
+    db.session.commit()
+
+    assert SmsLogWriter.reconcile() == 1
+    assert stale.status == 'FAILED' and stale.error_message == INTERRUPTED_MESSAGE
+    assert sorted(_statuses().values()) == ['FAILED', 'PENDING', 'PENDING']
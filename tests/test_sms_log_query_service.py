@@ -0,0 +1,28 @@
+from datetime import datetime
+from werkzeug.datastructures import MultiDict
+from app.models.sms import SmsLog
+from app.services.sms_log_query_service import SmsLogQueryService
+
+
+def _log(db, key, status):
+    db.session.add(SmsLog(
+        type='MANUAL', dedup_key=key, content_snapshot='본문', status=status, sent_at=datetime(2026, 10, 1, 9, 0)
+    ))
+
+
+def _statuses(status):
+    query = SmsLogQueryService.filtered_query(MultiDict({'status': status}))
+    return sorted(log.status for log in query.all())
+
+
+def test_sent_status_matches_every_provider(db):
+    _log(db, 'a', 'SENT(Aligo)')
+    _log(db, 'b', 'SENT(Stub)')
+    _log(db, 'c', 'FAILED')
+    _log(db, 'd', 'PENDING')
+    db.session.commit()
+
+    assert _statuses('SENT') == ['SENT(Aligo)', 'SENT(Stub)']
+    assert _statuses('SENT,FAILED') == ['FAILED', 'SENT(Aligo)', 'SENT(Stub)']
+    assert _statuses('SENT(Aligo)') == ['SENT(Aligo)']
+    assert _statuses('PENDING') == ['PENDING']
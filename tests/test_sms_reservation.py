@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta
+import pytest
+from app.models.sms import SmsLog
+from app.models.sms_outbox import SmsOutbox
+from app.services.sms_outbox_service import SmsOutboxService
+from app.utils.sms_service import make_dedup_key, sms_service
+
+RELATED = date(2026, 10, 1)
+KEY = make_dedup_key('MANUAL', None, RELATED)
+
+
+class RecordingProvider:
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = []
+
+    def send(self, to_number, content):
+        if self.error:
+            raise self.error
+        self.sent.append((to_number, content))
+        return f'msg-{len(self.sent)}'
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = RecordingProvider()
+    monkeypatch.setattr(sms_service, '_get_provider', lambda: (provider, 'Fake'))
+    return provider
+
+
+def _other_sender_reserved(db):
+    """다른 발송자가 중복 체크 이후 같은 키를 먼저 예약한 상황"""
+    db.session.add(SmsLog(
+        type='MANUAL', dedup_key=KEY, content_snapshot='본문', status='PENDING', reservation_token='other'
+    ))
+    db.session.commit()
+
+
+def _send_sms():
+    return sms_service.send_sms(
+        None, 'MANUAL', {'user_phone': '010-1111-1111'}, related_date=RELATED, content_override='안내'
+    )
+
+
+def test_send_sms_reserves_then_records_result(db, provider):
+    assert _send_sms() == (True, "Sent")
+
+    log = SmsLog.query.filter_by(dedup_key=KEY).one()
+    assert (log.status, log.provider_message_id) == ('SENT(Fake)', 'msg-1')
+    assert provider.sent == [('010-1111-1111', '안내')]
+
+
+def test_send_sms_does_not_send_when_another_sender_reserved(db, provider, monkeypatch):
+    # 두 발송자가 모두 filter_unsent 를 통과한 경쟁 상황
+    monkeypatch.setattr(sms_service, 'filter_unsent', lambda keys: list(keys))
+    _other_sender_reserved(db)
+
+    assert _send_sms() == (True, "Skipped(Duplicate)")
+
+    assert provider.sent == []
+    log = SmsLog.query.filter_by(dedup_key=KEY).one()
+    assert (log.status, log.reservation_token) == ('PENDING', 'other')
+
+
+def test_send_sms_failure_resolves_own_reservation(db, provider):
+    provider.error = RuntimeError('provider down')
+
+    assert _send_sms() == (False, 'provider down')
+
+    log = SmsLog.query.filter_by(dedup_key=KEY).one()
+    assert (log.status, log.error_message) == ('FAILED', 'provider down')
+
+
+def _outbox(db):
+    db.session.add(SmsOutbox(
+        msg_type='MANUAL', dedup_key=KEY, related_date=RELATED, to_number='010-1111-1111', content='안내',
+        next_attempt_at=datetime.utcnow() - timedelta(seconds=1)
+    ))
+    db.session.commit()
+
+
+def test_dispatch_skips_row_reserved_by_another_sender(db, provider, monkeypatch):
+    _outbox(db)
+    monkeypatch.setattr(sms_service, 'filter_unsent', lambda keys: list(keys))
+    _other_sender_reserved(db)
+
+    assert SmsOutboxService.dispatch() == {'SKIPPED': 1}
+    assert provider.sent == []
+
+
+def test_dispatch_releases_reservation_for_retry(db, provider):
+    _outbox(db)
+    provider.error = RuntimeError('timeout')
+
+    assert SmsOutboxService.dispatch() == {'PENDING': 1}
+    assert SmsLog.query.count() == 0  # 다음 시도에서 다시 예약
+
+    provider.error = None
+    SmsOutbox.query.one().next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert SmsOutboxService.dispatch() == {'SENT': 1}
+    assert SmsLog.query.one().status == 'SENT(Fake)'
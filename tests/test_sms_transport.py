@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from app.utils.sms_transport import CircuitBreaker, CircuitOpenError, SmsTransport, get_transport
+
+
+class FakeAligoServer:
+    """로컬 가짜 알리고 서버 - mode 로 응답을 바꿈 ('ok' | 'error' | 'slow')"""
+    def __init__(self):
+        self.mode = 'ok'
+        self.delay = 0.5
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                server.requests += 1
+                if server.mode == 'slow':
+                    time.sleep(server.delay)
+                status = 503 if server.mode == 'error' else 200
+                body = json.dumps({'result_code': 1, 'message': 'success', 'msg_id': server.requests}).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 타임아웃으로 클라이언트가 먼저 끊음
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def aligo():
+    server = FakeAligoServer()
+    yield server
+    server.close()
+
+
+def _transport(url, **kwargs):
+    options = dict(connect_timeout=1, read_timeout=0.2, rate_per_second=1000, burst=1000,
+                   failure_threshold=2, reset_timeout=0.3)
+    options.update(kwargs)
+    return SmsTransport(url, **options)
+
+
+def test_post_returns_json(aligo):
+    transport = _transport(aligo.url)
+
+    assert transport.post('send', {'msg': '안내'})['result_code'] == 1
+    assert transport.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_read_timeout_counts_as_failure(aligo):
+    transport = _transport(aligo.url)
+    aligo.mode = 'slow'
+
+    with pytest.raises(requests.Timeout):
+        transport.post('send', {})
+    assert transport.breaker._failures == 1
+    assert transport.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_5xx_opens_circuit_without_calling_provider(aligo):
+    transport = _transport(aligo.url)
+    aligo.mode = 'error'
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            transport.post('send', {})
+    assert transport.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        transport.post('send', {})
+    assert excinfo.value.retry_after > 0
+    assert aligo.requests == 2
+
+
+def test_half_open_trial_success_closes_circuit(aligo):
+    transport = _transport(aligo.url)
+    aligo.mode = 'error'
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            transport.post('send', {})
+
+    time.sleep(0.35)
+    aligo.mode = 'ok'
+    assert transport.post('send', {})['result_code'] == 1
+    assert transport.breaker.state == CircuitBreaker.CLOSED
+    assert transport.post('send', {})['result_code'] == 1
+
+
+def test_half_open_trial_failure_reopens_circuit(aligo):
+    transport = _transport(aligo.url)
+    aligo.mode = 'error'
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            transport.post('send', {})
+
+    time.sleep(0.35)
+    with pytest.raises(requests.HTTPError):
+        transport.post('send', {})  # 시험 호출 한 번만 실패해도 다시 열림
+    assert transport.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        transport.post('send', {})
+    assert aligo.requests == 3
+
+
+def test_half_open_allows_single_trial_call():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_rate_limit_is_split_across_sender_processes():
+    transport = get_transport({
+        'ALIGO_API_URL': 'http://127.0.0.1:9', 'SMS_RATE_PER_SECOND': 6, 'SMS_RATE_BURST': 12,
+        'SMS_SENDER_PROCESSES': 3,
+    })
+
+    assert transport.bucket.rate == 2
+    assert transport.bucket.capacity == 4